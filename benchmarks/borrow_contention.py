@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Contention benchmark for the BorrowBook strategies.
+
+Threads repeatedly borrow (and immediately return) copies picked from a
+small hot set, so most attempts race for the same rows. For each strategy
+("atomic" and "locking") the script reports throughput, outcome counts and
+borrow latency percentiles.
+
+Run it against a scratch Postgres database: tables are created if missing
+and the benchmark's rows are left behind. The SQLite default only checks
+that the script works; SQLite ignores FOR UPDATE and serializes all
+writers, so its numbers say nothing about row-lock contention.
+
+Usage:
+    python3 benchmarks/borrow_contention.py \\
+        --database-url postgresql://localhost/library_bench --threads 32
+"""
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.library.library_service import LibraryService
+from app.library.repository import (
+    BookCopyRepository,
+    BookRepository,
+    MemberRepository,
+)
+from models.base import Base
+from util.database import engine_options
+from util.ulid_util import generate_ulid
+
+
+def setup_data(session_factory, copies: int, members: int):
+    """Create one book with copies hot copies and members members."""
+    session = session_factory()
+    try:
+        book = BookRepository.create(session, "Contention", "Benchmark")
+        copy_ids = [
+            BookCopyRepository.create(session, book.id, str(i)).id
+            for i in range(copies)
+        ]
+        member_ids = [
+            MemberRepository.create(
+                session, f"Member {i}", f"{generate_ulid()}@bench.local"
+            ).id
+            for i in range(members)
+        ]
+    finally:
+        session.close()
+    return copy_ids, member_ids
+
+
+def run(session_factory, strategy, copy_ids, member_ids, threads, seconds):
+    """Run one strategy; return (latencies, outcomes, elapsed)."""
+    latencies = []
+    outcomes = Counter()
+    lock = threading.Lock()
+    start_barrier = threading.Barrier(threads + 1)
+    deadline = [0.0]
+
+    def worker(seed):
+        rng = random.Random(seed)
+        session = session_factory()
+        local_latencies = []
+        local_outcomes = Counter()
+        start_barrier.wait()
+        try:
+            while time.monotonic() < deadline[0]:
+                copy_id = rng.choice(copy_ids)
+                started = time.perf_counter()
+                try:
+                    borrow, error = LibraryService.borrow_book(
+                        session, copy_id, rng.choice(member_ids), strategy
+                    )
+                except Exception as e:
+                    session.rollback()
+                    local_outcomes[f"exception: {e.__class__.__name__}"] += 1
+                    continue
+                local_latencies.append(time.perf_counter() - started)
+                local_outcomes[error or "borrowed"] += 1
+                if borrow is not None:
+                    LibraryService.return_book(session, copy_id)
+        finally:
+            session.close()
+            with lock:
+                latencies.extend(local_latencies)
+                outcomes.update(local_outcomes)
+
+    workers = [
+        threading.Thread(target=worker, args=(seed,))
+        for seed in range(threads)
+    ]
+    for thread in workers:
+        thread.start()
+    deadline[0] = time.monotonic() + seconds
+    started = time.monotonic()
+    start_barrier.wait()
+    for thread in workers:
+        thread.join()
+    return latencies, outcomes, time.monotonic() - started
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """pct-th percentile of values (nearest rank)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def report(strategy, latencies, outcomes, elapsed):
+    """Print one strategy's results."""
+    attempts = len(latencies)
+    print(f"\n[{strategy}] {attempts} borrow attempts in {elapsed:.1f}s "
+          f"({attempts / elapsed:.0f}/s)")
+    for outcome, count in sorted(outcomes.items()):
+        print(f"  {outcome:<30} {count}")
+    if latencies:
+        print(
+            "  latency ms  "
+            f"mean={statistics.mean(latencies) * 1000:.2f} "
+            f"p50={percentile(latencies, 50) * 1000:.2f} "
+            f"p99={percentile(latencies, 99) * 1000:.2f} "
+            f"max={max(latencies) * 1000:.2f}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--database-url",
+        help="scratch database (default: a temporary SQLite file)"
+    )
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--copies", type=int, default=4,
+                        help="size of the hot copy set")
+    parser.add_argument("--members", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=10.0,
+                        help="duration per strategy")
+    parser.add_argument("--strategies", default="atomic,locking")
+    args = parser.parse_args(argv)
+
+    url = args.database_url
+    if not url:
+        url = f"sqlite:///{tempfile.mkdtemp()}/borrow_contention.db"
+    engine = create_engine(url, **engine_options(url, "bench"))
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(
+        autocommit=False, autoflush=False, bind=engine
+    )
+    copy_ids, member_ids = setup_data(
+        session_factory, args.copies, args.members
+    )
+    print(f"{engine.dialect.name}: {args.threads} threads, "
+          f"{args.copies} hot copies, {args.seconds:.0f}s per strategy")
+    for strategy in args.strategies.split(","):
+        report(strategy, *run(
+            session_factory, strategy, copy_ids, member_ids,
+            args.threads, args.seconds
+        ))
+    engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+Load test for LibraryService over a real gRPC channel.
+
+Seeds a catalog of --copies copies (--copies-per-book per book) and
+--members members, starts LibraryServiceHandler in-process on the sync
+server with the production interceptors, and drives it from --concurrency
+client threads with a weighted mix of:
+
+- list: ListBooks, ListMembers, ListBorrowings, ListAvailableCopies and
+  SearchBooks pages;
+- borrow: BorrowBook on one of --hot-copies copies, then ReturnBook when
+  the borrow succeeded;
+- login: a burst of --login-burst Login calls.
+
+After --warmup seconds the run is measured for --seconds. The report is
+JSON: per RPC the call count, throughput, status codes, client-side
+p50/p95/p99 latency and database statements per call (from the server's
+rpc_db_queries metric), so runs against different releases can be diffed.
+
+Tables are created if missing. An empty database is seeded; one that
+already has books is reused as is, so large catalogs are seeded once. The
+SQLite default only checks that the script works: SQLite serializes
+writers and its numbers say little about Postgres.
+
+Usage:
+    python3 benchmarks/load_test.py \\
+        --database-url postgresql://localhost/library_bench \\
+        --copies 1000000 --concurrency 32 --seconds 60 --output run.json
+"""
+import argparse
+import json
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent import futures
+from itertools import islice
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "src" / "generated"))
+
+import grpc
+from prometheus_client import REGISTRY
+from sqlalchemy import func, insert, select
+
+from config import JWT_SECRET
+from app.auth.auth_service import AuthService
+from app.auth.interceptor import AuthInterceptor
+from app.auth.repository import StaffUserRepository
+from app.library.grpc_handlers import LibraryServiceHandler
+from app.library.interceptor import MetricsInterceptor, SessionInterceptor
+from app.library.library_service import BookImportRow, LibraryService
+from models.base import Base
+from models.book import Book
+from models.book_copy import BookCopy
+from models.member import Member
+from proto import auth_pb2, library_pb2, library_service_pb2_grpc
+from util import database
+from util.ulid_util import generate_ulid
+
+STAFF_USERNAME = "loadtest"
+STAFF_PASSWORD = "loadtest-password"
+SEED_BATCH_SIZE = 5000
+PAGE_LIMIT = 20
+LIST_RPCS = (
+    "ListBooks",
+    "ListMembers",
+    "ListBorrowings",
+    "ListAvailableCopies",
+    "SearchBooks",
+)
+
+
+def seed(session, copies: int, copies_per_book: int, members: int) -> None:
+    """Seed books with copies_per_book copies each, and members."""
+    books = max(1, copies // copies_per_book)
+    started = time.monotonic()
+    LibraryService.bulk_import_books(
+        session,
+        (
+            BookImportRow(
+                f"Title {i}",
+                f"Author {i % 1000}",
+                None,
+                [str(n) for n in range(copies_per_book)]
+            )
+            for i in range(books)
+        ),
+        SEED_BATCH_SIZE // copies_per_book or 1
+    )
+    rows = (
+        {"id": generate_ulid(), "name": f"Member {i}",
+         "email": f"member{i}@loadtest.local"}
+        for i in range(members)
+    )
+    while batch := list(islice(rows, SEED_BATCH_SIZE)):
+        session.execute(insert(Member), batch)
+        session.commit()
+    print(
+        f"Seeded {books} books, {books * copies_per_book} copies and "
+        f"{members} members in {time.monotonic() - started:.0f}s",
+        file=sys.stderr
+    )
+
+
+def prepare(session, args) -> tuple[list[str], list[str]]:
+    """Seed if the database is empty; return (hot copy ids, member ids)."""
+    if not session.scalar(select(func.count()).select_from(Book)):
+        seed(session, args.copies, args.copies_per_book, args.members)
+    if StaffUserRepository.find_by_username(session, STAFF_USERNAME) is None:
+        StaffUserRepository.create(
+            session,
+            STAFF_USERNAME,
+            AuthService(JWT_SECRET).hash_password(STAFF_PASSWORD)
+        )
+    copy_ids = list(session.scalars(
+        select(BookCopy.id)
+        .where(BookCopy.status == "available")
+        .limit(args.hot_copies)
+    ))
+    member_ids = list(session.scalars(select(Member.id).limit(1000)))
+    session.commit()
+    return copy_ids, member_ids
+
+
+def start_server(workers: int) -> tuple[grpc.Server, int]:
+    """Start LibraryServiceHandler on an ephemeral local port."""
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=workers),
+        interceptors=[
+            MetricsInterceptor(),
+            AuthInterceptor(JWT_SECRET),
+            SessionInterceptor(),
+        ]
+    )
+    library_service_pb2_grpc.add_LibraryServiceServicer_to_server(
+        LibraryServiceHandler(), server
+    )
+    port = server.add_insecure_port("127.0.0.1:0")
+    server.start()
+    return server, port
+
+
+class Client:
+    """One load generating thread's stub, token and measurements."""
+
+    def __init__(self, channel, copy_ids, member_ids, seed, login_burst):
+        """Log in and prepare the operation mix."""
+        self.stub = library_service_pb2_grpc.LibraryServiceStub(channel)
+        self.copy_ids = copy_ids
+        self.member_ids = member_ids
+        self.rng = random.Random(seed)
+        self.login_burst = login_burst
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.codes: dict[str, Counter] = defaultdict(Counter)
+        token = self.stub.Login(auth_pb2.LoginRequest(
+            username=STAFF_USERNAME, password=STAFF_PASSWORD
+        )).token
+        self.metadata = (("authorization", f"Bearer {token}"),)
+
+    def call(self, method: str, request, authenticated: bool = True):
+        """Invoke method, recording latency and status; None on error."""
+        started = time.perf_counter()
+        try:
+            response = getattr(self.stub, method)(
+                request, metadata=self.metadata if authenticated else None
+            )
+            code = grpc.StatusCode.OK
+        except grpc.RpcError as e:
+            response = None
+            code = e.code()
+        self.latencies[method].append(time.perf_counter() - started)
+        self.codes[method][code.name] += 1
+        return response
+
+    def list_page(self) -> None:
+        """Fetch one page from a random list RPC."""
+        method = self.rng.choice(LIST_RPCS)
+        pagination = library_pb2.PaginationRequest(
+            page=self.rng.randint(1, 10), limit=PAGE_LIMIT
+        )
+        if method == "SearchBooks":
+            request = library_pb2.SearchBooksRequest(
+                query=f"Title {self.rng.randint(0, 999)}",
+                pagination=library_pb2.PaginationRequest(limit=PAGE_LIMIT)
+            )
+        else:
+            request = getattr(library_pb2, f"{method}Request")(
+                pagination=pagination
+            )
+        self.call(method, request)
+
+    def borrow_return(self) -> None:
+        """Borrow a hot copy and return it if the borrow succeeded."""
+        copy_id = self.rng.choice(self.copy_ids)
+        response = self.call("BorrowBook", library_pb2.BorrowBookRequest(
+            copy_id=copy_id, member_id=self.rng.choice(self.member_ids)
+        ))
+        if response is not None:
+            self.call(
+                "ReturnBook", library_pb2.ReturnBookRequest(copy_id=copy_id)
+            )
+
+    def logins(self) -> None:
+        """Log in login_burst times back to back."""
+        request = auth_pb2.LoginRequest(
+            username=STAFF_USERNAME, password=STAFF_PASSWORD
+        )
+        for _ in range(self.login_burst):
+            self.call("Login", request, authenticated=False)
+
+
+def parse_mix(text: str) -> dict[str, float]:
+    """Parse "list=70,borrow=25,login=5" into operation weights."""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ("list", "borrow", "login"):
+            raise argparse.ArgumentTypeError(f"unknown operation {name!r}")
+        mix[name] = float(weight)
+    return mix
+
+
+def run(channel, args, copy_ids, member_ids, seconds) -> tuple[list, float]:
+    """Drive the mix from args.concurrency threads; return (clients, elapsed)."""
+    clients = [
+        Client(channel, copy_ids, member_ids, seed, args.login_burst)
+        for seed in range(args.concurrency)
+    ]
+    operations = {
+        "list": Client.list_page,
+        "borrow": Client.borrow_return,
+        "login": Client.logins,
+    }
+    names = list(args.mix)
+    weights = [args.mix[name] for name in names]
+    start_barrier = threading.Barrier(args.concurrency + 1)
+    deadline = [0.0]
+
+    def worker(client):
+        start_barrier.wait()
+        while time.monotonic() < deadline[0]:
+            name = client.rng.choices(names, weights)[0]
+            operations[name](client)
+
+    threads = [
+        threading.Thread(target=worker, args=(client,)) for client in clients
+    ]
+    for thread in threads:
+        thread.start()
+    deadline[0] = time.monotonic() + seconds
+    started = time.monotonic()
+    start_barrier.wait()
+    for thread in threads:
+        thread.join()
+    return clients, time.monotonic() - started
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """pct-th percentile of values (nearest rank)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def db_totals() -> dict[str, tuple[float, float]]:
+    """Server-side (statements, calls) per method from rpc_db_queries."""
+    totals = defaultdict(lambda: [0.0, 0.0])
+    for metric in REGISTRY.collect():
+        if metric.name != "rpc_db_queries":
+            continue
+        for sample in metric.samples:
+            method = sample.labels.get("method")
+            if sample.name.endswith("_sum"):
+                totals[method][0] = sample.value
+            elif sample.name.endswith("_count"):
+                totals[method][1] = sample.value
+    return {method: tuple(values) for method, values in totals.items()}
+
+
+def report(clients, elapsed, before, after) -> dict:
+    """Aggregate client measurements and server query counts per RPC."""
+    latencies = defaultdict(list)
+    codes = defaultdict(Counter)
+    for client in clients:
+        for method, values in client.latencies.items():
+            latencies[method].extend(values)
+            codes[method].update(client.codes[method])
+    rpcs = {}
+    for method in sorted(latencies):
+        values = latencies[method]
+        statements, calls = (
+            after.get(method, (0, 0))[i] - before.get(method, (0, 0))[i]
+            for i in range(2)
+        )
+        rpcs[method] = {
+            "calls": len(values),
+            "throughput_per_second": round(len(values) / elapsed, 1),
+            "status_codes": dict(codes[method]),
+            "latency_ms": {
+                "mean": round(sum(values) / len(values) * 1000, 3),
+                "p50": round(percentile(values, 50) * 1000, 3),
+                "p95": round(percentile(values, 95) * 1000, 3),
+                "p99": round(percentile(values, 99) * 1000, 3),
+                "max": round(max(values) * 1000, 3),
+            },
+            "db_queries_per_call": (
+                round(statements / calls, 2) if calls else None
+            ),
+        }
+    total = sum(len(values) for values in latencies.values())
+    return {
+        "elapsed_seconds": round(elapsed, 2),
+        "total_calls": total,
+        "throughput_per_second": round(total / elapsed, 1),
+        "rpcs": rpcs,
+    }
+
+
+def revision() -> str | None:
+    """Current git commit, if the script runs from a checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True,
+            text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Parse arguments, seed, run the load and print the JSON report."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--database-url",
+        help="scratch database (default: a temporary SQLite file)"
+    )
+    parser.add_argument("--copies", type=int, default=10_000,
+                        help="catalog size in copies when seeding")
+    parser.add_argument("--copies-per-book", type=int, default=10)
+    parser.add_argument("--members", type=int, default=1000)
+    parser.add_argument("--hot-copies", type=int, default=100,
+                        help="copies the borrow/return churn targets")
+    parser.add_argument("--concurrency", type=int, default=16,
+                        help="client threads")
+    parser.add_argument("--server-workers", type=int, default=16,
+                        help="gRPC server worker threads")
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--mix", type=parse_mix,
+                        default="list=70,borrow=25,login=5",
+                        help="operation weights (list, borrow, login)")
+    parser.add_argument("--login-burst", type=int, default=5,
+                        help="Login calls per login operation")
+    parser.add_argument("--output", help="also write the report to this file")
+    args = parser.parse_args(argv)
+
+    url = args.database_url
+    if not url:
+        url = f"sqlite:///{tempfile.mkdtemp()}/load_test.db"
+    database.init_engine(url)
+    Base.metadata.create_all(database.engine)
+    session = database.get_session()
+    try:
+        copy_ids, member_ids = prepare(session, args)
+    finally:
+        session.close()
+
+    server, port = start_server(args.server_workers)
+    channel = grpc.insecure_channel(f"127.0.0.1:{port}")
+    try:
+        if args.warmup:
+            run(channel, args, copy_ids, member_ids, args.warmup)
+        before = db_totals()
+        clients, elapsed = run(
+            channel, args, copy_ids, member_ids, args.seconds
+        )
+        result = report(clients, elapsed, before, db_totals())
+    finally:
+        channel.close()
+        server.stop(None)
+        database.engine.dispose()
+
+    result["config"] = {
+        "revision": revision(),
+        "dialect": database.engine.dialect.name,
+        "copies": args.copies,
+        "copies_per_book": args.copies_per_book,
+        "members": args.members,
+        "hot_copies": len(copy_ids),
+        "concurrency": args.concurrency,
+        "server_workers": args.server_workers,
+        "seconds": args.seconds,
+        "mix": args.mix,
+        "login_burst": args.login_burst,
+    }
+    text = json.dumps(result, indent=2)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for ListBorrowings page serialization.
+
+Compares two ways of turning a page of active borrows into a
+ListBorrowingsResponse:
+
+- "orm": the previous path. Query Borrow with joinedload of copy, book and
+  member, then convert each instance with _model_to_borrow_proto and copy
+  the messages into the response.
+- "rows": the current path. BorrowRepository.list_active selects only the
+  needed columns as tuples and add_borrows fills response.borrows in place.
+
+Each iteration runs the query in a fresh transaction (so the ORM path pays
+for hydrating the identity map) and serializes the response to bytes. The
+script reports per-page latency for each path and the speedup.
+
+Usage:
+    python3 benchmarks/proto_serialization.py --page-size 100 --iterations 500
+"""
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "src" / "generated"))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import joinedload, sessionmaker
+
+from app.library.grpc_handlers import _model_to_borrow_proto
+from app.library.library_service import BookImportRow, LibraryService
+from app.library.repository import BorrowRepository, MemberRepository
+from app.library.serialization import add_borrows
+from models.base import Base
+from models.book_copy import BookCopy
+from models.borrow import Borrow
+from proto import library_pb2
+from util.database import engine_options
+from util.ulid_util import generate_ulid
+
+
+def setup_data(session_factory, borrows: int):
+    """Create borrows books with one copy each, all borrowed."""
+    session = session_factory()
+    try:
+        LibraryService.bulk_import_books(
+            session,
+            (
+                BookImportRow(f"Title {i}", f"Author {i}", None, ["1"])
+                for i in range(borrows)
+            ),
+            batch_size=borrows
+        )
+        member_ids = [
+            MemberRepository.create(
+                session, f"Member {i}", f"{generate_ulid()}@bench.local"
+            ).id
+            for i in range(max(1, borrows // 10))
+        ]
+        copy_ids = session.query(BookCopy.id).limit(borrows).all()
+        for i, (copy_id,) in enumerate(copy_ids):
+            LibraryService.borrow_book(
+                session, copy_id, member_ids[i % len(member_ids)]
+            )
+    finally:
+        session.close()
+
+
+def orm_page(session, limit: int) -> bytes:
+    """Previous path: joinedload ORM graph, per-message CopyFrom."""
+    borrows = (
+        session.query(Borrow)
+        .options(
+            joinedload(Borrow.copy).joinedload(BookCopy.book),
+            joinedload(Borrow.member)
+        )
+        .filter(Borrow.status == "active")
+        .order_by(Borrow.borrowed_at.desc(), Borrow.id.desc())
+        .limit(limit)
+        .all()
+    )
+    return library_pb2.ListBorrowingsResponse(
+        borrows=[_model_to_borrow_proto(b) for b in borrows]
+    ).SerializeToString()
+
+
+def rows_page(session, limit: int) -> bytes:
+    """Current path: column tuples appended with repeated.add()."""
+    response = library_pb2.ListBorrowingsResponse()
+    add_borrows(
+        response.borrows, BorrowRepository.list_active(session, limit=limit)
+    )
+    return response.SerializeToString()
+
+
+def run(session_factory, page, limit: int, iterations: int) -> list[float]:
+    """Time iterations calls of page; return per-call seconds."""
+    timings = []
+    session = session_factory()
+    try:
+        for _ in range(iterations):
+            started = time.perf_counter()
+            page(session, limit)
+            timings.append(time.perf_counter() - started)
+            session.rollback()
+    finally:
+        session.close()
+    return timings
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--database-url",
+        help="scratch database (default: a temporary SQLite file)"
+    )
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    url = args.database_url
+    if not url:
+        url = f"sqlite:///{tempfile.mkdtemp()}/proto_serialization.db"
+    engine = create_engine(url, **engine_options(url, "bench"))
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(
+        autocommit=False, autoflush=False, bind=engine
+    )
+    setup_data(session_factory, args.page_size)
+    session = session_factory()
+    try:
+        if orm_page(session, args.page_size) != rows_page(
+            session, args.page_size
+        ):
+            print("orm and rows paths produced different responses")
+            return 1
+    finally:
+        session.close()
+
+    print(f"{engine.dialect.name}: ListBorrowings page of {args.page_size}, "
+          f"{args.iterations} iterations")
+    means = {}
+    for name, page in (("orm", orm_page), ("rows", rows_page)):
+        run(session_factory, page, args.page_size, args.warmup)
+        timings = run(session_factory, page, args.page_size, args.iterations)
+        means[name] = statistics.mean(timings)
+        print(
+            f"  {name:<5} mean={means[name] * 1000:.3f}ms "
+            f"p50={statistics.median(timings) * 1000:.3f}ms "
+            f"min={min(timings) * 1000:.3f}ms"
+        )
+    print(f"  speedup {means['orm'] / means['rows']:.1f}x")
+    engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Benchmark for write RPC latency with and without post-commit refreshes.
+
+Runs the CreateBook, CreateMember and UpdateBook handler bodies, one
+session per call as the server does, in two ways:
+
+- "before": the previous write path. Sessions expire on commit and the
+  repository refreshes the written object, so every write is followed by a
+  SELECT; UpdateBook loads the book, flushes the change, commits and
+  refreshes.
+- "after": the current path. Sessions keep objects loaded after commit and
+  server defaults come back with INSERT ... RETURNING; UpdateBook is a
+  single UPDATE ... RETURNING.
+
+Both build the RPC response from the written row. The script reports
+per-call latency and statements per call for each RPC and path.
+
+Usage:
+    python3 benchmarks/write_latency.py --iterations 500
+    python3 benchmarks/write_latency.py --database-url postgresql://localhost/library_bench
+"""
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "src" / "generated"))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.library.grpc_handlers import (
+    _create_book,
+    _create_member,
+    _model_to_book_proto,
+    _model_to_member_proto,
+    _update_book,
+)
+from models.base import Base
+from models.book import Book
+from models.member import Member
+from proto import library_pb2
+from util.database import engine_options
+from util.ulid_util import generate_ulid
+
+
+class _Context:
+    """Minimal servicer context for calling handler bodies."""
+
+    def set_code(self, code):
+        raise RuntimeError(f"handler failed with {code}")
+
+    def set_details(self, details):
+        pass
+
+
+def before_create_book(session, request, context):
+    """Previous CreateBook: add, commit, refresh."""
+    book = Book(id=generate_ulid(), title=request.title, author=request.author)
+    session.add(book)
+    session.commit()
+    session.refresh(book)
+    return library_pb2.CreateBookResponse(book=_model_to_book_proto(book))
+
+
+def before_create_member(session, request, context):
+    """Previous CreateMember: add, commit, refresh."""
+    member = Member(id=generate_ulid(), name=request.name, email=request.email)
+    session.add(member)
+    session.commit()
+    session.refresh(member)
+    return library_pb2.CreateMemberResponse(
+        member=_model_to_member_proto(member)
+    )
+
+
+def before_update_book(session, request, context):
+    """Previous UpdateBook: get, mutate, commit, refresh."""
+    book = session.get(Book, request.id)
+    book.title = request.title
+    session.commit()
+    session.refresh(book)
+    return library_pb2.UpdateBookResponse(book=_model_to_book_proto(book))
+
+
+def requests(book_id: str):
+    """Per-RPC request factories; each call returns a fresh request."""
+    return {
+        "CreateBook": lambda i: library_pb2.CreateBookRequest(
+            title=f"Title {i}", author="Author"
+        ),
+        "CreateMember": lambda i: library_pb2.CreateMemberRequest(
+            name=f"Member {i}", email=f"{generate_ulid()}@bench.local"
+        ),
+        "UpdateBook": lambda i: library_pb2.UpdateBookRequest(
+            id=book_id, title=f"Title {i}"
+        ),
+    }
+
+
+PATHS = {
+    "before": {
+        "CreateBook": before_create_book,
+        "CreateMember": before_create_member,
+        "UpdateBook": before_update_book,
+    },
+    "after": {
+        "CreateBook": _create_book,
+        "CreateMember": _create_member,
+        "UpdateBook": _update_book,
+    },
+}
+
+
+def run(
+    session_factory,
+    handler,
+    make_request,
+    iterations: int,
+    statements: list[int]
+) -> tuple[list[float], float]:
+    """Time iterations calls; return per-call seconds and statements per call."""
+    timings = []
+    context = _Context()
+    executed = statements[0]
+    for i in range(iterations):
+        request = make_request(i)
+        started = time.perf_counter()
+        session = session_factory()
+        try:
+            handler(session, request, context)
+        finally:
+            session.close()
+        timings.append(time.perf_counter() - started)
+    return timings, (statements[0] - executed) / iterations
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--database-url",
+        help="scratch database (default: a temporary SQLite file)"
+    )
+    parser.add_argument("--iterations", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    url = args.database_url
+    if not url:
+        url = f"sqlite:///{tempfile.mkdtemp()}/write_latency.db"
+    engine = create_engine(url, **engine_options(url, "bench"))
+    Base.metadata.create_all(engine)
+    statements = [0]
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements[0] += 1
+
+    factories = {
+        "before": sessionmaker(autocommit=False, autoflush=False, bind=engine),
+        "after": sessionmaker(
+            autocommit=False,
+            autoflush=False,
+            expire_on_commit=False,
+            bind=engine
+        ),
+    }
+    session = factories["after"]()
+    book_id = _create_book(
+        session,
+        library_pb2.CreateBookRequest(title="Updated", author="Author"),
+        _Context()
+    ).book.id
+    session.close()
+
+    print(f"{engine.dialect.name}: {args.iterations} calls per RPC and path")
+    for rpc, make_request in requests(book_id).items():
+        means = {}
+        for path, handlers in PATHS.items():
+            run(factories[path], handlers[rpc], make_request, args.warmup,
+                statements)
+            timings, per_call = run(
+                factories[path], handlers[rpc], make_request,
+                args.iterations, statements
+            )
+            means[path] = statistics.mean(timings)
+            print(
+                f"  {rpc:<13}{path:<7} mean={means[path] * 1000:.3f}ms "
+                f"p50={statistics.median(timings) * 1000:.3f}ms "
+                f"statements/call={per_call:.1f}"
+            )
+        print(f"  {rpc:<13}speedup {means['before'] / means['after']:.2f}x")
+    engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
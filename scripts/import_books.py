@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Bulk import books and copies from a CSV file straight into the database.
+
+CSV columns: title, author, isbn (optional), copy_numbers (optional,
+semicolon separated, e.g. "1;2;3"). Rows are inserted in batches of
+--batch-size (default BULK_IMPORT_BATCH_SIZE) and each batch is committed
+on its own. Rejected rows are written to stderr as "line,error".
+
+Usage:
+    DATABASE_URL=postgresql://... python3 scripts/import_books.py books.csv
+"""
+import argparse
+import csv
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from config import BULK_IMPORT_BATCH_SIZE
+from app.library.library_service import BookImportRow, LibraryService
+from util.database import get_session
+
+# CSV line of the first data row (line 1 is the header).
+FIRST_DATA_LINE = 2
+
+
+def read_rows(handle):
+    """Yield a BookImportRow per CSV data row."""
+    for record in csv.DictReader(handle):
+        copy_numbers = record.get("copy_numbers") or ""
+        yield BookImportRow(
+            (record.get("title") or "").strip(),
+            (record.get("author") or "").strip(),
+            (record.get("isbn") or "").strip() or None,
+            [n.strip() for n in copy_numbers.split(";") if n.strip()]
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the import. Returns 1 if any row was rejected."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("csv_file", help="CSV file, or - for stdin")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=BULK_IMPORT_BATCH_SIZE,
+        help="rows per INSERT batch and commit"
+    )
+    args = parser.parse_args(argv)
+
+    if args.csv_file == "-":
+        handle = sys.stdin
+    else:
+        handle = open(args.csv_file, newline="", encoding="utf-8")
+    session = get_session()
+    try:
+        books, copies, errors = LibraryService.bulk_import_books(
+            session, read_rows(handle), args.batch_size
+        )
+    finally:
+        session.close()
+        if handle is not sys.stdin:
+            handle.close()
+
+    writer = csv.writer(sys.stderr)
+    for index, error in errors:
+        writer.writerow([index + FIRST_DATA_LINE, error])
+    print(
+        f"Imported {books} books and {copies} copies; "
+        f"{len(errors)} rows rejected"
+    )
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Repair drift in the denormalized books.copy_count / available_count columns.
+
+The counts are maintained in the same transaction as every copy change, so
+drift only comes from writes that bypass the repository (manual SQL,
+restores). This recomputes both counts from book_copies in one UPDATE that
+touches only books whose counts differ. Safe to run from cron.
+
+Usage:
+    DATABASE_URL=postgresql://... python3 scripts/reconcile_book_counts.py
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from app.library.repository import BookRepository
+from util.database import get_session
+
+
+def main() -> int:
+    """Run the reconciliation and report the number of books fixed."""
+    session = get_session()
+    try:
+        fixed = BookRepository.reconcile_counts(session)
+    finally:
+        session.close()
+    print(f"Reconciled counts for {fixed} books")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,11 +3,13 @@ Authentication service with bcrypt and JWT.
 """
 from datetime import datetime, timezone, timedelta
 
-import bcrypt
 import jwt
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.auth.password_pool import password_pool
 from app.auth.repository import StaffUserRepository
+from app.auth.token_cache import token_cache
 from models.staff_user import StaffUser
 
 JWT_ALGORITHM = "HS256"
@@ -22,18 +24,20 @@ class AuthService:
         self.secret_key = secret_key
 
     def hash_password(self, password: str) -> str:
-        """Hash password using bcrypt."""
-        return bcrypt.hashpw(
-            password.encode("utf-8"),
-            bcrypt.gensalt()
-        ).decode("utf-8")
+        """
+        Hash password using bcrypt on the password process pool.
+
+        Raises PasswordPoolFullError when the pool is saturated.
+        """
+        return password_pool.hash(password)
 
     def verify_password(self, password: str, hashed: str) -> bool:
-        """Verify password against hash."""
-        return bcrypt.checkpw(
-            password.encode("utf-8"),
-            hashed.encode("utf-8")
-        )
+        """
+        Verify password against hash on the password process pool.
+
+        Raises PasswordPoolFullError when the pool is saturated.
+        """
+        return password_pool.verify(password, hashed)
 
     @staticmethod
     def login(
@@ -46,6 +50,8 @@ class AuthService:
         Authenticate staff and return token.
 
         Returns None for invalid credentials (does not reveal if user exists).
+        Raises PasswordPoolFullError when too many logins are in progress
+        (PasswordPoolTimeoutError when bcrypt does not finish in time).
         """
         user = StaffUserRepository.find_by_username(session, username)
         if not user:
@@ -53,7 +59,37 @@ class AuthService:
         service = AuthService(secret_key)
         if not service.verify_password(password, user.password_hash):
             return None
-        token = AuthService._create_token(user.id, secret_key)
+        return AuthService._issue_token(user.id, secret_key)
+
+    @staticmethod
+    async def login_async(
+        session: AsyncSession,
+        username: str,
+        password: str,
+        secret_key: str
+    ) -> dict | None:
+        """
+        Async variant of login for the grpc.aio server.
+
+        bcrypt is awaited on the password process pool so it does not block
+        the event loop. Raises PasswordPoolFullError like login.
+        """
+        user = await session.run_sync(
+            StaffUserRepository.find_by_username, username
+        )
+        if not user:
+            return None
+        verified = await password_pool.verify_async(
+            password, user.password_hash
+        )
+        if not verified:
+            return None
+        return AuthService._issue_token(user.id, secret_key)
+
+    @staticmethod
+    def _issue_token(user_id: str, secret_key: str) -> dict:
+        """Create a token for an authenticated user with its expiry."""
+        token = AuthService._create_token(user_id, secret_key)
         expires_at = datetime.now(timezone.utc) + timedelta(hours=JWT_EXPIRY_HOURS)
         return {
             "token": token,
@@ -79,14 +115,23 @@ class AuthService:
         """
         Validate JWT token and return user id.
 
+        Verified tokens are cached until their exp, so repeat calls with the
+        same token skip signature verification.
+
         Returns None if token is invalid or expired.
         """
+        user_id = token_cache.get(token, secret_key)
+        if user_id is not None:
+            return user_id
         try:
             payload = jwt.decode(
                 token,
                 secret_key,
                 algorithms=[JWT_ALGORITHM]
             )
-            return payload.get("sub")
         except jwt.PyJWTError:
             return None
+        user_id = payload.get("sub")
+        if user_id and "exp" in payload:
+            token_cache.put(token, secret_key, user_id, payload["exp"])
+        return user_id
@@ -0,0 +1,139 @@
+"""
+Server interceptors that authenticate each LibraryService call once.
+"""
+import contextvars
+import inspect
+
+import grpc
+
+from app.auth.auth_service import AuthService
+from util.grpc_interceptor_util import handler_factory, rewrap
+
+AUTH_METADATA_KEY = "authorization"
+BEARER_PREFIX = "Bearer "
+SERVICE_PREFIX = "/library.LibraryService/"
+# Methods callable without a token.
+PUBLIC_METHODS = frozenset({SERVICE_PREFIX + "Login"})
+
+# Authenticated staff user id for the call being served, set by the interceptor.
+current_user_id: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "current_user_id", default=None
+)
+
+
+def token_from_metadata(metadata) -> str | None:
+    """Extract the Bearer token from gRPC metadata pairs."""
+    for key, value in metadata or ():
+        if key.lower() == AUTH_METADATA_KEY:
+            if isinstance(value, str) and value.startswith(BEARER_PREFIX):
+                return value[len(BEARER_PREFIX):]
+            return None
+    return None
+
+
+def authenticate_metadata(metadata, secret_key: str) -> tuple[str | None, str | None]:
+    """
+    Validate the Bearer token in metadata.
+
+    Returns (user_id, error_message).
+    """
+    token = token_from_metadata(metadata)
+    if not token:
+        return None, "Missing or invalid authorization"
+    user_id = AuthService.validate_session(token, secret_key)
+    if not user_id:
+        return None, "Invalid or expired token"
+    return user_id, None
+
+
+def _requires_auth(method: str) -> bool:
+    """Whether calls to method must carry a valid token."""
+    return method.startswith(SERVICE_PREFIX) and method not in PUBLIC_METHODS
+
+
+class AuthInterceptor(grpc.ServerInterceptor):
+    """Authenticates LibraryService calls on the thread pool server."""
+
+    def __init__(self, secret_key: str):
+        """Initialize with the JWT signing secret."""
+        self.secret_key = secret_key
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        if handler is None or not _requires_auth(handler_call_details.method):
+            return handler
+        behavior, factory = handler_factory(handler)
+        streaming = handler.response_streaming
+        secret_key = self.secret_key
+
+        def authenticate(context):
+            user_id, error = authenticate_metadata(
+                context.invocation_metadata(), secret_key
+            )
+            if error:
+                context.abort(grpc.StatusCode.UNAUTHENTICATED, error)
+            return current_user_id.set(user_id)
+
+        def unary_behavior(request, context):
+            token = authenticate(context)
+            try:
+                return behavior(request, context)
+            finally:
+                current_user_id.reset(token)
+
+        def streaming_behavior(request, context):
+            token = authenticate(context)
+            try:
+                yield from behavior(request, context)
+            finally:
+                current_user_id.reset(token)
+
+        wrapped = streaming_behavior if streaming else unary_behavior
+        return rewrap(handler, wrapped, factory)
+
+
+class AsyncAuthInterceptor(grpc.aio.ServerInterceptor):
+    """Authenticates LibraryService calls on the grpc.aio server."""
+
+    def __init__(self, secret_key: str):
+        """Initialize with the JWT signing secret."""
+        self.secret_key = secret_key
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        if handler is None or not _requires_auth(handler_call_details.method):
+            return handler
+        behavior, factory = handler_factory(handler)
+        secret_key = self.secret_key
+
+        async def authenticate(context):
+            user_id, error = authenticate_metadata(
+                context.invocation_metadata(), secret_key
+            )
+            if error:
+                await context.abort(grpc.StatusCode.UNAUTHENTICATED, error)
+            return current_user_id.set(user_id)
+
+        async def unary_behavior(request, context):
+            token = await authenticate(context)
+            try:
+                return await behavior(request, context)
+            finally:
+                current_user_id.reset(token)
+
+        async def streaming_behavior(request, context):
+            token = await authenticate(context)
+            try:
+                result = behavior(request, context)
+                if inspect.isasyncgen(result):
+                    async for response in result:
+                        yield response
+                else:
+                    await result
+            finally:
+                current_user_id.reset(token)
+
+        wrapped = (
+            streaming_behavior if handler.response_streaming else unary_behavior
+        )
+        return rewrap(handler, wrapped, factory)
@@ -0,0 +1,190 @@
+"""
+Bounded process pool for bcrypt hashing and verification.
+
+bcrypt takes ~250 ms of CPU per call. Running it in separate processes keeps
+that work off gRPC worker threads and the GIL, and the pending-job limit makes
+a login burst fail fast instead of queueing behind catalog reads.
+"""
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+import bcrypt
+
+from config import BCRYPT_MAX_PENDING, BCRYPT_PROCESSES, BCRYPT_TIMEOUT_SECONDS
+
+
+class PasswordPoolFullError(Exception):
+    """Raised when the bcrypt pool already has max_pending jobs."""
+
+
+class PasswordPoolTimeoutError(PasswordPoolFullError):
+    """Raised when a bcrypt job does not finish within the pool's timeout."""
+
+
+def _hashpw(password: bytes) -> bytes:
+    """Hash password with a fresh salt (runs in a pool process)."""
+    return bcrypt.hashpw(password, bcrypt.gensalt())
+
+
+def _checkpw(password: bytes, hashed: bytes) -> bool:
+    """Check password against hash (runs in a pool process)."""
+    return bcrypt.checkpw(password, hashed)
+
+
+class PasswordPool:
+    """Process pool for bcrypt with a bound on queued plus running jobs."""
+
+    def __init__(
+        self,
+        processes: int,
+        max_pending: int,
+        timeout: float = BCRYPT_TIMEOUT_SECONDS
+    ):
+        """
+        Initialize the pool; worker processes start on first use.
+
+        processes=0 runs bcrypt inline in the calling thread, still bounded
+        by max_pending; verify_async then runs it on a thread instead so the
+        event loop keeps serving. timeout is how long a caller waits for its job; a
+        job that times out keeps its slot until it finishes.
+        """
+        self.processes = processes
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor: ProcessPoolExecutor | None = None
+        self._threads: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def hash(self, password: str) -> str:
+        """Hash password. Raises PasswordPoolFullError when saturated."""
+        hashed = self._call(_hashpw, password.encode("utf-8"))
+        return hashed.decode("utf-8")
+
+    def verify(self, password: str, hashed: str) -> bool:
+        """Verify password. Raises PasswordPoolFullError when saturated."""
+        return self._call(
+            _checkpw, password.encode("utf-8"), hashed.encode("utf-8")
+        )
+
+    async def verify_async(self, password: str, hashed: str) -> bool:
+        """Verify password without blocking the event loop."""
+        args = (_checkpw, password.encode("utf-8"), hashed.encode("utf-8"))
+        if self.processes <= 0:
+            # Inline bcrypt would stall every call on the loop for ~250 ms.
+            return await self._wait_async(
+                self._submit(*args, run=self._run_in_thread)
+            )
+        try:
+            return await self._wait_async(self._submit(*args))
+        except BrokenProcessPool:
+            # A worker died during the job; the next submit rebuilds the pool.
+            return await self._wait_async(self._submit(*args))
+
+    def shutdown(self) -> None:
+        """Stop the worker processes and threads."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+            if self._threads is not None:
+                self._threads.shutdown(wait=True)
+                self._threads = None
+
+    def _call(self, fn, *args):
+        """Run fn in the pool and wait, retrying once if a worker dies."""
+        try:
+            return self._wait(self._submit(fn, *args))
+        except BrokenProcessPool:
+            # A worker died during the job; the next submit rebuilds the pool.
+            return self._wait(self._submit(fn, *args))
+
+    def _wait(self, future: Future):
+        """Result of future, waiting at most timeout seconds."""
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise PasswordPoolTimeoutError(
+                f"password job not done after {self.timeout}s"
+            ) from None
+
+    async def _wait_async(self, future: Future):
+        """Await future, at most timeout seconds."""
+        try:
+            return await asyncio.wait_for(
+                asyncio.wrap_future(future), self.timeout
+            )
+        except asyncio.TimeoutError:
+            raise PasswordPoolTimeoutError(
+                f"password job not done after {self.timeout}s"
+            ) from None
+
+    def _submit(self, fn, *args, run=None) -> Future:
+        """
+        Run fn in the pool, taking a slot that is freed when it finishes.
+
+        run starts the job and returns its Future; it defaults to _run.
+        """
+        if not self._slots.acquire(blocking=False):
+            raise PasswordPoolFullError(
+                f"{self.max_pending} password jobs already pending"
+            )
+        try:
+            future = (run or self._run)(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def _run(self, fn, *args) -> Future:
+        """Submit to the process pool, or run inline when processes is 0."""
+        if self.processes <= 0:
+            future = Future()
+            try:
+                future.set_result(fn(*args))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        executor = self._get_executor()
+        try:
+            return executor.submit(fn, *args)
+        except BrokenProcessPool:
+            # A worker died; drop the broken executor and retry once.
+            self._discard_executor(executor)
+            return self._get_executor().submit(fn, *args)
+
+    def _run_in_thread(self, fn, *args) -> Future:
+        """Run fn on the pool's thread executor, for inline async callers."""
+        with self._lock:
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(
+                    max_workers=self.max_pending,
+                    thread_name_prefix="bcrypt"
+                )
+            threads = self._threads
+        return threads.submit(fn, *args)
+
+    def _discard_executor(self, executor: ProcessPoolExecutor) -> None:
+        """Drop a broken executor unless another caller already replaced it."""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Create the executor lazily so each prefork worker gets its own."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+
+password_pool = PasswordPool(BCRYPT_PROCESSES, BCRYPT_MAX_PENDING)
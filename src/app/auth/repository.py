@@ -41,5 +41,4 @@ class StaffUserRepository:
         )
         session.add(user)
         session.commit()
-        session.refresh(user)
         return user
@@ -0,0 +1,75 @@
+"""
+Bounded LRU cache of verified JWTs.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from config import AUTH_TOKEN_CACHE_SIZE
+from util.metrics import AUTH_TOKEN_CACHE_LOOKUPS
+
+
+class TokenCache:
+    """
+    Maps a token digest to its verified subject until the token's exp.
+
+    Keys are SHA-256 digests of secret and token, so raw tokens are never
+    held in memory and a token verified under one secret never matches
+    another.
+    """
+
+    def __init__(self, max_entries: int):
+        """Initialize with the maximum number of cached tokens."""
+        self.max_entries = max_entries
+        self._entries: OrderedDict[bytes, tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str, secret_key: str) -> bytes:
+        """Digest identifying a token under a secret."""
+        return hashlib.sha256(
+            f"{secret_key}\0{token}".encode("utf-8")
+        ).digest()
+
+    def get(self, token: str, secret_key: str) -> str | None:
+        """Return the cached subject, or None if missing or expired."""
+        if self.max_entries <= 0:
+            return None
+        key = self._key(token, secret_key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= time.time():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                AUTH_TOKEN_CACHE_LOOKUPS.labels(result="miss").inc()
+                return None
+            self._entries.move_to_end(key)
+        AUTH_TOKEN_CACHE_LOOKUPS.labels(result="hit").inc()
+        return entry[0]
+
+    def put(
+        self,
+        token: str,
+        secret_key: str,
+        subject: str,
+        expires_at: float
+    ) -> None:
+        """Cache a verified subject until expires_at (epoch seconds)."""
+        if self.max_entries <= 0:
+            return
+        key = self._key(token, secret_key)
+        with self._lock:
+            self._entries[key] = (subject, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached tokens."""
+        with self._lock:
+            self._entries.clear()
+
+
+token_cache = TokenCache(AUTH_TOKEN_CACHE_SIZE)
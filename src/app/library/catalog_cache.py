@@ -0,0 +1,301 @@
+"""
+Bounded LRU/TTL cache of book and member snapshots.
+
+Entries are immutable snapshots, never ORM instances, so they can be shared
+between sessions and threads. Session hooks invalidate an entry once a
+transaction that changed the row commits. With CATALOG_CACHE_NOTIFY the
+change is also broadcast with Postgres NOTIFY, sent inside the writing
+transaction so other processes hear about it only if it commits.
+"""
+import logging
+import select
+import threading
+import time
+from collections import OrderedDict
+from itertools import chain
+from typing import NamedTuple
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from config import (
+    CATALOG_CACHE_NOTIFY,
+    CATALOG_CACHE_SIZE,
+    CATALOG_CACHE_TTL_SECONDS,
+)
+from util.metrics import CATALOG_CACHE_INVALIDATIONS, CATALOG_CACHE_LOOKUPS
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "catalog_cache"
+# session.info key holding (kind, id) pairs written by the open transaction.
+_CHANGED = "catalog_cache_changed"
+# Seconds between listener reconnect attempts.
+_RECONNECT_SECONDS = 5.0
+# Invalidation generations are kept per stripe of keys, not per key, so
+# they take fixed memory; a collision only skips caching a snapshot.
+_GENERATION_STRIPES = 1024
+
+
+class BookSnapshot(NamedTuple):
+    """Immutable copy of a book's catalog metadata."""
+    id: str
+    title: str
+    author: str
+    isbn: str | None
+
+    @classmethod
+    def from_model(cls, book) -> "BookSnapshot":
+        """Snapshot a Book row."""
+        return cls(book.id, book.title, book.author, book.isbn)
+
+
+class MemberSnapshot(NamedTuple):
+    """Immutable copy of a member's profile."""
+    id: str
+    name: str
+    email: str
+
+    @classmethod
+    def from_model(cls, member) -> "MemberSnapshot":
+        """Snapshot a Member row."""
+        return cls(member.id, member.name, member.email)
+
+
+# Cached kinds are table names.
+_SNAPSHOTS = {"books": BookSnapshot, "members": MemberSnapshot}
+
+
+class CatalogCache:
+    """Maps (kind, id) to a snapshot for at most ttl_seconds, LRU bounded."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        """Initialize with the maximum entry count and time to live."""
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[tuple[str, str], tuple[tuple, float]] = (
+            OrderedDict()
+        )
+        self._generations = [0] * _GENERATION_STRIPES
+        self._lock = threading.Lock()
+
+    def get(self, kind: str, key: str) -> tuple | None:
+        """Return the cached snapshot, or None if missing or expired."""
+        if self.max_entries <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get((kind, key))
+            if entry is not None and entry[1] <= time.monotonic():
+                del self._entries[(kind, key)]
+                entry = None
+            if entry is None:
+                CATALOG_CACHE_LOOKUPS.labels(kind=kind, result="miss").inc()
+                return None
+            self._entries.move_to_end((kind, key))
+        CATALOG_CACHE_LOOKUPS.labels(kind=kind, result="hit").inc()
+        return entry[0]
+
+    def generation(self, kind: str, key: str) -> int:
+        """
+        Invalidation generation of the entry; changes on every invalidate.
+
+        Read it before loading a row and pass it to put, so a snapshot
+        loaded before a concurrent invalidation is not cached.
+        """
+        with self._lock:
+            return self._generations[_stripe(kind, key)]
+
+    def put(
+        self,
+        kind: str,
+        key: str,
+        snapshot: tuple,
+        generation: int | None = None
+    ) -> None:
+        """
+        Cache a snapshot for ttl_seconds.
+
+        With generation, only if the entry has not been invalidated since
+        that generation was read.
+        """
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if (
+                generation is not None
+                and self._generations[_stripe(kind, key)] != generation
+            ):
+                return
+            self._entries[(kind, key)] = (
+                snapshot, time.monotonic() + self.ttl_seconds
+            )
+            self._entries.move_to_end((kind, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, kind: str, key: str) -> None:
+        """Drop one entry."""
+        with self._lock:
+            self._entries.pop((kind, key), None)
+            self._generations[_stripe(kind, key)] += 1
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._generations = [
+                generation + 1 for generation in self._generations
+            ]
+
+
+def _stripe(kind: str, key: str) -> int:
+    """Generation stripe of a (kind, key) entry."""
+    return hash((kind, key)) % _GENERATION_STRIPES
+
+
+catalog_cache = CatalogCache(CATALOG_CACHE_SIZE, CATALOG_CACHE_TTL_SECONDS)
+
+
+def get_snapshot(session: Session, model, key: str) -> tuple | None:
+    """
+    Return a snapshot of the model row with primary key key, cached.
+
+    Rows the session has written in its open transaction are read but not
+    cached, so uncommitted data never reaches other sessions. Nor are rows
+    read on a replica session: they may predate a committed write whose
+    invalidation already ran. Nor is a row whose entry was invalidated while
+    it was being loaded, since it may predate that write.
+    """
+    kind = model.__tablename__
+    snapshot = catalog_cache.get(kind, key)
+    if snapshot is not None:
+        return snapshot
+    generation = catalog_cache.generation(kind, key)
+    row = session.get(model, key)
+    if row is None:
+        return None
+    snapshot = _SNAPSHOTS[kind].from_model(row)
+    if (
+        not session.info.get("replica")
+        and (kind, key) not in session.info.get(_CHANGED, ())
+        and row not in session.dirty
+    ):
+        catalog_cache.put(kind, key, snapshot, generation)
+    return snapshot
+
+
+def handle_notification(payload: str) -> None:
+    """Apply a "kind:id" invalidation received from another process."""
+    kind, _, key = payload.partition(":")
+    if kind in _SNAPSHOTS and key:
+        catalog_cache.invalidate(kind, key)
+        CATALOG_CACHE_INVALIDATIONS.labels(source="notify").inc()
+
+
+def record_write(session: Session, model, key: str) -> None:
+    """
+    Mark the model row with primary key key as written by the session.
+
+    For UPDATE statements run outside the unit of work, which the flush
+    hook does not see; the entry is invalidated when the session commits.
+    """
+    if model.__tablename__ in _SNAPSHOTS:
+        _record_changed(session, {(model.__tablename__, key)})
+
+
+def _record_changed(session: Session, changed: set[tuple[str, str]]) -> None:
+    """Remember cached rows written in the transaction; NOTIFY on Postgres."""
+    session.info.setdefault(_CHANGED, set()).update(changed)
+    connection = session.connection()
+    if CATALOG_CACHE_NOTIFY and connection.dialect.name == "postgresql":
+        for kind, key in changed:
+            connection.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": NOTIFY_CHANNEL, "payload": f"{kind}:{key}"}
+            )
+
+
+@event.listens_for(Session, "after_flush")
+def _record_changed_rows(session, flush_context):
+    """Remember cached rows written by the flush."""
+    changed = {
+        (obj.__tablename__, obj.id)
+        for obj in chain(session.dirty, session.deleted)
+        if getattr(obj, "__tablename__", None) in _SNAPSHOTS
+    }
+    if changed:
+        _record_changed(session, changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_rows(session):
+    """Invalidate rows written by the committed transaction."""
+    for kind, key in session.info.pop(_CHANGED, ()):
+        catalog_cache.invalidate(kind, key)
+        CATALOG_CACHE_INVALIDATIONS.labels(source="local").inc()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_rows(session):
+    """Rolled-back writes leave the cache valid."""
+    session.info.pop(_CHANGED, None)
+
+
+class InvalidationListener(threading.Thread):
+    """
+    Daemon thread that LISTENs on NOTIFY_CHANNEL and applies invalidations.
+
+    Uses its own unpooled psycopg2 connection. After a (re)connect the whole
+    cache is cleared, since notifications sent while disconnected are lost.
+    """
+
+    def __init__(self, database_url: str):
+        """Initialize for the sync (psycopg2) database URL."""
+        super().__init__(name="catalog-cache-listener", daemon=True)
+        self._engine = create_engine(database_url, poolclass=NullPool)
+        self._stopped = threading.Event()
+
+    def stop(self) -> None:
+        """Ask the thread to exit after its current wait."""
+        self._stopped.set()
+
+    def run(self) -> None:
+        """Listen until stopped, reconnecting after errors."""
+        while not self._stopped.is_set():
+            try:
+                self._listen()
+            except Exception:
+                logger.exception("Catalog cache listener failed; reconnecting")
+                self._stopped.wait(_RECONNECT_SECONDS)
+        self._engine.dispose()
+
+    def _listen(self) -> None:
+        connection = self._engine.raw_connection()
+        try:
+            dbapi_connection = connection.driver_connection
+            dbapi_connection.autocommit = True
+            with dbapi_connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+            catalog_cache.clear()
+            logger.info("Catalog cache listening on %s", NOTIFY_CHANNEL)
+            while not self._stopped.is_set():
+                readable, _, _ = select.select(
+                    [dbapi_connection], [], [], _RECONNECT_SECONDS
+                )
+                if not readable:
+                    continue
+                dbapi_connection.poll()
+                while dbapi_connection.notifies:
+                    handle_notification(dbapi_connection.notifies.pop(0).payload)
+        finally:
+            connection.close()
+
+
+def start_invalidation_listener(database_url: str) -> InvalidationListener | None:
+    """Start the NOTIFY listener when CATALOG_CACHE_NOTIFY is on for Postgres."""
+    if not CATALOG_CACHE_NOTIFY or not database_url.startswith("postgresql"):
+        return None
+    listener = InvalidationListener(database_url)
+    listener.start()
+    return listener
@@ -4,11 +4,34 @@ gRPC service handlers for LibraryService.
 import logging
 
 import grpc
-from config import JWT_SECRET
-from util.database import get_session
+from config import BULK_IMPORT_BATCH_SIZE, JWT_SECRET
+from util.count_strategy import COUNT_CACHED, COUNT_ESTIMATED, COUNT_EXACT
+from util.cursor_util import (
+    decode_page_token,
+    decode_rank_token,
+    encode_page_token,
+    encode_rank_token,
+)
+from util.request_scope import async_rpc_scope, rpc_scope
 from app.auth.auth_service import AuthService
+from app.auth.interceptor import authenticate_metadata, current_user_id
+from app.auth.password_pool import PasswordPoolFullError
 from app.auth.repository import StaffUserRepository
-from app.library.library_service import LibraryService
+from app.library.library_service import (
+    DEFAULT_EXPORT_CHUNK_SIZE,
+    DEFAULT_SEARCH_LIMIT,
+    MAX_BATCH_ITEMS,
+    MAX_EXPORT_CHUNK_SIZE,
+    MAX_PAGE_LIMIT,
+    BookImportRow,
+    LibraryService,
+)
+from app.library.repository import (
+    BookRepository,
+    BorrowRepository,
+    MemberRepository,
+)
+from app.library.serialization import add_books, add_borrows, add_members
 
 import sys
 from pathlib import Path
@@ -21,34 +44,86 @@ from proto import library_service_pb2_grpc
 
 logger = logging.getLogger(__name__)
 
-AUTH_METADATA_KEY = "authorization"
-
-
-def _get_token_from_context(context) -> str | None:
-    """Extract Bearer token from gRPC metadata."""
-    metadata = dict(context.invocation_metadata()) if context.invocation_metadata() else {}
-    auth = metadata.get(AUTH_METADATA_KEY) or metadata.get("Authorization")
-    if auth and auth.startswith("Bearer "):
-        return auth[7:]
-    return None
+_COUNT_MODES = {
+    library_pb2.COUNT_MODE_EXACT: COUNT_EXACT,
+    library_pb2.COUNT_MODE_CACHED: COUNT_CACHED,
+    library_pb2.COUNT_MODE_ESTIMATED: COUNT_ESTIMATED,
+}
 
 
 def _require_auth(context) -> str | None:
-    """Validate auth and return user_id. Sets UNAUTHENTICATED and returns None if invalid."""
-    token = _get_token_from_context(context)
-    if not token:
-        context.set_code(grpc.StatusCode.UNAUTHENTICATED)
-        context.set_details("Missing or invalid authorization")
-        return None
-    user_id = AuthService.validate_session(token, JWT_SECRET)
-    if not user_id:
+    """
+    Return the authenticated user_id. Sets UNAUTHENTICATED and returns None if invalid.
+
+    Calls that went through AuthInterceptor are already authenticated; direct
+    calls are checked here.
+    """
+    user_id = current_user_id.get()
+    if user_id:
+        return user_id
+    user_id, error = authenticate_metadata(context.invocation_metadata(), JWT_SECRET)
+    if error:
         context.set_code(grpc.StatusCode.UNAUTHENTICATED)
-        context.set_details("Invalid or expired token")
+        context.set_details(error)
         return None
     return user_id
 
 
-def _model_to_book_proto(book, copy_count: int | None = None) -> library_pb2.Book:
+def _get_page_cursor(pagination) -> tuple[tuple | None, str | None]:
+    """
+    Decode pagination.page_token into a (timestamp, id) keyset cursor.
+
+    Returns (cursor, error_message). Cursor is None when no token was sent.
+    """
+    if not pagination.page_token:
+        return None, None
+    cursor = decode_page_token(pagination.page_token)
+    if cursor is None:
+        return None, "Invalid page_token"
+    return cursor, None
+
+
+def _get_count_mode(pagination) -> str:
+    """Map pagination.count_mode to a count strategy; unknown values count exactly."""
+    return _COUNT_MODES.get(pagination.count_mode, COUNT_EXACT)
+
+
+def _next_page_token(
+    rows: list,
+    limit: int,
+    sort_key,
+    encode=encode_page_token
+) -> str:
+    """Build the token for the page after rows; empty on the last page."""
+    if not rows or len(rows) < min(limit, MAX_PAGE_LIMIT):
+        return ""
+    return encode(*sort_key(rows[-1]))
+
+
+def _export_chunk_size(requested: int) -> int:
+    """Rows per streamed message: the default when unset, capped at the max."""
+    if requested <= 0:
+        return DEFAULT_EXPORT_CHUNK_SIZE
+    return min(requested, MAX_EXPORT_CHUNK_SIZE)
+
+
+def _borrow_export_statement(request):
+    """Borrow export statement for a StreamBorrowsRequest."""
+    return BorrowRepository.export_statement(
+        request.member_id or None,
+        request.active_only
+    )
+
+
+def _login_overloaded(request, context) -> auth_pb2.LoginResponse:
+    """Fail a login with RESOURCE_EXHAUSTED when bcrypt is saturated or slow."""
+    logger.warning("Login rejected, password pool busy: %s", request.username)
+    context.set_code(grpc.StatusCode.RESOURCE_EXHAUSTED)
+    context.set_details("Too many concurrent logins, retry shortly")
+    return auth_pb2.LoginResponse()
+
+
+def _model_to_book_proto(book) -> library_pb2.Book:
     """Convert Book model to proto."""
     p = library_pb2.Book()
     p.id = book.id
@@ -56,8 +131,9 @@ def _model_to_book_proto(book, copy_count: int | None = None) -> library_pb2.Boo
     p.author = book.author
     if book.isbn:
         p.isbn = book.isbn
-    if copy_count is not None:
-        p.copy_count = copy_count
+    p.copy_count = book.copy_count
+    p.available_count = book.available_count
+    p.version = book.version
     return p
 
 
@@ -67,6 +143,7 @@ def _model_to_member_proto(member) -> library_pb2.Member:
     p.id = member.id
     p.name = member.name
     p.email = member.email
+    p.version = member.version
     return p
 
 
@@ -97,23 +174,470 @@ def _model_to_book_copy_proto(copy) -> library_pb2.BookCopy:
     p.book_id = copy.book_id
     p.copy_number = copy.copy_number
     p.status = copy.status
+    p.version = copy.version
     return p
 
 
+def _create_book(session, request, context):
+    """Create a new book."""
+    book = LibraryService.create_book(
+        session,
+        request.title,
+        request.author,
+        request.isbn or None
+    )
+    return library_pb2.CreateBookResponse(book=_model_to_book_proto(book))
+
+
+def _update_book(session, request, context):
+    """Update a book, compare-and-set when expected_version is given."""
+    book, error = LibraryService.update_book(
+        session,
+        request.id,
+        request.title or None,
+        request.author or None,
+        request.isbn or None,
+        request.expected_version or None
+    )
+    if error:
+        if error == "Book not found":
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+        else:
+            context.set_code(grpc.StatusCode.ABORTED)
+        context.set_details(error)
+        return library_pb2.UpdateBookResponse()
+    return library_pb2.UpdateBookResponse(book=_model_to_book_proto(book))
+
+
+def _list_books(session, request, context):
+    """List books with pagination and copy counts."""
+    page = request.pagination.page if request.pagination else 1
+    limit = request.pagination.limit if request.pagination else 100
+    after, error = _get_page_cursor(request.pagination)
+    if error:
+        context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+        context.set_details(error)
+        return library_pb2.ListBooksResponse()
+    books, total, total_exact = LibraryService.list_books(
+        session, page, limit, after,
+        _get_count_mode(request.pagination)
+    )
+    response = library_pb2.ListBooksResponse(
+        pagination=library_pb2.PaginationResponse(
+            page=page,
+            limit=limit,
+            total_count=total,
+            total_count_exact=total_exact,
+            next_page_token=_next_page_token(
+                books,
+                limit,
+                lambda book: (book.created_at, book.id)
+            )
+        )
+    )
+    add_books(response.books, books)
+    return response
+
+
+def _search_books(session, request, context):
+    """Ranked catalog search with cursor pagination."""
+    limit = request.pagination.limit or DEFAULT_SEARCH_LIMIT
+    after = None
+    if request.pagination.page_token:
+        after = decode_rank_token(request.pagination.page_token)
+        if after is None:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details("Invalid page_token")
+            return library_pb2.SearchBooksResponse()
+    rows, error = LibraryService.search_books(
+        session, request.query, limit, after
+    )
+    if error:
+        context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+        context.set_details(error)
+        return library_pb2.SearchBooksResponse()
+    return library_pb2.SearchBooksResponse(
+        books=[_model_to_book_proto(book) for book, _ in rows],
+        pagination=library_pb2.PaginationResponse(
+            limit=limit,
+            next_page_token=_next_page_token(
+                rows,
+                limit,
+                lambda row: (row[1], row[0].id),
+                encode_rank_token
+            )
+        )
+    )
+
+
+def _create_member(session, request, context):
+    """Create a new member."""
+    member = LibraryService.create_member(
+        session,
+        request.name,
+        request.email
+    )
+    return library_pb2.CreateMemberResponse(
+        member=_model_to_member_proto(member)
+    )
+
+
+def _update_member(session, request, context):
+    """Update a member, compare-and-set when expected_version is given."""
+    member, error = LibraryService.update_member(
+        session,
+        request.id,
+        request.name or None,
+        request.email or None,
+        request.expected_version or None
+    )
+    if error:
+        if error == "Member not found":
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+        else:
+            context.set_code(grpc.StatusCode.ABORTED)
+        context.set_details(error)
+        return library_pb2.UpdateMemberResponse()
+    return library_pb2.UpdateMemberResponse(
+        member=_model_to_member_proto(member)
+    )
+
+
+def _list_members(session, request, context):
+    """List members with pagination."""
+    page = request.pagination.page if request.pagination else 1
+    limit = request.pagination.limit if request.pagination else 100
+    after, error = _get_page_cursor(request.pagination)
+    if error:
+        context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+        context.set_details(error)
+        return library_pb2.ListMembersResponse()
+    members, total, total_exact = LibraryService.list_members(
+        session, page, limit, after,
+        _get_count_mode(request.pagination)
+    )
+    response = library_pb2.ListMembersResponse(
+        pagination=library_pb2.PaginationResponse(
+            page=page,
+            limit=limit,
+            total_count=total,
+            total_count_exact=total_exact,
+            next_page_token=_next_page_token(
+                members,
+                limit,
+                lambda m: (m.created_at, m.id)
+            )
+        )
+    )
+    add_members(response.members, members)
+    return response
+
+
+def _borrow_book(session, request, context):
+    """
+    Borrow a book copy with the configured BORROW_STRATEGY.
+
+    "atomic" (the default) claims the copy with a conditional
+    UPDATE ... RETURNING; "locking" reads it with SELECT ... FOR UPDATE.
+    """
+    borrow, error = LibraryService.borrow_book(
+        session,
+        request.copy_id,
+        request.member_id
+    )
+    if error:
+        logger.warning("Borrow failed: %s", error)
+        context.set_code(grpc.StatusCode.FAILED_PRECONDITION)
+        context.set_details(error)
+        return library_pb2.BorrowBookResponse()
+    return library_pb2.BorrowBookResponse(
+        borrow=_model_to_borrow_proto(borrow)
+    )
+
+
+def _return_book(session, request, context):
+    """Return a book by copy id."""
+    borrow, error = LibraryService.return_book(
+        session,
+        request.copy_id
+    )
+    if error:
+        logger.warning("Return failed: %s", error)
+        context.set_code(grpc.StatusCode.FAILED_PRECONDITION)
+        context.set_details(error)
+        return library_pb2.ReturnBookResponse()
+    return library_pb2.ReturnBookResponse(
+        borrow=_model_to_borrow_proto(borrow)
+    )
+
+
+def _check_batch_size(copy_ids, context) -> bool:
+    """Reject empty or oversized copy_id batches with INVALID_ARGUMENT."""
+    if not copy_ids:
+        error = "copy_ids is required"
+    elif len(copy_ids) > MAX_BATCH_ITEMS:
+        error = f"At most {MAX_BATCH_ITEMS} copy_ids per request"
+    else:
+        return True
+    context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+    context.set_details(error)
+    return False
+
+
+def _batch_item_results(results) -> list[library_pb2.BorrowItemResult]:
+    """Convert (copy_id, borrow, error) tuples to BorrowItemResult protos."""
+    items = []
+    for copy_id, borrow, error in results:
+        item = library_pb2.BorrowItemResult(copy_id=copy_id)
+        if error:
+            item.error = error
+        else:
+            item.borrow.CopyFrom(_model_to_borrow_proto(borrow))
+        items.append(item)
+    return items
+
+
+def _borrow_books(session, request, context):
+    """Borrow several copies for a member in one transaction."""
+    copy_ids = list(request.copy_ids)
+    if not _check_batch_size(copy_ids, context):
+        return library_pb2.BorrowBooksResponse()
+    results, error = LibraryService.borrow_books(
+        session,
+        request.member_id,
+        copy_ids
+    )
+    if error:
+        logger.warning("Batch borrow failed: %s", error)
+        context.set_code(grpc.StatusCode.FAILED_PRECONDITION)
+        context.set_details(error)
+        return library_pb2.BorrowBooksResponse()
+    return library_pb2.BorrowBooksResponse(
+        results=_batch_item_results(results)
+    )
+
+
+def _return_books(session, request, context):
+    """Return several copies in one transaction."""
+    copy_ids = list(request.copy_ids)
+    if not _check_batch_size(copy_ids, context):
+        return library_pb2.ReturnBooksResponse()
+    results = LibraryService.return_books(session, copy_ids)
+    return library_pb2.ReturnBooksResponse(
+        results=_batch_item_results(results)
+    )
+
+
+def _list_borrowings(session, request, context):
+    """List borrowings, optionally by member."""
+    page = request.pagination.page if request.pagination else 1
+    limit = request.pagination.limit if request.pagination else 100
+    member_id = request.member_id or None
+    after, error = _get_page_cursor(request.pagination)
+    if error:
+        context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+        context.set_details(error)
+        return library_pb2.ListBorrowingsResponse()
+    borrows, total, total_exact = LibraryService.list_borrowings(
+        session, member_id, page, limit, after,
+        _get_count_mode(request.pagination)
+    )
+    response = library_pb2.ListBorrowingsResponse(
+        pagination=library_pb2.PaginationResponse(
+            page=page,
+            limit=limit,
+            total_count=total,
+            total_count_exact=total_exact,
+            next_page_token=_next_page_token(
+                borrows,
+                limit,
+                lambda b: (b.borrowed_at, b.id)
+            )
+        )
+    )
+    add_borrows(response.borrows, borrows)
+    return response
+
+
+def _create_book_copy(session, request, context):
+    """Create a new book copy."""
+    copy, error = LibraryService.create_book_copy(
+        session,
+        request.book_id,
+        request.copy_number or ""
+    )
+    if error:
+        if error == "Book not found":
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+        else:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+        context.set_details(error)
+        return library_pb2.CreateBookCopyResponse()
+    return library_pb2.CreateBookCopyResponse(
+        copy=_model_to_book_copy_proto(copy)
+    )
+
+
+def _list_available_copies(session, request, context):
+    """List available copies with book info."""
+    page = request.pagination.page if request.pagination else 1
+    limit = request.pagination.limit if request.pagination else 100
+    rows, total, total_exact = LibraryService.list_available_copies(
+        session, page, limit, _get_count_mode(request.pagination)
+    )
+    copies = []
+    for copy, book in rows:
+        ac = library_pb2.AvailableCopy()
+        ac.id = copy.id
+        ac.book_id = copy.book_id
+        ac.book_title = book.title
+        ac.copy_number = copy.copy_number
+        copies.append(ac)
+    return library_pb2.ListAvailableCopiesResponse(
+        copies=copies,
+        pagination=library_pb2.PaginationResponse(
+            page=page,
+            limit=limit,
+            total_count=total,
+            total_count_exact=total_exact
+        )
+    )
+
+
+def _list_copies_by_book(session, request, context):
+    """List copies for a book with pagination."""
+    book_id = request.book_id or ""
+    if not book_id:
+        context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+        context.set_details("book_id is required")
+        return library_pb2.ListCopiesByBookResponse()
+    page = request.pagination.page if request.pagination else 1
+    limit = request.pagination.limit if request.pagination else 100
+    copies, total = LibraryService.list_copies_by_book_id(
+        session, book_id, page, limit
+    )
+    if copies is None:
+        context.set_code(grpc.StatusCode.NOT_FOUND)
+        context.set_details("Book not found")
+        return library_pb2.ListCopiesByBookResponse()
+    return library_pb2.ListCopiesByBookResponse(
+        copies=[_model_to_book_copy_proto(c) for c in copies],
+        pagination=library_pb2.PaginationResponse(
+            page=page,
+            limit=limit,
+            total_count=total,
+            total_count_exact=True
+        )
+    )
+
+
+def _stream_books(session, request, context):
+    """
+    Stream all books with copy and availability counts in chunks.
+
+    yield_per keeps one chunk of rows in memory and uses a server-side
+    cursor where the driver supports it. gRPC pulls the next chunk only
+    after the previous message was sent, so slow clients apply
+    back-pressure to the cursor.
+    """
+    chunk_size = _export_chunk_size(request.chunk_size)
+    result = session.scalars(
+        BookRepository.export_statement()
+        .execution_options(yield_per=chunk_size)
+    )
+    for books in result.partitions():
+        yield library_pb2.BookChunk(
+            books=[_model_to_book_proto(b) for b in books]
+        )
+
+
+def _stream_members(session, request, context):
+    """Stream all members in chunks (see _stream_books)."""
+    chunk_size = _export_chunk_size(request.chunk_size)
+    result = session.scalars(
+        MemberRepository.export_statement()
+        .execution_options(yield_per=chunk_size)
+    )
+    for members in result.partitions():
+        yield library_pb2.MemberChunk(
+            members=[_model_to_member_proto(m) for m in members]
+        )
+
+
+def _stream_borrows(session, request, context):
+    """Stream borrows with copy, book and member in chunks (see _stream_books)."""
+    chunk_size = _export_chunk_size(request.chunk_size)
+    result = session.scalars(
+        _borrow_export_statement(request)
+        .execution_options(yield_per=chunk_size)
+    )
+    for borrows in result.partitions():
+        yield library_pb2.BorrowChunk(
+            borrows=[_model_to_borrow_proto(b) for b in borrows]
+        )
+
+
+def _import_row(book) -> BookImportRow:
+    """Convert an ImportBookRow proto to a BookImportRow."""
+    return BookImportRow(
+        book.title,
+        book.author,
+        book.isbn or None,
+        list(book.copy_numbers)
+    )
+
+
+def _import_rows(request_iterator):
+    """Flatten streamed BulkImportBooksRequest messages into import rows."""
+    for request in request_iterator:
+        for book in request.books:
+            yield _import_row(book)
+
+
+def _bulk_import_response(
+    books: int,
+    copies: int,
+    errors: list[tuple[int, str]]
+) -> library_pb2.BulkImportBooksResponse:
+    """Build the BulkImportBooks summary with its per-row error report."""
+    return library_pb2.BulkImportBooksResponse(
+        books_imported=books,
+        copies_imported=copies,
+        errors=[
+            library_pb2.ImportRowError(row=index, error=error)
+            for index, error in errors
+        ]
+    )
+
+
+def _bulk_import_books(session, request_iterator, context):
+    """Import streamed books and copies in BULK_IMPORT_BATCH_SIZE batches."""
+    books, copies, errors = LibraryService.bulk_import_books(
+        session,
+        _import_rows(request_iterator),
+        BULK_IMPORT_BATCH_SIZE
+    )
+    if errors:
+        logger.warning("Bulk import rejected %s rows", len(errors))
+    return _bulk_import_response(books, copies, errors)
+
+
 class LibraryServiceHandler(library_service_pb2_grpc.LibraryServiceServicer):
     """gRPC handler for LibraryService."""
 
     def Login(self, request, context):
         """Authenticate staff and return JWT token."""
         logger.info("Login attempt for user: %s", request.username)
-        session = get_session()
-        try:
-            result = AuthService.login(
-                session,
-                request.username,
-                request.password,
-                JWT_SECRET
-            )
+        with rpc_scope() as scope:
+            try:
+                result = AuthService.login(
+                    scope.session(),
+                    request.username,
+                    request.password,
+                    JWT_SECRET
+                )
+            except PasswordPoolFullError:
+                return _login_overloaded(request, context)
             if not result:
                 logger.warning("Login failed for user: %s", request.username)
                 context.set_code(grpc.StatusCode.UNAUTHENTICATED)
@@ -124,278 +648,406 @@ class LibraryServiceHandler(library_service_pb2_grpc.LibraryServiceServicer):
                 token=result["token"],
                 expires_at=result["expires_at"]
             )
-        finally:
-            session.close()
 
     def CreateBook(self, request, context):
         """Create a new book."""
         if _require_auth(context) is None:
             return library_pb2.CreateBookResponse()
-        session = get_session()
-        try:
-            book = LibraryService.create_book(
-                session,
-                request.title,
-                request.author,
-                request.isbn or None
-            )
-            return library_pb2.CreateBookResponse(book=_model_to_book_proto(book))
-        finally:
-            session.close()
+        with rpc_scope() as scope:
+            return _create_book(scope.session(), request, context)
 
     def UpdateBook(self, request, context):
         """Update a book."""
         if _require_auth(context) is None:
             return library_pb2.UpdateBookResponse()
-        session = get_session()
-        try:
-            book = LibraryService.update_book(
-                session,
-                request.id,
-                request.title or None,
-                request.author or None,
-                request.isbn or None
-            )
-            if not book:
-                context.set_code(grpc.StatusCode.NOT_FOUND)
-                context.set_details("Book not found")
-                return library_pb2.UpdateBookResponse()
-            return library_pb2.UpdateBookResponse(book=_model_to_book_proto(book))
-        finally:
-            session.close()
+        with rpc_scope() as scope:
+            return _update_book(scope.session(), request, context)
 
     def ListBooks(self, request, context):
         """List books with pagination and copy counts."""
         if _require_auth(context) is None:
             return library_pb2.ListBooksResponse()
-        session = get_session()
-        try:
-            page = request.pagination.page if request.pagination else 1
-            limit = request.pagination.limit if request.pagination else 100
-            books_with_counts, total = LibraryService.list_books(
-                session, page, limit
+        with rpc_scope() as scope:
+            return _list_books(
+                scope.read_session(request.consistent), request, context
             )
-            book_protos = [
-                _model_to_book_proto(book, copy_count)
-                for book, copy_count in books_with_counts
-            ]
-            return library_pb2.ListBooksResponse(
-                books=book_protos,
-                pagination=library_pb2.PaginationResponse(
-                    page=page,
-                    limit=limit,
-                    total_count=total
-                )
+
+    def SearchBooks(self, request, context):
+        """Search books by title/author (ranked) or exact ISBN."""
+        if _require_auth(context) is None:
+            return library_pb2.SearchBooksResponse()
+        with rpc_scope() as scope:
+            return _search_books(
+                scope.read_session(request.consistent), request, context
             )
-        finally:
-            session.close()
 
     def CreateMember(self, request, context):
         """Create a new member."""
         if _require_auth(context) is None:
             return library_pb2.CreateMemberResponse()
-        session = get_session()
-        try:
-            member = LibraryService.create_member(
-                session,
-                request.name,
-                request.email
-            )
-            return library_pb2.CreateMemberResponse(
-                member=_model_to_member_proto(member)
-            )
-        finally:
-            session.close()
+        with rpc_scope() as scope:
+            return _create_member(scope.session(), request, context)
 
     def UpdateMember(self, request, context):
         """Update a member."""
         if _require_auth(context) is None:
             return library_pb2.UpdateMemberResponse()
-        session = get_session()
-        try:
-            member = LibraryService.update_member(
-                session,
-                request.id,
-                request.name or None,
-                request.email or None
-            )
-            if not member:
-                context.set_code(grpc.StatusCode.NOT_FOUND)
-                context.set_details("Member not found")
-                return library_pb2.UpdateMemberResponse()
-            return library_pb2.UpdateMemberResponse(
-                member=_model_to_member_proto(member)
-            )
-        finally:
-            session.close()
+        with rpc_scope() as scope:
+            return _update_member(scope.session(), request, context)
 
     def ListMembers(self, request, context):
         """List members with pagination."""
         if _require_auth(context) is None:
             return library_pb2.ListMembersResponse()
-        session = get_session()
-        try:
-            page = request.pagination.page if request.pagination else 1
-            limit = request.pagination.limit if request.pagination else 100
-            members, total = LibraryService.list_members(session, page, limit)
-            return library_pb2.ListMembersResponse(
-                members=[_model_to_member_proto(m) for m in members],
-                pagination=library_pb2.PaginationResponse(
-                    page=page,
-                    limit=limit,
-                    total_count=total
-                )
+        with rpc_scope() as scope:
+            return _list_members(
+                scope.read_session(request.consistent), request, context
             )
-        finally:
-            session.close()
 
     def BorrowBook(self, request, context):
-        """Borrow a book copy (with pessimistic locking)."""
+        """Borrow a book copy (strategy per BORROW_STRATEGY)."""
         if _require_auth(context) is None:
             return library_pb2.BorrowBookResponse()
-        session = get_session()
-        try:
-            borrow, error = LibraryService.borrow_book(
-                session,
-                request.copy_id,
-                request.member_id
-            )
-            if error:
-                logger.warning("Borrow failed: %s", error)
-                context.set_code(grpc.StatusCode.FAILED_PRECONDITION)
-                context.set_details(error)
-                return library_pb2.BorrowBookResponse()
-            return library_pb2.BorrowBookResponse(
-                borrow=_model_to_borrow_proto(borrow)
-            )
-        finally:
-            session.close()
+        with rpc_scope() as scope:
+            return _borrow_book(scope.session(), request, context)
 
     def ReturnBook(self, request, context):
         """Return a book by copy id."""
         if _require_auth(context) is None:
             return library_pb2.ReturnBookResponse()
-        session = get_session()
-        try:
-            borrow, error = LibraryService.return_book(
-                session,
-                request.copy_id
-            )
-            if error:
-                logger.warning("Return failed: %s", error)
-                context.set_code(grpc.StatusCode.FAILED_PRECONDITION)
-                context.set_details(error)
-                return library_pb2.ReturnBookResponse()
-            return library_pb2.ReturnBookResponse(
-                borrow=_model_to_borrow_proto(borrow)
-            )
-        finally:
-            session.close()
+        with rpc_scope() as scope:
+            return _return_book(scope.session(), request, context)
+
+    def BorrowBooks(self, request, context):
+        """Borrow several copies for a member in one transaction."""
+        if _require_auth(context) is None:
+            return library_pb2.BorrowBooksResponse()
+        with rpc_scope() as scope:
+            return _borrow_books(scope.session(), request, context)
+
+    def ReturnBooks(self, request, context):
+        """Return several copies in one transaction."""
+        if _require_auth(context) is None:
+            return library_pb2.ReturnBooksResponse()
+        with rpc_scope() as scope:
+            return _return_books(scope.session(), request, context)
 
     def ListBorrowings(self, request, context):
         """List borrowings, optionally by member."""
         if _require_auth(context) is None:
             return library_pb2.ListBorrowingsResponse()
-        session = get_session()
-        try:
-            page = request.pagination.page if request.pagination else 1
-            limit = request.pagination.limit if request.pagination else 100
-            member_id = request.member_id or None
-            borrows, total = LibraryService.list_borrowings(
-                session, member_id, page, limit
+        with rpc_scope() as scope:
+            return _list_borrowings(
+                scope.read_session(request.consistent), request, context
             )
-            return library_pb2.ListBorrowingsResponse(
-                borrows=[_model_to_borrow_proto(b) for b in borrows],
-                pagination=library_pb2.PaginationResponse(
-                    page=page,
-                    limit=limit,
-                    total_count=total
-                )
-            )
-        finally:
-            session.close()
 
     def CreateBookCopy(self, request, context):
         """Create a new book copy."""
         if _require_auth(context) is None:
             return library_pb2.CreateBookCopyResponse()
-        session = get_session()
-        try:
-            copy, error = LibraryService.create_book_copy(
-                session,
-                request.book_id,
-                request.copy_number or ""
-            )
-            if error:
-                if error == "Book not found":
-                    context.set_code(grpc.StatusCode.NOT_FOUND)
-                else:
-                    context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
-                context.set_details(error)
-                return library_pb2.CreateBookCopyResponse()
-            return library_pb2.CreateBookCopyResponse(
-                copy=_model_to_book_copy_proto(copy)
-            )
-        finally:
-            session.close()
+        with rpc_scope() as scope:
+            return _create_book_copy(scope.session(), request, context)
 
     def ListAvailableCopies(self, request, context):
         """List available copies with book info."""
         if _require_auth(context) is None:
             return library_pb2.ListAvailableCopiesResponse()
-        session = get_session()
-        try:
-            page = request.pagination.page if request.pagination else 1
-            limit = request.pagination.limit if request.pagination else 100
-            rows, total = LibraryService.list_available_copies(
-                session, page, limit
+        with rpc_scope() as scope:
+            return _list_available_copies(
+                scope.read_session(request.consistent), request, context
             )
-            copies = []
-            for copy, book in rows:
-                ac = library_pb2.AvailableCopy()
-                ac.id = copy.id
-                ac.book_id = copy.book_id
-                ac.book_title = book.title
-                ac.copy_number = copy.copy_number
-                copies.append(ac)
-            return library_pb2.ListAvailableCopiesResponse(
-                copies=copies,
-                pagination=library_pb2.PaginationResponse(
-                    page=page,
-                    limit=limit,
-                    total_count=total
+
+    def ListCopiesByBook(self, request, context):
+        """List copies for a book with pagination."""
+        if _require_auth(context) is None:
+            return library_pb2.ListCopiesByBookResponse()
+        with rpc_scope() as scope:
+            return _list_copies_by_book(
+                scope.read_session(request.consistent), request, context
+            )
+
+    def BulkImportBooks(self, request_iterator, context):
+        """Import a client stream of books with copies in batches."""
+        if _require_auth(context) is None:
+            return library_pb2.BulkImportBooksResponse()
+        with rpc_scope() as scope:
+            return _bulk_import_books(
+                scope.session(), request_iterator, context
+            )
+
+    def StreamBooks(self, request, context):
+        """Stream the full catalog in chunks."""
+        if _require_auth(context) is None:
+            return
+        with rpc_scope() as scope:
+            yield from _stream_books(scope.session(), request, context)
+
+    def StreamMembers(self, request, context):
+        """Stream all members in chunks."""
+        if _require_auth(context) is None:
+            return
+        with rpc_scope() as scope:
+            yield from _stream_members(scope.session(), request, context)
+
+    def StreamBorrows(self, request, context):
+        """Stream borrows in chunks, optionally by member or active only."""
+        if _require_auth(context) is None:
+            return
+        with rpc_scope() as scope:
+            yield from _stream_borrows(scope.session(), request, context)
+
+
+class AsyncLibraryServiceHandler(
+    library_service_pb2_grpc.LibraryServiceServicer
+):
+    """
+    grpc.aio handler for LibraryService.
+
+    Runs the same RPC bodies as LibraryServiceHandler on an AsyncSession via
+    run_sync, so database I/O awaits instead of holding a worker thread. The
+    AsyncSession belongs to the call's async_rpc_scope, so per-RPC metrics
+    and the query guards apply as on the thread pool server.
+    """
+
+    async def Login(self, request, context):
+        """Authenticate staff and return JWT token."""
+        logger.info("Login attempt for user: %s", request.username)
+        async with async_rpc_scope() as scope:
+            try:
+                result = await AuthService.login_async(
+                    scope.async_session(),
+                    request.username,
+                    request.password,
+                    JWT_SECRET
                 )
+            except PasswordPoolFullError:
+                return _login_overloaded(request, context)
+        if not result:
+            logger.warning("Login failed for user: %s", request.username)
+            context.set_code(grpc.StatusCode.UNAUTHENTICATED)
+            context.set_details("Invalid credentials")
+            return auth_pb2.LoginResponse()
+        logger.info("Login successful for user: %s", request.username)
+        return auth_pb2.LoginResponse(
+            token=result["token"],
+            expires_at=result["expires_at"]
+        )
+
+    async def CreateBook(self, request, context):
+        """Create a new book."""
+        if _require_auth(context) is None:
+            return library_pb2.CreateBookResponse()
+        async with async_rpc_scope() as scope:
+            return await scope.async_session().run_sync(
+                _create_book, request, context
             )
-        finally:
-            session.close()
 
-    def ListCopiesByBook(self, request, context):
+    async def UpdateBook(self, request, context):
+        """Update a book."""
+        if _require_auth(context) is None:
+            return library_pb2.UpdateBookResponse()
+        async with async_rpc_scope() as scope:
+            return await scope.async_session().run_sync(
+                _update_book, request, context
+            )
+
+    async def ListBooks(self, request, context):
+        """List books with pagination and copy counts."""
+        if _require_auth(context) is None:
+            return library_pb2.ListBooksResponse()
+        async with async_rpc_scope() as scope:
+            session = scope.async_read_session(request.consistent)
+            return await session.run_sync(
+                _list_books, request, context
+            )
+
+    async def SearchBooks(self, request, context):
+        """Search books by title/author (ranked) or exact ISBN."""
+        if _require_auth(context) is None:
+            return library_pb2.SearchBooksResponse()
+        async with async_rpc_scope() as scope:
+            session = scope.async_read_session(request.consistent)
+            return await session.run_sync(
+                _search_books, request, context
+            )
+
+    async def CreateMember(self, request, context):
+        """Create a new member."""
+        if _require_auth(context) is None:
+            return library_pb2.CreateMemberResponse()
+        async with async_rpc_scope() as scope:
+            return await scope.async_session().run_sync(
+                _create_member, request, context
+            )
+
+    async def UpdateMember(self, request, context):
+        """Update a member."""
+        if _require_auth(context) is None:
+            return library_pb2.UpdateMemberResponse()
+        async with async_rpc_scope() as scope:
+            return await scope.async_session().run_sync(
+                _update_member, request, context
+            )
+
+    async def ListMembers(self, request, context):
+        """List members with pagination."""
+        if _require_auth(context) is None:
+            return library_pb2.ListMembersResponse()
+        async with async_rpc_scope() as scope:
+            session = scope.async_read_session(request.consistent)
+            return await session.run_sync(
+                _list_members, request, context
+            )
+
+    async def BorrowBook(self, request, context):
+        """Borrow a book copy (strategy per BORROW_STRATEGY)."""
+        if _require_auth(context) is None:
+            return library_pb2.BorrowBookResponse()
+        async with async_rpc_scope() as scope:
+            return await scope.async_session().run_sync(
+                _borrow_book, request, context
+            )
+
+    async def ReturnBook(self, request, context):
+        """Return a book by copy id."""
+        if _require_auth(context) is None:
+            return library_pb2.ReturnBookResponse()
+        async with async_rpc_scope() as scope:
+            return await scope.async_session().run_sync(
+                _return_book, request, context
+            )
+
+    async def BorrowBooks(self, request, context):
+        """Borrow several copies for a member in one transaction."""
+        if _require_auth(context) is None:
+            return library_pb2.BorrowBooksResponse()
+        async with async_rpc_scope() as scope:
+            return await scope.async_session().run_sync(
+                _borrow_books, request, context
+            )
+
+    async def ReturnBooks(self, request, context):
+        """Return several copies in one transaction."""
+        if _require_auth(context) is None:
+            return library_pb2.ReturnBooksResponse()
+        async with async_rpc_scope() as scope:
+            return await scope.async_session().run_sync(
+                _return_books, request, context
+            )
+
+    async def ListBorrowings(self, request, context):
+        """List borrowings, optionally by member."""
+        if _require_auth(context) is None:
+            return library_pb2.ListBorrowingsResponse()
+        async with async_rpc_scope() as scope:
+            session = scope.async_read_session(request.consistent)
+            return await session.run_sync(
+                _list_borrowings, request, context
+            )
+
+    async def CreateBookCopy(self, request, context):
+        """Create a new book copy."""
+        if _require_auth(context) is None:
+            return library_pb2.CreateBookCopyResponse()
+        async with async_rpc_scope() as scope:
+            return await scope.async_session().run_sync(
+                _create_book_copy, request, context
+            )
+
+    async def ListAvailableCopies(self, request, context):
+        """List available copies with book info."""
+        if _require_auth(context) is None:
+            return library_pb2.ListAvailableCopiesResponse()
+        async with async_rpc_scope() as scope:
+            session = scope.async_read_session(request.consistent)
+            return await session.run_sync(
+                _list_available_copies, request, context
+            )
+
+    async def ListCopiesByBook(self, request, context):
         """List copies for a book with pagination."""
         if _require_auth(context) is None:
             return library_pb2.ListCopiesByBookResponse()
-        session = get_session()
-        try:
-            book_id = request.book_id or ""
-            if not book_id:
-                context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
-                context.set_details("book_id is required")
-                return library_pb2.ListCopiesByBookResponse()
-            page = request.pagination.page if request.pagination else 1
-            limit = request.pagination.limit if request.pagination else 100
-            copies, total = LibraryService.list_copies_by_book_id(
-                session, book_id, page, limit
+        async with async_rpc_scope() as scope:
+            session = scope.async_read_session(request.consistent)
+            return await session.run_sync(
+                _list_copies_by_book, request, context
+            )
+
+    async def StreamBooks(self, request, context):
+        """Stream the full catalog in chunks from a server-side cursor."""
+        if _require_auth(context) is None:
+            return
+        chunk_size = _export_chunk_size(request.chunk_size)
+        async with async_rpc_scope() as scope:
+            result = await scope.async_session().stream_scalars(
+                BookRepository.export_statement()
+                .execution_options(yield_per=chunk_size)
             )
-            if copies is None:
-                context.set_code(grpc.StatusCode.NOT_FOUND)
-                context.set_details("Book not found")
-                return library_pb2.ListCopiesByBookResponse()
-            return library_pb2.ListCopiesByBookResponse(
-                copies=[_model_to_book_copy_proto(c) for c in copies],
-                pagination=library_pb2.PaginationResponse(
-                    page=page,
-                    limit=limit,
-                    total_count=total
+            async for books in result.partitions():
+                yield library_pb2.BookChunk(
+                    books=[_model_to_book_proto(b) for b in books]
                 )
+
+    async def StreamMembers(self, request, context):
+        """Stream all members in chunks from a server-side cursor."""
+        if _require_auth(context) is None:
+            return
+        chunk_size = _export_chunk_size(request.chunk_size)
+        async with async_rpc_scope() as scope:
+            result = await scope.async_session().stream_scalars(
+                MemberRepository.export_statement()
+                .execution_options(yield_per=chunk_size)
+            )
+            async for members in result.partitions():
+                yield library_pb2.MemberChunk(
+                    members=[_model_to_member_proto(m) for m in members]
+                )
+
+    async def StreamBorrows(self, request, context):
+        """Stream borrows in chunks from a server-side cursor."""
+        if _require_auth(context) is None:
+            return
+        chunk_size = _export_chunk_size(request.chunk_size)
+        async with async_rpc_scope() as scope:
+            result = await scope.async_session().stream_scalars(
+                _borrow_export_statement(request)
+                .execution_options(yield_per=chunk_size)
             )
-        finally:
-            session.close()
+            async for borrows in result.partitions():
+                yield library_pb2.BorrowChunk(
+                    borrows=[_model_to_borrow_proto(b) for b in borrows]
+                )
+
+    async def BulkImportBooks(self, request_iterator, context):
+        """Import a client stream of books with copies in batches."""
+        if _require_auth(context) is None:
+            return library_pb2.BulkImportBooksResponse()
+        books = copies = 0
+        errors = []
+        batch = []
+        index = 0
+        async with async_rpc_scope() as scope:
+            session = scope.async_session()
+
+            async def flush():
+                nonlocal books, copies
+                batch_books, batch_copies, batch_errors = await session.run_sync(
+                    LibraryService.import_book_batch, batch
+                )
+                books += batch_books
+                copies += batch_copies
+                errors.extend(batch_errors)
+                batch.clear()
+
+            async for request in request_iterator:
+                for book in request.books:
+                    batch.append((index, _import_row(book)))
+                    index += 1
+                    if len(batch) >= BULK_IMPORT_BATCH_SIZE:
+                        await flush()
+            if batch:
+                await flush()
+        if errors:
+            logger.warning("Bulk import rejected %s rows", len(errors))
+        return _bulk_import_response(books, copies, errors)
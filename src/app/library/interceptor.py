@@ -0,0 +1,164 @@
+"""
+Server interceptors for request scopes and per-RPC metrics.
+"""
+import inspect
+import time
+from contextlib import contextmanager
+
+import grpc
+
+from app.auth.interceptor import SERVICE_PREFIX
+from util.grpc_interceptor_util import handler_factory, rewrap
+from util.metrics import RPC_IN_FLIGHT, RPC_LATENCY_SECONDS, RPC_RESPONSES
+from util.request_scope import async_rpc_scope, rpc_scope
+
+
+def _method_name(method: str) -> str | None:
+    """Short RPC name for LibraryService methods, None for other services."""
+    if method.startswith(SERVICE_PREFIX):
+        return method[len(SERVICE_PREFIX):]
+    return None
+
+
+def _method_label(method: str) -> str:
+    """Metrics label: the short name for LibraryService, else the full path."""
+    return _method_name(method) or method
+
+
+@contextmanager
+def _observed(method: str, context):
+    """
+    Track one call of method as in flight and record its latency and status.
+
+    The status is the code the handler set or aborted with; otherwise OK,
+    UNKNOWN for an unhandled exception, or CANCELLED when a streaming call
+    is closed before it finishes.
+    """
+    RPC_IN_FLIGHT.labels(method=method).inc()
+    started = time.perf_counter()
+    default = grpc.StatusCode.CANCELLED
+    try:
+        yield
+        default = grpc.StatusCode.OK
+    except Exception:
+        default = grpc.StatusCode.UNKNOWN
+        raise
+    finally:
+        RPC_IN_FLIGHT.labels(method=method).dec()
+        RPC_LATENCY_SECONDS.labels(method=method).observe(
+            time.perf_counter() - started
+        )
+        code = context.code() or default
+        RPC_RESPONSES.labels(method=method, code=code.name).inc()
+
+
+class MetricsInterceptor(grpc.ServerInterceptor):
+    """Records latency, status codes and in-flight calls per method."""
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        if handler is None:
+            return handler
+        behavior, factory = handler_factory(handler)
+        method = _method_label(handler_call_details.method)
+
+        def unary_behavior(request, context):
+            with _observed(method, context):
+                return behavior(request, context)
+
+        def streaming_behavior(request, context):
+            with _observed(method, context):
+                yield from behavior(request, context)
+
+        wrapped = (
+            streaming_behavior if handler.response_streaming else unary_behavior
+        )
+        return rewrap(handler, wrapped, factory)
+
+
+class AsyncMetricsInterceptor(grpc.aio.ServerInterceptor):
+    """grpc.aio counterpart of MetricsInterceptor."""
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        if handler is None:
+            return handler
+        behavior, factory = handler_factory(handler)
+        method = _method_label(handler_call_details.method)
+
+        async def unary_behavior(request, context):
+            with _observed(method, context):
+                return await behavior(request, context)
+
+        async def streaming_behavior(request, context):
+            with _observed(method, context):
+                result = behavior(request, context)
+                if inspect.isasyncgen(result):
+                    async for response in result:
+                        yield response
+                else:
+                    await result
+
+        wrapped = (
+            streaming_behavior if handler.response_streaming else unary_behavior
+        )
+        return rewrap(handler, wrapped, factory)
+
+
+class SessionInterceptor(grpc.ServerInterceptor):
+    """Runs LibraryService calls on the thread pool server in rpc_scope."""
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        method = _method_name(handler_call_details.method)
+        if handler is None or method is None:
+            return handler
+        behavior, factory = handler_factory(handler)
+
+        def unary_behavior(request, context):
+            with rpc_scope(method):
+                return behavior(request, context)
+
+        def streaming_behavior(request, context):
+            with rpc_scope(method):
+                yield from behavior(request, context)
+
+        wrapped = (
+            streaming_behavior if handler.response_streaming else unary_behavior
+        )
+        return rewrap(handler, wrapped, factory)
+
+
+class AsyncSessionInterceptor(grpc.aio.ServerInterceptor):
+    """
+    Runs LibraryService calls on the grpc.aio server in async_rpc_scope.
+
+    The async handlers take their AsyncSession from the scope, which closes
+    it when the call ends; the same metrics, lazy-load guard and statement
+    budget apply as on the thread pool server.
+    """
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        method = _method_name(handler_call_details.method)
+        if handler is None or method is None:
+            return handler
+        behavior, factory = handler_factory(handler)
+
+        async def unary_behavior(request, context):
+            async with async_rpc_scope(method):
+                return await behavior(request, context)
+
+        async def streaming_behavior(request, context):
+            async with async_rpc_scope(method):
+                result = behavior(request, context)
+                if inspect.isasyncgen(result):
+                    async for response in result:
+                        yield response
+                else:
+                    await result
+
+        wrapped = (
+            streaming_behavior if handler.response_streaming else unary_behavior
+        )
+        return rewrap(handler, wrapped, factory)
@@ -1,6 +1,13 @@
 """
 Library business logic service.
 """
+import re
+from collections.abc import Iterable
+from datetime import datetime
+from itertools import islice
+from typing import NamedTuple
+
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm import Session
 
 from app.library.repository import (
@@ -9,8 +16,91 @@ from app.library.repository import (
     MemberRepository,
     BorrowRepository,
 )
+from config import BORROW_STRATEGY
+from models.book import Book
+from models.book_copy import BookCopy
+from util.count_strategy import COUNT_EXACT
+from util.ulid_util import generate_many
 
 MAX_PAGE_LIMIT = 100
+# Rows per message on the Stream* export RPCs.
+DEFAULT_EXPORT_CHUNK_SIZE = 500
+MAX_EXPORT_CHUNK_SIZE = 5000
+# Copies per BorrowBooks/ReturnBooks request.
+MAX_BATCH_ITEMS = 50
+# SearchBooks page size when the request does not set one.
+DEFAULT_SEARCH_LIMIT = 20
+
+# ISBN-10 or ISBN-13 once spaces and hyphens are removed.
+_ISBN = re.compile(r"(97[89])?\d{9}[\dX]")
+
+
+class BookImportRow(NamedTuple):
+    """One book and its copy numbers for bulk import."""
+    title: str
+    author: str
+    isbn: str | None
+    copy_numbers: list[str]
+
+
+def _validate_import_row(row: BookImportRow) -> str | None:
+    """Return an error message for an invalid import row, else None."""
+    if not row.title or not row.author:
+        return "title and author are required"
+    if len(row.title) > Book.title.type.length:
+        return "title is too long"
+    if len(row.author) > Book.author.type.length:
+        return "author is too long"
+    if row.isbn and len(row.isbn) > Book.isbn.type.length:
+        return "isbn is too long"
+    seen = set()
+    for copy_number in row.copy_numbers:
+        if not copy_number:
+            return "copy_number must not be empty"
+        if len(copy_number) > BookCopy.copy_number.type.length:
+            return f"copy_number {copy_number!r} is too long"
+        if copy_number in seen:
+            return f"Duplicate copy_number {copy_number!r}"
+        seen.add(copy_number)
+    return None
+
+
+def _reload_borrows(
+    session: Session,
+    borrow_ids: dict[str, str]
+) -> dict[str, object]:
+    """Reload committed borrows (copy_id -> borrow id) with details in one query."""
+    loaded = BorrowRepository.find_by_ids_with_details(
+        session, list(borrow_ids.values())
+    )
+    return {
+        copy_id: loaded[borrow_id]
+        for copy_id, borrow_id in borrow_ids.items()
+    }
+
+
+def _batch_results(
+    copy_ids: list[str],
+    borrows: dict,
+    errors: dict[str, str]
+) -> list[tuple]:
+    """
+    Per-copy (copy_id, borrow, error) results in request order.
+
+    A copy_id repeated in the request is reported as a duplicate after its
+    first occurrence.
+    """
+    results = []
+    seen = set()
+    for copy_id in copy_ids:
+        if copy_id in seen:
+            results.append((copy_id, None, "Duplicate copy_id in request"))
+        else:
+            results.append(
+                (copy_id, borrows.get(copy_id), errors.get(copy_id))
+            )
+        seen.add(copy_id)
+    return results
 
 
 class LibraryService:
@@ -26,45 +116,168 @@ class LibraryService:
         """Create a new book."""
         return BookRepository.create(session, title, author, isbn)
 
+    @staticmethod
+    def import_book_batch(
+        session: Session,
+        rows: list[tuple[int, BookImportRow]]
+    ) -> tuple[int, int, list[tuple[int, str]]]:
+        """
+        Insert one batch of (row_index, row) books with their copies.
+
+        Invalid rows are skipped and reported. Valid rows are inserted with
+        one statement per table and committed together; if the insert fails
+        the batch is rolled back and every valid row in it is reported.
+
+        Returns (books_imported, copies_imported, errors) where errors is a
+        list of (row_index, message).
+        """
+        errors = []
+        valid = []
+        for index, row in rows:
+            error = _validate_import_row(row)
+            if error:
+                errors.append((index, error))
+            else:
+                valid.append((index, row))
+        if not valid:
+            return 0, 0, errors
+
+        ids = iter(generate_many(
+            len(valid) + sum(len(row.copy_numbers) for _, row in valid)
+        ))
+        book_rows = []
+        copy_rows = []
+        for _, row in valid:
+            book_id = next(ids)
+            book_rows.append({
+                "id": book_id,
+                "title": row.title,
+                "author": row.author,
+                "isbn": row.isbn or None,
+            })
+            copy_rows.extend(
+                {
+                    "id": next(ids),
+                    "book_id": book_id,
+                    "copy_number": copy_number,
+                    "status": "available",
+                }
+                for copy_number in row.copy_numbers
+            )
+        try:
+            BookRepository.bulk_insert(session, book_rows)
+            BookCopyRepository.bulk_insert(session, copy_rows)
+            session.commit()
+        except SQLAlchemyError as e:
+            session.rollback()
+            message = f"Batch insert failed: {e.__class__.__name__}"
+            errors.extend((index, message) for index, _ in valid)
+            errors.sort()
+            return 0, 0, errors
+        return len(book_rows), len(copy_rows), errors
+
+    @staticmethod
+    def bulk_import_books(
+        session: Session,
+        rows: Iterable[BookImportRow],
+        batch_size: int
+    ) -> tuple[int, int, list[tuple[int, str]]]:
+        """
+        Import books and copies from rows in batches of batch_size.
+
+        rows is consumed lazily, so only one batch is held in memory. Each
+        batch is committed on its own; see import_book_batch.
+
+        Returns (books_imported, copies_imported, errors).
+        """
+        books_imported = 0
+        copies_imported = 0
+        errors = []
+        numbered = enumerate(rows)
+        while batch := list(islice(numbered, batch_size)):
+            books, copies, batch_errors = LibraryService.import_book_batch(
+                session, batch
+            )
+            books_imported += books
+            copies_imported += copies
+            errors.extend(batch_errors)
+        return books_imported, copies_imported, errors
+
     @staticmethod
     def update_book(
         session: Session,
         book_id: str,
         title: str | None = None,
         author: str | None = None,
-        isbn: str | None = None
-    ):
-        """Update a book."""
-        return BookRepository.update(
-            session, book_id, title, author, isbn
+        isbn: str | None = None,
+        expected_version: int | None = None
+    ) -> tuple[object | None, str | None]:
+        """
+        Update a book, only if still at expected_version when one is given.
+
+        Returns (book row, None) or (None, error).
+        """
+        book = BookRepository.update(
+            session, book_id, title, author, isbn, expected_version
         )
+        if book is not None:
+            return book, None
+        if expected_version is not None and BookRepository.find_by_id(
+            session, book_id
+        ):
+            return None, "Book was modified concurrently"
+        return None, "Book not found"
 
     @staticmethod
     def list_books(
         session: Session,
         page: int = 1,
-        limit: int = 100
-    ) -> tuple[list[tuple], int]:
+        limit: int = 100,
+        after: tuple[datetime, str] | None = None,
+        count_mode: str = COUNT_EXACT
+    ) -> tuple[list, int, bool]:
         """
-        List books with pagination and copy counts.
+        List books with pagination.
+
+        after is an optional (created_at, id) keyset cursor that takes
+        precedence over page. count_mode selects how total is computed.
+        Copy and availability counts are columns on the book rows.
 
-        Returns ((book, copy_count), total) to avoid N+1 queries.
+        Returns (book rows, total, total_exact); see BookRepository.list_all.
         """
         limit = min(limit, MAX_PAGE_LIMIT)
         offset = (page - 1) * limit
-        books = BookRepository.list_all(session, limit, offset)
-        total = BookRepository.count(session)
-        if not books:
-            return [], total
-        book_ids = [b.id for b in books]
-        copy_counts = BookCopyRepository.count_by_book_ids(
-            session, book_ids
-        )
-        result = [
-            (book, copy_counts.get(book.id, 0))
-            for book in books
-        ]
-        return result, total
+        books = BookRepository.list_all(session, limit, offset, after)
+        total, total_exact = BookRepository.count(session, count_mode)
+        return books, total, total_exact
+
+    @staticmethod
+    def search_books(
+        session: Session,
+        query: str,
+        limit: int = DEFAULT_SEARCH_LIMIT,
+        after: tuple[float, str] | None = None
+    ) -> tuple[list[tuple], str | None]:
+        """
+        Search the catalog by title and author, best match first.
+
+        A query that is an ISBN-10/13 (spaces and hyphens ignored) is looked
+        up exactly and returned as a single page. after is an optional
+        (rank, id) cursor from the previous page.
+
+        Returns ((book, rank) rows, error_message).
+        """
+        query = query.strip()
+        if not query:
+            return [], "Query is required"
+        limit = min(limit, MAX_PAGE_LIMIT)
+        isbn = re.sub(r"[\s-]", "", query).upper()
+        if _ISBN.fullmatch(isbn):
+            if after is not None:
+                return [], None
+            books = BookRepository.find_by_isbns(session, sorted({query, isbn}))
+            return [(book, 1.0) for book in books[:limit]], None
+        return BookRepository.search(session, query, limit, after), None
 
     @staticmethod
     def create_member(session: Session, name: str, email: str):
@@ -76,28 +289,110 @@ class LibraryService:
         session: Session,
         member_id: str,
         name: str | None = None,
-        email: str | None = None
-    ):
-        """Update a member."""
-        return MemberRepository.update(
-            session, member_id, name, email
+        email: str | None = None,
+        expected_version: int | None = None
+    ) -> tuple[object | None, str | None]:
+        """
+        Update a member, only if still at expected_version when one is given.
+
+        Returns (member row, None) or (None, error).
+        """
+        member = MemberRepository.update(
+            session, member_id, name, email, expected_version
         )
+        if member is not None:
+            return member, None
+        if expected_version is not None and MemberRepository.find_by_id(
+            session, member_id
+        ):
+            return None, "Member was modified concurrently"
+        return None, "Member not found"
 
     @staticmethod
     def list_members(
         session: Session,
         page: int = 1,
-        limit: int = 100
-    ) -> tuple[list, int]:
-        """List members with pagination."""
+        limit: int = 100,
+        after: tuple[datetime, str] | None = None,
+        count_mode: str = COUNT_EXACT
+    ) -> tuple[list, int, bool]:
+        """
+        List members with pagination.
+
+        after is an optional (created_at, id) keyset cursor that takes
+        precedence over page. count_mode selects how total is computed.
+
+        Returns (member rows, total, total_exact).
+        """
         limit = min(limit, MAX_PAGE_LIMIT)
         offset = (page - 1) * limit
-        members = MemberRepository.list_all(session, limit, offset)
-        total = MemberRepository.count(session)
-        return members, total
+        members = MemberRepository.list_all(session, limit, offset, after)
+        total, total_exact = MemberRepository.count(session, count_mode)
+        return members, total, total_exact
 
     @staticmethod
     def borrow_book(
+        session: Session,
+        copy_id: str,
+        member_id: str,
+        strategy: str | None = None
+    ) -> tuple[object | None, str | None]:
+        """
+        Borrow a book copy.
+
+        strategy is "atomic" (borrow_book_atomic) or "locking"
+        (borrow_book_locking); defaults to BORROW_STRATEGY.
+
+        Returns (borrow, error_message). Error is None on success.
+        """
+        if (strategy or BORROW_STRATEGY) == "locking":
+            return LibraryService.borrow_book_locking(
+                session, copy_id, member_id
+            )
+        return LibraryService.borrow_book_atomic(session, copy_id, member_id)
+
+    @staticmethod
+    def borrow_book_atomic(
+        session: Session,
+        copy_id: str,
+        member_id: str
+    ) -> tuple[object | None, str | None]:
+        """
+        Borrow a book copy with a conditional UPDATE instead of a row lock.
+
+        The success path is a single statement on Postgres. A second active
+        borrow for the copy is rejected by uq_borrows_active_copy_id. Only
+        when no copy was claimed are the copy and member read to pick the
+        error.
+
+        Returns (borrow, error_message). Error is None on success.
+        """
+        try:
+            borrow = BorrowRepository.create_if_available(
+                session, copy_id, member_id
+            )
+        except IntegrityError:
+            # uq_borrows_active_copy_id: the copy already has an active borrow.
+            borrow = None
+        if borrow is not None:
+            session.commit()
+            return (
+                BorrowRepository.find_by_id_with_details(session, borrow.id),
+                None
+            )
+        session.rollback()
+        copy = BookCopyRepository.find_by_id(session, copy_id)
+        if not copy:
+            return None, "Copy not found"
+        if copy.status != "available":
+            return None, "Book not available"
+        if not MemberRepository.get_snapshot(session, member_id):
+            return None, "Member not found"
+        # Claimed by a concurrent borrow, or an active borrow exists.
+        return None, "Book not available"
+
+    @staticmethod
+    def borrow_book_locking(
         session: Session,
         copy_id: str,
         member_id: str
@@ -105,6 +400,9 @@ class LibraryService:
         """
         Borrow a book copy. Uses pessimistic locking.
 
+        Relies on uq_borrows_active_copy_id instead of reading for an
+        existing active borrow.
+
         Returns (borrow, error_message). Error is None on success.
         """
         copy = BookCopyRepository.find_by_id_with_lock(session, copy_id)
@@ -112,21 +410,22 @@ class LibraryService:
             return None, "Copy not found"
         if copy.status != "available":
             return None, "Book not available"
-        member = MemberRepository.find_by_id(session, member_id)
+        member = MemberRepository.get_snapshot(session, member_id)
         if not member:
             return None, "Member not found"
-        active = BorrowRepository.find_active_by_copy_id(session, copy_id)
-        if active:
-            return None, "Book not available"
-        borrow = BorrowRepository.create(
-            session, copy_id, member_id, commit=False
-        )
         BookCopyRepository.update_status(
             session, copy_id, "checked_out", commit=False
         )
-        session.commit()
-        session.refresh(borrow)
-        return borrow, None
+        borrow = BorrowRepository.create(
+            session, copy_id, member_id, commit=False
+        )
+        try:
+            session.commit()
+        except IntegrityError:
+            # uq_borrows_active_copy_id: the copy already has an active borrow.
+            session.rollback()
+            return None, "Book not available"
+        return BorrowRepository.find_by_id_with_details(session, borrow.id), None
 
     @staticmethod
     def return_book(
@@ -146,29 +445,119 @@ class LibraryService:
             session, copy_id, "available", commit=False
         )
         session.commit()
-        session.refresh(active)
-        return active, None
+        return BorrowRepository.find_by_id_with_details(session, active.id), None
+
+    @staticmethod
+    def borrow_books(
+        session: Session,
+        member_id: str,
+        copy_ids: list[str]
+    ) -> tuple[list[tuple] | None, str | None]:
+        """
+        Borrow several copies for one member in a single transaction.
+
+        All copies are locked with one SELECT FOR UPDATE in id order, then
+        the borrowable ones get one INSERT for the borrows and one UPDATE
+        for copy status. Copies that cannot be borrowed are reported and
+        do not block the rest.
+
+        Returns (results, error_message). results holds one
+        (copy_id, borrow, error) per requested copy, in request order;
+        error_message is set when the whole request fails.
+        """
+        member = MemberRepository.get_snapshot(session, member_id)
+        if not member:
+            return None, "Member not found"
+        copies = BookCopyRepository.find_by_ids_with_lock(session, copy_ids)
+        active = BorrowRepository.find_active_by_copy_ids(session, copy_ids)
+        errors = {}
+        to_borrow = []
+        for copy_id in copy_ids:
+            copy = copies.get(copy_id)
+            if copy_id in errors or copy_id in to_borrow:
+                continue
+            if not copy:
+                errors[copy_id] = "Copy not found"
+            elif copy.status != "available" or copy_id in active:
+                errors[copy_id] = "Book not available"
+            else:
+                to_borrow.append(copy_id)
+        borrow_ids = {
+            borrow.copy_id: borrow.id
+            for borrow in BorrowRepository.bulk_create(
+                session, member_id, to_borrow
+            )
+        }
+        BookCopyRepository.bulk_update_status(
+            session, to_borrow, "checked_out"
+        )
+        session.commit()
+        return _batch_results(
+            copy_ids, _reload_borrows(session, borrow_ids), errors
+        ), None
+
+    @staticmethod
+    def return_books(
+        session: Session,
+        copy_ids: list[str]
+    ) -> list[tuple]:
+        """
+        Return several copies in a single transaction.
+
+        Copies are locked in id order like borrow_books; active borrows are
+        closed with one UPDATE and copy status reset with another.
+
+        Returns one (copy_id, borrow, error) per requested copy, in
+        request order.
+        """
+        BookCopyRepository.find_by_ids_with_lock(session, copy_ids)
+        active = BorrowRepository.find_active_by_copy_ids(session, copy_ids)
+        errors = {
+            copy_id: "No active borrow for this copy"
+            for copy_id in copy_ids
+            if copy_id not in active
+        }
+        borrow_ids = {
+            copy_id: borrow.id for copy_id, borrow in active.items()
+        }
+        BorrowRepository.bulk_mark_returned(
+            session, list(borrow_ids.values())
+        )
+        BookCopyRepository.bulk_update_status(
+            session, list(borrow_ids), "available"
+        )
+        session.commit()
+        return _batch_results(
+            copy_ids, _reload_borrows(session, borrow_ids), errors
+        )
 
     @staticmethod
     def list_borrowings(
         session: Session,
         member_id: str | None = None,
         page: int = 1,
-        limit: int = 100
-    ) -> tuple[list, int]:
-        """List borrowings, optionally filtered by member."""
+        limit: int = 100,
+        after: tuple[datetime, str] | None = None,
+        count_mode: str = COUNT_EXACT
+    ) -> tuple[list, int, bool]:
+        """
+        List borrowings, optionally filtered by member.
+
+        after is an optional (borrowed_at, id) keyset cursor that takes
+        precedence over page. count_mode selects how total is computed.
+
+        Returns (borrow rows, total, total_exact); see
+        BorrowRepository.list_active.
+        """
         limit = min(limit, MAX_PAGE_LIMIT)
         offset = (page - 1) * limit
-        total = BorrowRepository.count_active(session, member_id)
-        if member_id:
-            borrows = BorrowRepository.list_active_by_member(
-                session, member_id, limit, offset
-            )
-        else:
-            borrows = BorrowRepository.list_all_active(
-                session, limit, offset
-            )
-        return borrows, total
+        total, total_exact = BorrowRepository.count_active(
+            session, member_id, count_mode
+        )
+        borrows = BorrowRepository.list_active(
+            session, member_id, limit, offset, after
+        )
+        return borrows, total, total_exact
 
     @staticmethod
     def create_book_copy(
@@ -181,7 +570,7 @@ class LibraryService:
 
         Returns (copy, error_message). Error is None on success.
         """
-        book = BookRepository.find_by_id(session, book_id)
+        book = BookRepository.get_snapshot(session, book_id)
         if not book:
             return None, "Book not found"
         existing = BookCopyRepository.find_by_book_and_copy_number(
@@ -189,25 +578,37 @@ class LibraryService:
         )
         if existing:
             return None, "Copy number already exists for this book"
-        copy = BookCopyRepository.create(
-            session, book_id, copy_number, status="available"
-        )
+        try:
+            copy = BookCopyRepository.create(
+                session, book_id, copy_number, status="available"
+            )
+        except IntegrityError:
+            # Lost a race on uq_book_copies_book_id_copy_number.
+            session.rollback()
+            return None, "Copy number already exists for this book"
         return copy, None
 
     @staticmethod
     def list_available_copies(
         session: Session,
         page: int = 1,
-        limit: int = 100
-    ) -> tuple[list, int]:
-        """List available copies with book info."""
+        limit: int = 100,
+        count_mode: str = COUNT_EXACT
+    ) -> tuple[list, int, bool]:
+        """
+        List available copies with book info.
+
+        Returns (rows, total, total_exact).
+        """
         limit = min(limit, MAX_PAGE_LIMIT)
         offset = (page - 1) * limit
         rows = BookCopyRepository.list_all_available_with_book(
             session, limit, offset
         )
-        total = BookCopyRepository.count_available(session)
-        return rows, total
+        total, total_exact = BookCopyRepository.count_available(
+            session, count_mode
+        )
+        return rows, total, total_exact
 
     @staticmethod
     def list_copies_by_book_id(
@@ -221,7 +622,7 @@ class LibraryService:
 
         Returns (copies, total) or (None, 0) if book not found.
         """
-        book = BookRepository.find_by_id(session, book_id)
+        book = BookRepository.get_snapshot(session, book_id)
         if not book:
             return None, 0
         limit = min(limit, MAX_PAGE_LIMIT)
@@ -1,15 +1,40 @@
 """
 Library data access layer using SQLAlchemy ORM.
 """
+import re
+from collections import Counter
 from datetime import datetime, timezone
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    Float,
+    Select,
+    and_,
+    bindparam,
+    case,
+    cast,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session, joinedload, selectinload
 
-from models.book import Book
+from app.library.catalog_cache import (
+    BookSnapshot,
+    MemberSnapshot,
+    get_snapshot,
+    record_write,
+)
+from models.book import SEARCH_CONFIG, Book, search_document
 from models.book_copy import BookCopy
 from models.member import Member
 from models.borrow import Borrow
-from util.ulid_util import generate_ulid
+from util.count_strategy import COUNT_EXACT, count_rows, record_table_write
+from util.ulid_util import generate_many, generate_ulid
 
 
 class BookRepository:
@@ -20,6 +45,11 @@ class BookRepository:
         """Find a book by ID."""
         return session.get(Book, book_id)
 
+    @staticmethod
+    def get_snapshot(session: Session, book_id: str) -> BookSnapshot | None:
+        """Read-only book metadata by ID, served from the catalog cache."""
+        return get_snapshot(session, Book, book_id)
+
     @staticmethod
     def create(
         session: Session,
@@ -36,50 +66,263 @@ class BookRepository:
         )
         session.add(book)
         session.commit()
-        session.refresh(book)
         return book
 
+    @staticmethod
+    def bulk_insert(session: Session, rows: list[dict]) -> None:
+        """
+        Insert books in one executemany (multi-row VALUES where supported).
+
+        Rows are dicts of column values including id. Does not commit.
+        """
+        if rows:
+            session.execute(insert(Book), rows)
+
     @staticmethod
     def update(
         session: Session,
         book_id: str,
         title: str | None = None,
         author: str | None = None,
-        isbn: str | None = None
-    ) -> Book | None:
-        """Update an existing book."""
-        book = session.get(Book, book_id)
-        if not book:
-            return None
-        if title is not None:
-            book.title = title
-        if author is not None:
-            book.author = author
-        if isbn is not None:
-            book.isbn = isbn
+        isbn: str | None = None,
+        expected_version: int | None = None
+    ) -> Row | None:
+        """
+        Update an existing book in one UPDATE ... RETURNING, and commit.
+
+        Sets the given fields and bumps version. With expected_version the
+        row is only updated while still at that version (compare-and-set).
+
+        Returns the updated row (every Book column), or None if no book
+        matched.
+        """
+        books = Book.__table__
+        stmt = update(books).where(books.c.id == book_id)
+        if expected_version is not None:
+            stmt = stmt.where(books.c.version == expected_version)
+        values = {
+            name: value
+            for name, value in (
+                ("title", title), ("author", author), ("isbn", isbn)
+            )
+            if value is not None
+        }
+        book = session.connection().execute(
+            stmt
+            .values(version=books.c.version + 1, **values)
+            .returning(*books.c)
+        ).one_or_none()
+        if book is not None:
+            record_write(session, Book, book_id)
         session.commit()
-        session.refresh(book)
         return book
 
     @staticmethod
     def list_all(
         session: Session,
         limit: int = 100,
-        offset: int = 0
-    ) -> list[Book]:
-        """List all books with pagination."""
-        return list(
-            session.query(Book)
-            .order_by(Book.created_at.desc())
+        offset: int = 0,
+        after: tuple[datetime, str] | None = None
+    ) -> list[Row]:
+        """
+        List all books, newest first, with pagination.
+
+        Returns column rows (not ORM instances) with the Book attributes
+        ListBooks serializes plus created_at for the cursor.
+
+        When after is a (created_at, id) cursor, rows strictly after it are
+        returned (keyset pagination) and offset is ignored.
+        """
+        stmt = select(
+            Book.id,
+            Book.title,
+            Book.author,
+            Book.isbn,
+            Book.copy_count,
+            Book.available_count,
+            Book.version,
+            Book.created_at
+        )
+        if after is not None:
+            stmt = stmt.where(tuple_(Book.created_at, Book.id) < after)
+            offset = 0
+        return list(session.execute(
+            stmt
+            .order_by(Book.created_at.desc(), Book.id.desc())
             .limit(limit)
             .offset(offset)
-            .all()
+        ))
+
+    @staticmethod
+    def count(
+        session: Session,
+        mode: str = COUNT_EXACT
+    ) -> tuple[int, bool]:
+        """Count total books. Returns (count, is_exact)."""
+        return count_rows(session, session.query(Book), ("books",), mode)
+
+    @staticmethod
+    def find_by_isbns(session: Session, isbns: list[str]) -> list[Book]:
+        """Find books whose ISBN exactly equals one of isbns, in id order."""
+        return list(session.scalars(
+            select(Book).where(Book.isbn.in_(isbns)).order_by(Book.id)
+        ))
+
+    @staticmethod
+    def search(
+        session: Session,
+        query: str,
+        limit: int = 20,
+        after: tuple[float, str] | None = None
+    ) -> list[tuple[Book, float]]:
+        """
+        Find books matching query, best match first, as (book, rank) rows.
+
+        On Postgres every word of the query is matched as a prefix against
+        the title/author document (ix_books_search), or the whole query is
+        trigram-similar to the title (ix_books_title_trgm), which catches
+        typos. Rank is ts_rank_cd plus title similarity. Elsewhere every
+        word must occur in the title or author (unindexed LIKE, for tests
+        and development) and titles starting with the query rank first.
+
+        Rank is computed in double precision, the precision of the cursor,
+        so ties and the cursor row compare exactly. When after is a
+        (rank, id) cursor, rows strictly after it in (rank DESC, id) order
+        are returned.
+        """
+        words = re.findall(r"\w+", query.lower())
+        if not words:
+            return []
+        phrase = " ".join(words)
+        title = func.lower(Book.title)
+        if session.connection().dialect.name == "postgresql":
+            tsquery = func.to_tsquery(
+                literal_column(f"'{SEARCH_CONFIG}'"),
+                " & ".join(f"{word}:*" for word in words)
+            )
+            document = search_document(Book.title, Book.author)
+            match = or_(
+                document.op("@@")(tsquery),
+                title.op("%")(phrase)
+            )
+            rank = func.ts_rank_cd(document, tsquery) + func.similarity(
+                title, phrase
+            )
+        else:
+            author = func.lower(Book.author)
+            match = and_(*(
+                or_(
+                    title.contains(word, autoescape=True),
+                    author.contains(word, autoescape=True)
+                )
+                for word in words
+            ))
+            rank = case(
+                (title.startswith(phrase, autoescape=True), 1.0),
+                else_=0.5
+            )
+        # ts_rank_cd and similarity are float4; compared with the cursor's
+        # float8 the rank of the cursor row itself would not be equal to it.
+        rank = cast(rank, Float(53))
+        ranked = rank.label("rank")
+        stmt = select(Book, ranked).where(match)
+        if after is not None:
+            after_rank, after_id = after
+            stmt = stmt.where(or_(
+                rank < after_rank,
+                and_(rank == after_rank, Book.id > after_id)
+            ))
+        rows = session.execute(
+            stmt.order_by(ranked.desc(), Book.id).limit(limit)
         )
+        return [(book, float(book_rank)) for book, book_rank in rows]
 
     @staticmethod
-    def count(session: Session) -> int:
-        """Count total books."""
-        return session.query(Book).count()
+    def export_statement() -> Select:
+        """
+        Select every book in id order, for streaming.
+
+        Execute with yield_per so results are fetched through a server-side
+        cursor.
+        """
+        return select(Book).order_by(Book.id)
+
+    @staticmethod
+    def adjust_counts(
+        session: Session,
+        copies: dict[str, int] | None = None,
+        available: dict[str, int] | None = None
+    ) -> None:
+        """
+        Add per-book deltas to copy_count and available_count. Does not commit.
+
+        One executemany UPDATE, in book id order so concurrent writers lock
+        book rows in the same order. The statement runs on the connection,
+        bypassing ORM events: counters do not change row counts, so the
+        count cache stays valid. updated_at is left alone.
+        """
+        copies = copies or {}
+        available = available or {}
+        params = [
+            {
+                "b_id": book_id,
+                "copies": copies.get(book_id, 0),
+                "available": available.get(book_id, 0),
+            }
+            for book_id in sorted(copies.keys() | available.keys())
+            if copies.get(book_id) or available.get(book_id)
+        ]
+        if not params:
+            return
+        books = Book.__table__
+        session.connection().execute(
+            update(books)
+            .where(books.c.id == bindparam("b_id"))
+            .values(
+                copy_count=books.c.copy_count + bindparam("copies"),
+                available_count=books.c.available_count + bindparam("available"),
+                updated_at=books.c.updated_at
+            ),
+            params
+        )
+
+    @staticmethod
+    def reconcile_counts(session: Session) -> int:
+        """
+        Recompute copy_count and available_count from book_copies.
+
+        Only books whose stored counts drifted are updated. Commits and
+        returns the number of books fixed.
+        """
+        books = Book.__table__
+        copies = BookCopy.__table__
+        copy_count = (
+            select(func.count(copies.c.id))
+            .where(copies.c.book_id == books.c.id)
+            .scalar_subquery()
+        )
+        available_count = (
+            select(func.count(copies.c.id))
+            .where(
+                copies.c.book_id == books.c.id,
+                copies.c.status == "available"
+            )
+            .scalar_subquery()
+        )
+        fixed = session.connection().execute(
+            update(books)
+            .where(or_(
+                books.c.copy_count != copy_count,
+                books.c.available_count != available_count
+            ))
+            .values(
+                copy_count=copy_count,
+                available_count=available_count,
+                updated_at=books.c.updated_at
+            )
+        ).rowcount
+        session.commit()
+        return fixed
 
 
 class BookCopyRepository:
@@ -103,6 +346,27 @@ class BookCopyRepository:
             .first()
         )
 
+    @staticmethod
+    def find_by_ids_with_lock(
+        session: Session,
+        copy_ids: list[str]
+    ) -> dict[str, BookCopy]:
+        """
+        Lock copies (SELECT FOR UPDATE) in one statement, in id order.
+
+        Locking in a fixed order means concurrent batches wait on each
+        other instead of deadlocking. Books are loaded alongside.
+        Returns dict of copy_id -> copy; missing ids are absent.
+        """
+        copies = session.scalars(
+            select(BookCopy)
+            .where(BookCopy.id.in_(sorted(set(copy_ids))))
+            .order_by(BookCopy.id)
+            .options(selectinload(BookCopy.book))
+            .with_for_update()
+        )
+        return {copy.id: copy for copy in copies}
+
     @staticmethod
     def count_by_book_id(session: Session, book_id: str) -> int:
         """Count all copies for a book."""
@@ -188,24 +452,34 @@ class BookCopyRepository:
         limit: int = 100,
         offset: int = 0
     ) -> list[tuple[BookCopy, Book]]:
-        """List all available copies with joined book info."""
+        """
+        List all available copies with joined book info.
+
+        Ordered by title, then book id so same-title books do not
+        interleave, then copy_number.
+        """
         return list(
             session.query(BookCopy, Book)
             .join(Book, BookCopy.book_id == Book.id)
             .filter(BookCopy.status == "available")
-            .order_by(Book.title, BookCopy.copy_number)
+            .order_by(Book.title, Book.id, BookCopy.copy_number)
             .limit(limit)
             .offset(offset)
             .all()
         )
 
     @staticmethod
-    def count_available(session: Session) -> int:
-        """Count total available copies."""
-        return (
+    def count_available(
+        session: Session,
+        mode: str = COUNT_EXACT
+    ) -> tuple[int, bool]:
+        """Count total available copies. Returns (count, is_exact)."""
+        query = (
             session.query(BookCopy)
             .filter(BookCopy.status == "available")
-            .count()
+        )
+        return count_rows(
+            session, query, ("book_copies", "available"), mode
         )
 
     @staticmethod
@@ -223,10 +497,34 @@ class BookCopyRepository:
             status=status
         )
         session.add(copy)
+        BookRepository.adjust_counts(
+            session,
+            copies={book_id: 1},
+            available={book_id: 1 if status == "available" else 0}
+        )
         session.commit()
-        session.refresh(copy)
         return copy
 
+    @staticmethod
+    def bulk_insert(session: Session, rows: list[dict]) -> None:
+        """
+        Insert copies in one executemany (multi-row VALUES where supported).
+
+        Rows are dicts of column values including id; the books' counts
+        are adjusted in the same transaction. Does not commit.
+        """
+        if not rows:
+            return
+        session.execute(insert(BookCopy), rows)
+        BookRepository.adjust_counts(
+            session,
+            copies=Counter(row["book_id"] for row in rows),
+            available=Counter(
+                row["book_id"] for row in rows
+                if row.get("status", "available") == "available"
+            )
+        )
+
     @staticmethod
     def update_status(
         session: Session,
@@ -234,16 +532,59 @@ class BookCopyRepository:
         status: str,
         commit: bool = True
     ) -> BookCopy | None:
-        """Update copy status."""
+        """Update copy status and its book's available_count."""
         copy = session.get(BookCopy, copy_id)
         if not copy:
             return None
-        copy.status = status
+        BookCopyRepository.bulk_update_status(session, [copy_id], status)
         if commit:
             session.commit()
-            session.refresh(copy)
         return copy
 
+    @staticmethod
+    def bulk_update_status(
+        session: Session,
+        copy_ids: list[str],
+        status: str
+    ) -> None:
+        """
+        Set status on many copies and adjust their books' available_count.
+
+        Copies whose availability flips are updated with a conditional
+        UPDATE ... RETURNING book_id, so the count follows the rows actually
+        changed even when another transaction changed them first. Does not
+        commit.
+        """
+        if not copy_ids:
+            return
+        if status == "available":
+            flips = BookCopy.status != "available"
+        else:
+            flips = BookCopy.status == "available"
+        book_ids = session.scalars(
+            update(BookCopy)
+            .where(BookCopy.id.in_(copy_ids), flips)
+            .values(status=status, version=BookCopy.version + 1)
+            .returning(BookCopy.book_id)
+        ).all()
+        if status != "available":
+            session.execute(
+                update(BookCopy)
+                .where(
+                    BookCopy.id.in_(copy_ids),
+                    BookCopy.status.not_in(["available", status])
+                )
+                .values(status=status, version=BookCopy.version + 1)
+            )
+        delta = 1 if status == "available" else -1
+        BookRepository.adjust_counts(
+            session,
+            available={
+                book_id: delta * n
+                for book_id, n in Counter(book_ids).items()
+            }
+        )
+
 
 class MemberRepository:
     """Repository for Member operations."""
@@ -253,6 +594,14 @@ class MemberRepository:
         """Find a member by ID."""
         return session.get(Member, member_id)
 
+    @staticmethod
+    def get_snapshot(
+        session: Session,
+        member_id: str
+    ) -> MemberSnapshot | None:
+        """Read-only member profile by ID, served from the catalog cache."""
+        return get_snapshot(session, Member, member_id)
+
     @staticmethod
     def find_by_email(session: Session, email: str) -> Member | None:
         """Find a member by email."""
@@ -276,7 +625,6 @@ class MemberRepository:
         )
         session.add(member)
         session.commit()
-        session.refresh(member)
         return member
 
     @staticmethod
@@ -284,39 +632,82 @@ class MemberRepository:
         session: Session,
         member_id: str,
         name: str | None = None,
-        email: str | None = None
-    ) -> Member | None:
-        """Update an existing member."""
-        member = session.get(Member, member_id)
-        if not member:
-            return None
-        if name is not None:
-            member.name = name
-        if email is not None:
-            member.email = email
+        email: str | None = None,
+        expected_version: int | None = None
+    ) -> Row | None:
+        """
+        Update an existing member in one UPDATE ... RETURNING, and commit.
+
+        Sets the given fields and bumps version. With expected_version the
+        row is only updated while still at that version (compare-and-set).
+
+        Returns the updated row (every Member column), or None if no member
+        matched.
+        """
+        members = Member.__table__
+        stmt = update(members).where(members.c.id == member_id)
+        if expected_version is not None:
+            stmt = stmt.where(members.c.version == expected_version)
+        values = {
+            name: value
+            for name, value in (("name", name), ("email", email))
+            if value is not None
+        }
+        member = session.connection().execute(
+            stmt
+            .values(version=members.c.version + 1, **values)
+            .returning(*members.c)
+        ).one_or_none()
+        if member is not None:
+            record_write(session, Member, member_id)
         session.commit()
-        session.refresh(member)
         return member
 
     @staticmethod
     def list_all(
         session: Session,
         limit: int = 100,
-        offset: int = 0
-    ) -> list[Member]:
-        """List all members with pagination."""
-        return list(
-            session.query(Member)
-            .order_by(Member.created_at.desc())
+        offset: int = 0,
+        after: tuple[datetime, str] | None = None
+    ) -> list[Row]:
+        """
+        List all members, newest first, with pagination.
+
+        Returns column rows (id, name, email, version, created_at), not ORM
+        instances.
+
+        When after is a (created_at, id) cursor, rows strictly after it are
+        returned (keyset pagination) and offset is ignored.
+        """
+        stmt = select(
+            Member.id,
+            Member.name,
+            Member.email,
+            Member.version,
+            Member.created_at
+        )
+        if after is not None:
+            stmt = stmt.where(tuple_(Member.created_at, Member.id) < after)
+            offset = 0
+        return list(session.execute(
+            stmt
+            .order_by(Member.created_at.desc(), Member.id.desc())
             .limit(limit)
             .offset(offset)
-            .all()
-        )
+        ))
+
+    @staticmethod
+    def count(
+        session: Session,
+        mode: str = COUNT_EXACT
+    ) -> tuple[int, bool]:
+        """Count total members. Returns (count, is_exact)."""
+        return count_rows(session, session.query(Member), ("members",), mode)
 
     @staticmethod
-    def count(session: Session) -> int:
-        """Count total members."""
-        return session.query(Member).count()
+    def export_statement() -> Select:
+        """Select every member in id order, for streaming with yield_per."""
+        return select(Member).order_by(Member.id)
 
 
 class BorrowRepository:
@@ -342,6 +733,55 @@ class BorrowRepository:
             .first()
         )
 
+    @staticmethod
+    def find_by_id_with_details(
+        session: Session,
+        borrow_id: str
+    ) -> Borrow | None:
+        """Load one borrow with copy, book and member in one query."""
+        return BorrowRepository.find_by_ids_with_details(
+            session, [borrow_id]
+        ).get(borrow_id)
+
+    @staticmethod
+    def find_by_ids_with_details(
+        session: Session,
+        borrow_ids: list[str]
+    ) -> dict[str, Borrow]:
+        """
+        Load borrows with copy, book and member in one query. Returns dict of id -> borrow.
+
+        Instances already in the session are overwritten with the loaded
+        rows, since sessions do not expire on commit and the counts and
+        statuses were changed by UPDATE statements the identity map missed.
+        """
+        if not borrow_ids:
+            return {}
+        borrows = session.scalars(
+            select(Borrow)
+            .where(Borrow.id.in_(borrow_ids))
+            .options(
+                joinedload(Borrow.copy).joinedload(BookCopy.book),
+                joinedload(Borrow.member)
+            )
+            .execution_options(populate_existing=True)
+        )
+        return {borrow.id: borrow for borrow in borrows}
+
+    @staticmethod
+    def find_active_by_copy_ids(
+        session: Session,
+        copy_ids: list[str]
+    ) -> dict[str, Borrow]:
+        """Find active borrows for many copies. Returns dict of copy_id -> borrow."""
+        borrows = session.scalars(
+            select(Borrow).where(
+                Borrow.copy_id.in_(copy_ids),
+                Borrow.status == "active"
+            )
+        )
+        return {borrow.copy_id: borrow for borrow in borrows}
+
     @staticmethod
     def create(
         session: Session,
@@ -359,9 +799,118 @@ class BorrowRepository:
         session.add(borrow)
         if commit:
             session.commit()
-            session.refresh(borrow)
         return borrow
 
+    @staticmethod
+    def create_if_available(
+        session: Session,
+        copy_id: str,
+        member_id: str
+    ) -> Borrow | None:
+        """
+        Claim an available copy and create its borrow without a row lock.
+
+        A conditional UPDATE flips the copy to checked_out only if it is
+        available and the member exists; the borrow is inserted only for a
+        claimed copy. A second active borrow for the copy raises
+        IntegrityError from uq_borrows_active_copy_id. The book's
+        available_count is decremented for a claimed copy. On Postgres all
+        of it runs as one statement (UPDATE ... RETURNING in CTEs feeding
+        the INSERT); elsewhere as separate statements in the same
+        transaction. borrowed_at comes from the column default, as on the
+        other borrow paths.
+
+        Returns the new borrow, or None if nothing was claimed. Does not
+        commit.
+        """
+        claim = (
+            update(BookCopy)
+            .where(
+                BookCopy.id == copy_id,
+                BookCopy.status == "available",
+                select(Member.id).where(Member.id == member_id).exists()
+            )
+            .values(status="checked_out", version=BookCopy.version + 1)
+            .returning(BookCopy.id, BookCopy.book_id)
+        )
+        borrow_id = generate_ulid()
+        if session.connection().dialect.name == "postgresql":
+            claimed = claim.cte("claimed")
+            books = Book.__table__
+            counted = (
+                update(books)
+                .where(books.c.id == claimed.c.book_id)
+                .values(
+                    available_count=books.c.available_count - 1,
+                    updated_at=books.c.updated_at
+                )
+                .cte("counted")
+            )
+            borrow = session.scalars(
+                insert(Borrow)
+                .from_select(
+                    ["id", "copy_id", "member_id", "status"],
+                    select(
+                        literal(borrow_id, Borrow.id.type),
+                        claimed.c.id,
+                        literal(member_id, Borrow.member_id.type),
+                        literal("active")
+                    )
+                )
+                .add_cte(counted)
+                .returning(Borrow)
+            ).one_or_none()
+            # The copy UPDATE is nested in the CTE, out of sight of the
+            # count cache's DML hook.
+            record_table_write(session, BookCopy.__tablename__)
+            return borrow
+        claimed = session.execute(claim).one_or_none()
+        if claimed is None:
+            return None
+        BookRepository.adjust_counts(
+            session, available={claimed.book_id: -1}
+        )
+        return session.scalars(
+            insert(Borrow)
+            .values(
+                id=borrow_id,
+                copy_id=copy_id,
+                member_id=member_id,
+                status="active"
+            )
+            .returning(Borrow)
+        ).one()
+
+    @staticmethod
+    def bulk_create(
+        session: Session,
+        member_id: str,
+        copy_ids: list[str]
+    ) -> list[Borrow]:
+        """
+        Create active borrows for copy_ids with one INSERT ... RETURNING.
+
+        Returns the borrows in copy_ids order. Does not commit.
+        """
+        if not copy_ids:
+            return []
+        rows = [
+            {
+                "id": borrow_id,
+                "copy_id": copy_id,
+                "member_id": member_id,
+                "status": "active",
+            }
+            for borrow_id, copy_id in zip(generate_many(len(copy_ids)), copy_ids)
+        ]
+        borrows = {
+            borrow.copy_id: borrow
+            for borrow in session.scalars(
+                insert(Borrow).returning(Borrow), rows
+            )
+        }
+        return [borrows[copy_id] for copy_id in copy_ids]
+
     @staticmethod
     def mark_returned(
         session: Session,
@@ -376,59 +925,115 @@ class BorrowRepository:
         borrow.returned_at = datetime.now(timezone.utc)
         if commit:
             session.commit()
-            session.refresh(borrow)
         return borrow
 
     @staticmethod
-    def list_active_by_member(
+    def bulk_mark_returned(
         session: Session,
-        member_id: str,
-        limit: int = 100,
-        offset: int = 0
-    ) -> list[Borrow]:
-        """List active borrows for a member."""
-        from sqlalchemy.orm import joinedload
-        return list(
-            session.query(Borrow)
-            .options(
-                joinedload(Borrow.copy).joinedload(BookCopy.book),
-                joinedload(Borrow.member)
-            )
-            .filter(
-                Borrow.member_id == member_id,
-                Borrow.status == "active"
+        borrow_ids: list[str]
+    ) -> None:
+        """Mark many borrows returned in one UPDATE. Does not commit."""
+        if borrow_ids:
+            session.execute(
+                update(Borrow)
+                .where(Borrow.id.in_(borrow_ids))
+                .values(
+                    status="returned",
+                    returned_at=datetime.now(timezone.utc)
+                )
             )
-            .order_by(Borrow.borrowed_at.desc())
-            .limit(limit)
-            .offset(offset)
-            .all()
-        )
 
     @staticmethod
-    def list_all_active(
+    def list_active(
         session: Session,
+        member_id: str | None = None,
         limit: int = 100,
-        offset: int = 0
-    ) -> list[Borrow]:
-        """List all active borrows."""
-        from sqlalchemy.orm import joinedload
-        return list(
-            session.query(Borrow)
-            .options(
-                joinedload(Borrow.copy).joinedload(BookCopy.book),
-                joinedload(Borrow.member)
+        offset: int = 0,
+        after: tuple[datetime, str] | None = None
+    ) -> list[Row]:
+        """
+        List active borrows, optionally for one member, most recent first.
+
+        Returns column rows, not ORM instances: the borrow's columns plus
+        copy_number, copy_status, copy_version, book_id, book_title,
+        book_author, book_isbn, book_copy_count, book_available_count,
+        book_version, member_name, member_email and member_version from
+        inner joins. This is the ListBorrowings page
+        without hydrating a Borrow/BookCopy/Book/Member graph per row.
+
+        When after is a (borrowed_at, id) cursor, rows strictly after it are
+        returned (keyset pagination) and offset is ignored.
+        """
+        stmt = (
+            select(
+                Borrow.id,
+                Borrow.copy_id,
+                Borrow.member_id,
+                Borrow.status,
+                Borrow.borrowed_at,
+                Borrow.returned_at,
+                BookCopy.copy_number,
+                BookCopy.status.label("copy_status"),
+                BookCopy.version.label("copy_version"),
+                BookCopy.book_id,
+                Book.title.label("book_title"),
+                Book.author.label("book_author"),
+                Book.isbn.label("book_isbn"),
+                Book.copy_count.label("book_copy_count"),
+                Book.available_count.label("book_available_count"),
+                Book.version.label("book_version"),
+                Member.name.label("member_name"),
+                Member.email.label("member_email"),
+                Member.version.label("member_version")
             )
-            .filter(Borrow.status == "active")
-            .order_by(Borrow.borrowed_at.desc())
+            .join(BookCopy, Borrow.copy_id == BookCopy.id)
+            .join(Book, BookCopy.book_id == Book.id)
+            .join(Member, Borrow.member_id == Member.id)
+            .where(Borrow.status == "active")
+        )
+        if member_id:
+            stmt = stmt.where(Borrow.member_id == member_id)
+        if after is not None:
+            stmt = stmt.where(tuple_(Borrow.borrowed_at, Borrow.id) < after)
+            offset = 0
+        return list(session.execute(
+            stmt
+            .order_by(Borrow.borrowed_at.desc(), Borrow.id.desc())
             .limit(limit)
             .offset(offset)
-            .all()
-        )
+        ))
 
     @staticmethod
-    def count_active(session: Session, member_id: str | None = None) -> int:
-        """Count active borrows, optionally by member."""
+    def count_active(
+        session: Session,
+        member_id: str | None = None,
+        mode: str = COUNT_EXACT
+    ) -> tuple[int, bool]:
+        """Count active borrows, optionally by member. Returns (count, is_exact)."""
         query = session.query(Borrow).filter(Borrow.status == "active")
         if member_id:
             query = query.filter(Borrow.member_id == member_id)
-        return query.count()
+        return count_rows(
+            session, query, ("borrows", "active", member_id), mode
+        )
+
+    @staticmethod
+    def export_statement(
+        member_id: str | None = None,
+        active_only: bool = False
+    ) -> Select:
+        """
+        Select borrows with copy, book and member loaded, in id order.
+
+        Only many-to-one relationships are joined, so the statement can be
+        executed with yield_per for streaming.
+        """
+        stmt = select(Borrow).options(
+            joinedload(Borrow.copy).joinedload(BookCopy.book),
+            joinedload(Borrow.member)
+        )
+        if member_id:
+            stmt = stmt.where(Borrow.member_id == member_id)
+        if active_only:
+            stmt = stmt.where(Borrow.status == "active")
+        return stmt.order_by(Borrow.id)
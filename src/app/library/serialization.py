@@ -0,0 +1,70 @@
+"""
+Protobuf serialization of list query rows.
+
+List queries return column rows (SQLAlchemy Row tuples), not ORM instances.
+These helpers append them to a response's repeated field with
+repeated.add(**fields), so no standalone message is built and copied per row
+and nested messages are filled in place.
+"""
+
+
+def _isoformat(value) -> str | None:
+    """ISO 8601 string for a timestamp column, None when unset."""
+    return value.isoformat() if value is not None else None
+
+
+def add_books(repeated, rows) -> None:
+    """Append Book messages for BookRepository.list_all rows."""
+    for row in rows:
+        repeated.add(
+            id=row.id,
+            title=row.title,
+            author=row.author,
+            isbn=row.isbn,
+            copy_count=row.copy_count,
+            available_count=row.available_count,
+            version=row.version,
+        )
+
+
+def add_members(repeated, rows) -> None:
+    """Append Member messages for MemberRepository.list_all rows."""
+    for row in rows:
+        repeated.add(
+            id=row.id, name=row.name, email=row.email, version=row.version
+        )
+
+
+def add_borrows(repeated, rows) -> None:
+    """Append Borrow messages, with copy, book and member, for BorrowRepository.list_active rows."""
+    for row in rows:
+        repeated.add(
+            id=row.id,
+            copy_id=row.copy_id,
+            member_id=row.member_id,
+            status=row.status,
+            borrowed_at=_isoformat(row.borrowed_at),
+            returned_at=_isoformat(row.returned_at),
+            copy={
+                "id": row.copy_id,
+                "book_id": row.book_id,
+                "copy_number": row.copy_number,
+                "status": row.copy_status,
+                "version": row.copy_version,
+            },
+            book={
+                "id": row.book_id,
+                "title": row.book_title,
+                "author": row.book_author,
+                "isbn": row.book_isbn,
+                "copy_count": row.book_copy_count,
+                "available_count": row.book_available_count,
+                "version": row.book_version,
+            },
+            member={
+                "id": row.member_id,
+                "name": row.member_name,
+                "email": row.member_email,
+                "version": row.member_version,
+            },
+        )
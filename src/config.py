@@ -6,5 +6,94 @@ DATABASE_URL = os.getenv(
     "DATABASE_URL",
     "postgresql://localhost:5432/library_management"
 )
+# Async driver URL for SERVER_MODE=async; derived from DATABASE_URL when unset.
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", "")
+# Comma-separated read replica URLs for the list/lookup RPCs (sync drivers;
+# async URLs are derived the same way as ASYNC_DATABASE_URL).
+DATABASE_REPLICA_URLS = [
+    url.strip()
+    for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",")
+    if url.strip()
+]
+# Replica choice per read session: "round_robin" or "least_latency".
+DATABASE_REPLICA_SELECTION = os.getenv(
+    "DATABASE_REPLICA_SELECTION", "round_robin"
+)
+# Seconds a replica is skipped after a connection error.
+DATABASE_REPLICA_RETRY_SECONDS = float(
+    os.getenv("DATABASE_REPLICA_RETRY_SECONDS", "30")
+)
+# ULID key columns: "text" (CHAR(26)) or "binary" (uuid on Postgres, 16
+# bytes elsewhere). Must match the schema; see migration 007.
+ULID_STORAGE = os.getenv("ULID_STORAGE", "text")
 JWT_SECRET = os.getenv("JWT_SECRET", "change-me-in-production")
 SERVER_PORT = int(os.getenv("SERVER_PORT", "50051"))
+# "sync" (thread pool) or "async" (grpc.aio with AsyncSession).
+SERVER_MODE = os.getenv("SERVER_MODE", "sync")
+# Worker processes sharing SERVER_PORT via SO_REUSEPORT (1 = no prefork).
+SERVER_PROCESSES = int(os.getenv("SERVER_PROCESSES", "1"))
+# Prefork supervision: seconds a worker has to start serving, the first
+# restart delay (doubling per consecutive failure up to the max) and the
+# consecutive failed restarts before the server exits non-zero.
+WORKER_READY_TIMEOUT_SECONDS = float(
+    os.getenv("WORKER_READY_TIMEOUT_SECONDS", "30")
+)
+WORKER_RESTART_BACKOFF_SECONDS = float(
+    os.getenv("WORKER_RESTART_BACKOFF_SECONDS", "1")
+)
+WORKER_RESTART_BACKOFF_MAX_SECONDS = float(
+    os.getenv("WORKER_RESTART_BACKOFF_MAX_SECONDS", "30")
+)
+WORKER_MAX_RESTARTS = int(os.getenv("WORKER_MAX_RESTARTS", "5"))
+# Seconds in-flight RPCs get to finish on SIGTERM/SIGINT.
+SERVER_SHUTDOWN_GRACE_SECONDS = float(
+    os.getenv("SERVER_SHUTDOWN_GRACE_SECONDS", "5")
+)
+# Prometheus /metrics HTTP port (0 disables). Prefork worker N serves on
+# METRICS_PORT + N.
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9100"))
+# Statement budget per RPC (0 = none); RPCs over it are logged.
+RPC_MAX_QUERIES = int(os.getenv("RPC_MAX_QUERIES", "0"))
+# Raise instead of logging when an RPC lazily loads a relationship or goes
+# over RPC_MAX_QUERIES. Meant for tests and staging.
+QUERY_GUARD_STRICT = os.getenv(
+    "QUERY_GUARD_STRICT", "false"
+).lower() in ("1", "true", "yes")
+# gRPC worker threads (sync mode) and in-flight RPC cap (0 = unlimited).
+GRPC_MAX_WORKERS = int(os.getenv("GRPC_MAX_WORKERS", "10"))
+GRPC_MAX_CONCURRENT_RPCS = int(os.getenv("GRPC_MAX_CONCURRENT_RPCS", "0"))
+# SQLAlchemy connection pool; size + overflow must cover GRPC_MAX_WORKERS
+# (sync mode) or GRPC_MAX_CONCURRENT_RPCS (async mode).
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", str(GRPC_MAX_WORKERS)))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+# Postgres statement_timeout in milliseconds (0 = disabled).
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+# bcrypt process pool (0 = hash inline) and max queued + running jobs before
+# Login fails fast with RESOURCE_EXHAUSTED. With 0, the grpc.aio server runs
+# each hash on a thread rather than on the event loop, so bcrypt shares the
+# GIL with request handling; prefer processes there.
+BCRYPT_PROCESSES = int(os.getenv("BCRYPT_PROCESSES", "2"))
+BCRYPT_MAX_PENDING = int(os.getenv("BCRYPT_MAX_PENDING", "4"))
+# Seconds Login waits for its bcrypt job before failing with
+# RESOURCE_EXHAUSTED; keeps a stuck pool from pinning gRPC worker threads.
+BCRYPT_TIMEOUT_SECONDS = float(os.getenv("BCRYPT_TIMEOUT_SECONDS", "10"))
+# Verified JWTs kept in the auth LRU cache (0 disables caching).
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000"))
+# BorrowBook implementation: "atomic" (conditional UPDATE ... RETURNING, no
+# row lock held across round trips) or "locking" (SELECT FOR UPDATE first).
+BORROW_STRATEGY = os.getenv("BORROW_STRATEGY", "atomic")
+# Rows per INSERT batch (and commit) in BulkImportBooks and scripts/import_books.py.
+BULK_IMPORT_BATCH_SIZE = int(os.getenv("BULK_IMPORT_BATCH_SIZE", "1000"))
+# Book/member snapshot cache (0 entries disables). TTL bounds staleness
+# from writes this process was not told about.
+CATALOG_CACHE_SIZE = int(os.getenv("CATALOG_CACHE_SIZE", "10000"))
+CATALOG_CACHE_TTL_SECONDS = float(os.getenv("CATALOG_CACHE_TTL_SECONDS", "300"))
+# Broadcast catalog invalidations between processes with Postgres
+# LISTEN/NOTIFY; enable when running several workers or servers.
+CATALOG_CACHE_NOTIFY = os.getenv(
+    "CATALOG_CACHE_NOTIFY", "false"
+).lower() in ("1", "true", "yes")
+COUNT_CACHE_TTL_SECONDS = float(os.getenv("COUNT_CACHE_TTL_SECONDS", "30"))
+COUNT_CACHE_MAX_ENTRIES = int(os.getenv("COUNT_CACHE_MAX_ENTRIES", "1024"))
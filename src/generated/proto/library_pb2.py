@@ -24,73 +24,109 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x13proto/library.proto\x12\x07library\"S\n\x04\x42ook\x12\n\n\x02id\x18\x01 \x01(\t\x12\r\n\x05title\x18\x02 \x01(\t\x12\x0e\n\x06\x61uthor\x18\x03 \x01(\t\x12\x0c\n\x04isbn\x18\x04 \x01(\t\x12\x12\n\ncopy_count\x18\x05 \x01(\x05\"L\n\x08\x42ookCopy\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0f\n\x07\x62ook_id\x18\x02 \x01(\t\x12\x13\n\x0b\x63opy_number\x18\x03 \x01(\t\x12\x0e\n\x06status\x18\x04 \x01(\t\"1\n\x06Member\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\r\n\x05\x65mail\x18\x03 \x01(\t\"\xd1\x01\n\x06\x42orrow\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0f\n\x07\x63opy_id\x18\x02 \x01(\t\x12\x11\n\tmember_id\x18\x03 \x01(\t\x12\x13\n\x0b\x62orrowed_at\x18\x04 \x01(\t\x12\x13\n\x0breturned_at\x18\x05 \x01(\t\x12\x0e\n\x06status\x18\x06 \x01(\t\x12\x1f\n\x04\x63opy\x18\x07 \x01(\x0b\x32\x11.library.BookCopy\x12\x1b\n\x04\x62ook\x18\x08 \x01(\x0b\x32\r.library.Book\x12\x1f\n\x06member\x18\t \x01(\x0b\x32\x0f.library.Member\"0\n\x11PaginationRequest\x12\x0c\n\x04page\x18\x01 \x01(\x05\x12\r\n\x05limit\x18\x02 \x01(\x05\"F\n\x12PaginationResponse\x12\x0c\n\x04page\x18\x01 \x01(\x05\x12\r\n\x05limit\x18\x02 \x01(\x05\x12\x13\n\x0btotal_count\x18\x03 \x01(\x05\"@\n\x11\x43reateBookRequest\x12\r\n\x05title\x18\x01 \x01(\t\x12\x0e\n\x06\x61uthor\x18\x02 \x01(\t\x12\x0c\n\x04isbn\x18\x03 \x01(\t\"1\n\x12\x43reateBookResponse\x12\x1b\n\x04\x62ook\x18\x01 \x01(\x0b\x32\r.library.Book\"L\n\x11UpdateBookRequest\x12\n\n\x02id\x18\x01 \x01(\t\x12\r\n\x05title\x18\x02 \x01(\t\x12\x0e\n\x06\x61uthor\x18\x03 \x01(\t\x12\x0c\n\x04isbn\x18\x04 \x01(\t\"1\n\x12UpdateBookResponse\x12\x1b\n\x04\x62ook\x18\x01 \x01(\x0b\x32\r.library.Book\"B\n\x10ListBooksRequest\x12.\n\npagination\x18\x01 \x01(\x0b\x32\x1a.library.PaginationRequest\"b\n\x11ListBooksResponse\x12\x1c\n\x05\x62ooks\x18\x01 \x03(\x0b\x32\r.library.Book\x12/\n\npagination\x18\x02 \x01(\x0b\x32\x1b.library.PaginationResponse\"2\n\x13\x43reateMemberRequest\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\r\n\x05\x65mail\x18\x02 \x01(\t\"7\n\x14\x43reateMemberResponse\x12\x1f\n\x06member\x18\x01 \x01(\x0b\x32\x0f.library.Member\">\n\x13UpdateMemberRequest\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\r\n\x05\x65mail\x18\x03 \x01(\t\"7\n\x14UpdateMemberResponse\x12\x1f\n\x06member\x18\x01 \x01(\x0b\x32\x0f.library.Member\"D\n\x12ListMembersRequest\x12.\n\npagination\x18\x01 \x01(\x0b\x32\x1a.library.PaginationRequest\"h\n\x13ListMembersResponse\x12 \n\x07members\x18\x01 \x03(\x0b\x32\x0f.library.Member\x12/\n\npagination\x18\x02 \x01(\x0b\x32\x1b.library.PaginationResponse\"7\n\x11\x42orrowBookRequest\x12\x0f\n\x07\x63opy_id\x18\x01 \x01(\t\x12\x11\n\tmember_id\x18\x02 \x01(\t\"5\n\x12\x42orrowBookResponse\x12\x1f\n\x06\x62orrow\x18\x01 \x01(\x0b\x32\x0f.library.Borrow\"$\n\x11ReturnBookRequest\x12\x0f\n\x07\x63opy_id\x18\x01 \x01(\t\"5\n\x12ReturnBookResponse\x12\x1f\n\x06\x62orrow\x18\x01 \x01(\x0b\x32\x0f.library.Borrow\"Z\n\x15ListBorrowingsRequest\x12\x11\n\tmember_id\x18\x01 \x01(\t\x12.\n\npagination\x18\x02 \x01(\x0b\x32\x1a.library.PaginationRequest\"k\n\x16ListBorrowingsResponse\x12 \n\x07\x62orrows\x18\x01 \x03(\x0b\x32\x0f.library.Borrow\x12/\n\npagination\x18\x02 \x01(\x0b\x32\x1b.library.PaginationResponse\"U\n\rAvailableCopy\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0f\n\x07\x62ook_id\x18\x02 \x01(\t\x12\x12\n\nbook_title\x18\x03 \x01(\t\x12\x13\n\x0b\x63opy_number\x18\x04 \x01(\t\"L\n\x1aListAvailableCopiesRequest\x12.\n\npagination\x18\x01 \x01(\x0b\x32\x1a.library.PaginationRequest\"v\n\x1bListAvailableCopiesResponse\x12&\n\x06\x63opies\x18\x01 \x03(\x0b\x32\x16.library.AvailableCopy\x12/\n\npagination\x18\x02 \x01(\x0b\x32\x1b.library.PaginationResponse\"=\n\x15\x43reateBookCopyRequest\x12\x0f\n\x07\x62ook_id\x18\x01 \x01(\t\x12\x13\n\x0b\x63opy_number\x18\x02 \x01(\t\"9\n\x16\x43reateBookCopyResponse\x12\x1f\n\x04\x63opy\x18\x01 \x01(\x0b\x32\x11.library.BookCopy\"Z\n\x17ListCopiesByBookRequest\x12\x0f\n\x07\x62ook_id\x18\x01 \x01(\t\x12.\n\npagination\x18\x02 \x01(\x0b\x32\x1a.library.PaginationRequest\"n\n\x18ListCopiesByBookResponse\x12!\n\x06\x63opies\x18\x01 \x03(\x0b\x32\x11.library.BookCopy\x12/\n\npagination\x18\x02 \x01(\x0b\x32\x1b.library.PaginationResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x13proto/library.proto\x12\x07library\"}\n\x04\x42ook\x12\n\n\x02id\x18\x01 \x01(\t\x12\r\n\x05title\x18\x02 \x01(\t\x12\x0e\n\x06\x61uthor\x18\x03 \x01(\t\x12\x0c\n\x04isbn\x18\x04 \x01(\t\x12\x12\n\ncopy_count\x18\x05 \x01(\x05\x12\x17\n\x0f\x61vailable_count\x18\x06 \x01(\x05\x12\x0f\n\x07version\x18\x07 \x01(\x05\"]\n\x08\x42ookCopy\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0f\n\x07\x62ook_id\x18\x02 \x01(\t\x12\x13\n\x0b\x63opy_number\x18\x03 \x01(\t\x12\x0e\n\x06status\x18\x04 \x01(\t\x12\x0f\n\x07version\x18\x05 \x01(\x05\"B\n\x06Member\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\r\n\x05\x65mail\x18\x03 \x01(\t\x12\x0f\n\x07version\x18\x04 \x01(\x05\"\xd1\x01\n\x06\x42orrow\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0f\n\x07\x63opy_id\x18\x02 \x01(\t\x12\x11\n\tmember_id\x18\x03 \x01(\t\x12\x13\n\x0b\x62orrowed_at\x18\x04 \x01(\t\x12\x13\n\x0breturned_at\x18\x05 \x01(\t\x12\x0e\n\x06status\x18\x06 \x01(\t\x12\x1f\n\x04\x63opy\x18\x07 \x01(\x0b\x32\x11.library.BookCopy\x12\x1b\n\x04\x62ook\x18\x08 \x01(\x0b\x32\r.library.Book\x12\x1f\n\x06member\x18\t \x01(\x0b\x32\x0f.library.Member\"l\n\x11PaginationRequest\x12\x0c\n\x04page\x18\x01 \x01(\x05\x12\r\n\x05limit\x18\x02 \x01(\x05\x12\x12\n\npage_token\x18\x03 \x01(\t\x12&\n\ncount_mode\x18\x04 \x01(\x0e\x32\x12.library.CountMode\"z\n\x12PaginationResponse\x12\x0c\n\x04page\x18\x01 \x01(\x05\x12\r\n\x05limit\x18\x02 \x01(\x05\x12\x13\n\x0btotal_count\x18\x03 \x01(\x05\x12\x17\n\x0fnext_page_token\x18\x04 \x01(\t\x12\x19\n\x11total_count_exact\x18\x05 \x01(\x08\"@\n\x11\x43reateBookRequest\x12\r\n\x05title\x18\x01 \x01(\t\x12\x0e\n\x06\x61uthor\x18\x02 \x01(\t\x12\x0c\n\x04isbn\x18\x03 \x01(\t\"1\n\x12\x43reateBookResponse\x12\x1b\n\x04\x62ook\x18\x01 \x01(\x0b\x32\r.library.Book\"f\n\x11UpdateBookRequest\x12\n\n\x02id\x18\x01 \x01(\t\x12\r\n\x05title\x18\x02 \x01(\t\x12\x0e\n\x06\x61uthor\x18\x03 \x01(\t\x12\x0c\n\x04isbn\x18\x04 \x01(\t\x12\x18\n\x10\x65xpected_version\x18\x05 \x01(\x05\"1\n\x12UpdateBookResponse\x12\x1b\n\x04\x62ook\x18\x01 \x01(\x0b\x32\r.library.Book\"V\n\x10ListBooksRequest\x12.\n\npagination\x18\x01 \x01(\x0b\x32\x1a.library.PaginationRequest\x12\x12\n\nconsistent\x18\x02 \x01(\x08\"b\n\x11ListBooksResponse\x12\x1c\n\x05\x62ooks\x18\x01 \x03(\x0b\x32\r.library.Book\x12/\n\npagination\x18\x02 \x01(\x0b\x32\x1b.library.PaginationResponse\"g\n\x12SearchBooksRequest\x12\r\n\x05query\x18\x01 \x01(\t\x12.\n\npagination\x18\x02 \x01(\x0b\x32\x1a.library.PaginationRequest\x12\x12\n\nconsistent\x18\x03 \x01(\x08\"d\n\x13SearchBooksResponse\x12\x1c\n\x05\x62ooks\x18\x01 \x03(\x0b\x32\r.library.Book\x12/\n\npagination\x18\x02 \x01(\x0b\x32\x1b.library.PaginationResponse\"2\n\x13\x43reateMemberRequest\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\r\n\x05\x65mail\x18\x02 \x01(\t\"7\n\x14\x43reateMemberResponse\x12\x1f\n\x06member\x18\x01 \x01(\x0b\x32\x0f.library.Member\"X\n\x13UpdateMemberRequest\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\r\n\x05\x65mail\x18\x03 \x01(\t\x12\x18\n\x10\x65xpected_version\x18\x04 \x01(\x05\"7\n\x14UpdateMemberResponse\x12\x1f\n\x06member\x18\x01 \x01(\x0b\x32\x0f.library.Member\"X\n\x12ListMembersRequest\x12.\n\npagination\x18\x01 \x01(\x0b\x32\x1a.library.PaginationRequest\x12\x12\n\nconsistent\x18\x02 \x01(\x08\"h\n\x13ListMembersResponse\x12 \n\x07members\x18\x01 \x03(\x0b\x32\x0f.library.Member\x12/\n\npagination\x18\x02 \x01(\x0b\x32\x1b.library.PaginationResponse\"7\n\x11\x42orrowBookRequest\x12\x0f\n\x07\x63opy_id\x18\x01 \x01(\t\x12\x11\n\tmember_id\x18\x02 \x01(\t\"5\n\x12\x42orrowBookResponse\x12\x1f\n\x06\x62orrow\x18\x01 \x01(\x0b\x32\x0f.library.Borrow\"$\n\x11ReturnBookRequest\x12\x0f\n\x07\x63opy_id\x18\x01 \x01(\t\"5\n\x12ReturnBookResponse\x12\x1f\n\x06\x62orrow\x18\x01 \x01(\x0b\x32\x0f.library.Borrow\"S\n\x10\x42orrowItemResult\x12\x0f\n\x07\x63opy_id\x18\x01 \x01(\t\x12\x1f\n\x06\x62orrow\x18\x02 \x01(\x0b\x32\x0f.library.Borrow\x12\r\n\x05\x65rror\x18\x03 \x01(\t\"9\n\x12\x42orrowBooksRequest\x12\x11\n\tmember_id\x18\x01 \x01(\t\x12\x10\n\x08\x63opy_ids\x18\x02 \x03(\t\"A\n\x13\x42orrowBooksResponse\x12*\n\x07results\x18\x01 \x03(\x0b\x32\x19.library.BorrowItemResult\"&\n\x12ReturnBooksRequest\x12\x10\n\x08\x63opy_ids\x18\x01 \x03(\t\"A\n\x13ReturnBooksResponse\x12*\n\x07results\x18\x01 \x03(\x0b\x32\x19.library.BorrowItemResult\"n\n\x15ListBorrowingsRequest\x12\x11\n\tmember_id\x18\x01 \x01(\t\x12.\n\npagination\x18\x02 \x01(\x0b\x32\x1a.library.PaginationRequest\x12\x12\n\nconsistent\x18\x03 \x01(\x08\"k\n\x16ListBorrowingsResponse\x12 \n\x07\x62orrows\x18\x01 \x03(\x0b\x32\x0f.library.Borrow\x12/\n\npagination\x18\x02 \x01(\x0b\x32\x1b.library.PaginationResponse\"U\n\rAvailableCopy\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0f\n\x07\x62ook_id\x18\x02 \x01(\t\x12\x12\n\nbook_title\x18\x03 \x01(\t\x12\x13\n\x0b\x63opy_number\x18\x04 \x01(\t\"`\n\x1aListAvailableCopiesRequest\x12.\n\npagination\x18\x01 \x01(\x0b\x32\x1a.library.PaginationRequest\x12\x12\n\nconsistent\x18\x02 \x01(\x08\"v\n\x1bListAvailableCopiesResponse\x12&\n\x06\x63opies\x18\x01 \x03(\x0b\x32\x16.library.AvailableCopy\x12/\n\npagination\x18\x02 \x01(\x0b\x32\x1b.library.PaginationResponse\"=\n\x15\x43reateBookCopyRequest\x12\x0f\n\x07\x62ook_id\x18\x01 \x01(\t\x12\x13\n\x0b\x63opy_number\x18\x02 \x01(\t\"9\n\x16\x43reateBookCopyResponse\x12\x1f\n\x04\x63opy\x18\x01 \x01(\x0b\x32\x11.library.BookCopy\"n\n\x17ListCopiesByBookRequest\x12\x0f\n\x07\x62ook_id\x18\x01 \x01(\t\x12.\n\npagination\x18\x02 \x01(\x0b\x32\x1a.library.PaginationRequest\x12\x12\n\nconsistent\x18\x03 \x01(\x08\"n\n\x18ListCopiesByBookResponse\x12!\n\x06\x63opies\x18\x01 \x03(\x0b\x32\x11.library.BookCopy\x12/\n\npagination\x18\x02 \x01(\x0b\x32\x1b.library.PaginationResponse\"(\n\x12StreamBooksRequest\x12\x12\n\nchunk_size\x18\x01 \x01(\x05\")\n\tBookChunk\x12\x1c\n\x05\x62ooks\x18\x01 \x03(\x0b\x32\r.library.Book\"*\n\x14StreamMembersRequest\x12\x12\n\nchunk_size\x18\x01 \x01(\x05\"/\n\x0bMemberChunk\x12 \n\x07members\x18\x01 \x03(\x0b\x32\x0f.library.Member\"R\n\x14StreamBorrowsRequest\x12\x11\n\tmember_id\x18\x01 \x01(\t\x12\x13\n\x0b\x61\x63tive_only\x18\x02 \x01(\x08\x12\x12\n\nchunk_size\x18\x03 \x01(\x05\"/\n\x0b\x42orrowChunk\x12 \n\x07\x62orrows\x18\x01 \x03(\x0b\x32\x0f.library.Borrow\"R\n\rImportBookRow\x12\r\n\x05title\x18\x01 \x01(\t\x12\x0e\n\x06\x61uthor\x18\x02 \x01(\t\x12\x0c\n\x04isbn\x18\x03 \x01(\t\x12\x14\n\x0c\x63opy_numbers\x18\x04 \x03(\t\"?\n\x16\x42ulkImportBooksRequest\x12%\n\x05\x62ooks\x18\x01 \x03(\x0b\x32\x16.library.ImportBookRow\",\n\x0eImportRowError\x12\x0b\n\x03row\x18\x01 \x01(\x05\x12\r\n\x05\x65rror\x18\x02 \x01(\t\"s\n\x17\x42ulkImportBooksResponse\x12\x16\n\x0e\x62ooks_imported\x18\x01 \x01(\x05\x12\x17\n\x0f\x63opies_imported\x18\x02 \x01(\x05\x12\'\n\x06\x65rrors\x18\x03 \x03(\x0b\x32\x17.library.ImportRowError*R\n\tCountMode\x12\x14\n\x10\x43OUNT_MODE_EXACT\x10\x00\x12\x15\n\x11\x43OUNT_MODE_CACHED\x10\x01\x12\x18\n\x14\x43OUNT_MODE_ESTIMATED\x10\x02\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'proto.library_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
+  _globals['_COUNTMODE']._serialized_start=3905
+  _globals['_COUNTMODE']._serialized_end=3987
   _globals['_BOOK']._serialized_start=32
-  _globals['_BOOK']._serialized_end=115
-  _globals['_BOOKCOPY']._serialized_start=117
-  _globals['_BOOKCOPY']._serialized_end=193
-  _globals['_MEMBER']._serialized_start=195
-  _globals['_MEMBER']._serialized_end=244
-  _globals['_BORROW']._serialized_start=247
-  _globals['_BORROW']._serialized_end=456
-  _globals['_PAGINATIONREQUEST']._serialized_start=458
-  _globals['_PAGINATIONREQUEST']._serialized_end=506
-  _globals['_PAGINATIONRESPONSE']._serialized_start=508
-  _globals['_PAGINATIONRESPONSE']._serialized_end=578
-  _globals['_CREATEBOOKREQUEST']._serialized_start=580
-  _globals['_CREATEBOOKREQUEST']._serialized_end=644
-  _globals['_CREATEBOOKRESPONSE']._serialized_start=646
-  _globals['_CREATEBOOKRESPONSE']._serialized_end=695
-  _globals['_UPDATEBOOKREQUEST']._serialized_start=697
-  _globals['_UPDATEBOOKREQUEST']._serialized_end=773
-  _globals['_UPDATEBOOKRESPONSE']._serialized_start=775
-  _globals['_UPDATEBOOKRESPONSE']._serialized_end=824
-  _globals['_LISTBOOKSREQUEST']._serialized_start=826
-  _globals['_LISTBOOKSREQUEST']._serialized_end=892
-  _globals['_LISTBOOKSRESPONSE']._serialized_start=894
-  _globals['_LISTBOOKSRESPONSE']._serialized_end=992
-  _globals['_CREATEMEMBERREQUEST']._serialized_start=994
-  _globals['_CREATEMEMBERREQUEST']._serialized_end=1044
-  _globals['_CREATEMEMBERRESPONSE']._serialized_start=1046
-  _globals['_CREATEMEMBERRESPONSE']._serialized_end=1101
-  _globals['_UPDATEMEMBERREQUEST']._serialized_start=1103
-  _globals['_UPDATEMEMBERREQUEST']._serialized_end=1165
-  _globals['_UPDATEMEMBERRESPONSE']._serialized_start=1167
-  _globals['_UPDATEMEMBERRESPONSE']._serialized_end=1222
-  _globals['_LISTMEMBERSREQUEST']._serialized_start=1224
-  _globals['_LISTMEMBERSREQUEST']._serialized_end=1292
-  _globals['_LISTMEMBERSRESPONSE']._serialized_start=1294
-  _globals['_LISTMEMBERSRESPONSE']._serialized_end=1398
-  _globals['_BORROWBOOKREQUEST']._serialized_start=1400
-  _globals['_BORROWBOOKREQUEST']._serialized_end=1455
-  _globals['_BORROWBOOKRESPONSE']._serialized_start=1457
-  _globals['_BORROWBOOKRESPONSE']._serialized_end=1510
-  _globals['_RETURNBOOKREQUEST']._serialized_start=1512
-  _globals['_RETURNBOOKREQUEST']._serialized_end=1548
-  _globals['_RETURNBOOKRESPONSE']._serialized_start=1550
-  _globals['_RETURNBOOKRESPONSE']._serialized_end=1603
-  _globals['_LISTBORROWINGSREQUEST']._serialized_start=1605
-  _globals['_LISTBORROWINGSREQUEST']._serialized_end=1695
-  _globals['_LISTBORROWINGSRESPONSE']._serialized_start=1697
-  _globals['_LISTBORROWINGSRESPONSE']._serialized_end=1804
-  _globals['_AVAILABLECOPY']._serialized_start=1806
-  _globals['_AVAILABLECOPY']._serialized_end=1891
-  _globals['_LISTAVAILABLECOPIESREQUEST']._serialized_start=1893
-  _globals['_LISTAVAILABLECOPIESREQUEST']._serialized_end=1969
-  _globals['_LISTAVAILABLECOPIESRESPONSE']._serialized_start=1971
-  _globals['_LISTAVAILABLECOPIESRESPONSE']._serialized_end=2089
-  _globals['_CREATEBOOKCOPYREQUEST']._serialized_start=2091
-  _globals['_CREATEBOOKCOPYREQUEST']._serialized_end=2152
-  _globals['_CREATEBOOKCOPYRESPONSE']._serialized_start=2154
-  _globals['_CREATEBOOKCOPYRESPONSE']._serialized_end=2211
-  _globals['_LISTCOPIESBYBOOKREQUEST']._serialized_start=2213
-  _globals['_LISTCOPIESBYBOOKREQUEST']._serialized_end=2303
-  _globals['_LISTCOPIESBYBOOKRESPONSE']._serialized_start=2305
-  _globals['_LISTCOPIESBYBOOKRESPONSE']._serialized_end=2415
+  _globals['_BOOK']._serialized_end=157
+  _globals['_BOOKCOPY']._serialized_start=159
+  _globals['_BOOKCOPY']._serialized_end=252
+  _globals['_MEMBER']._serialized_start=254
+  _globals['_MEMBER']._serialized_end=320
+  _globals['_BORROW']._serialized_start=323
+  _globals['_BORROW']._serialized_end=532
+  _globals['_PAGINATIONREQUEST']._serialized_start=534
+  _globals['_PAGINATIONREQUEST']._serialized_end=642
+  _globals['_PAGINATIONRESPONSE']._serialized_start=644
+  _globals['_PAGINATIONRESPONSE']._serialized_end=766
+  _globals['_CREATEBOOKREQUEST']._serialized_start=768
+  _globals['_CREATEBOOKREQUEST']._serialized_end=832
+  _globals['_CREATEBOOKRESPONSE']._serialized_start=834
+  _globals['_CREATEBOOKRESPONSE']._serialized_end=883
+  _globals['_UPDATEBOOKREQUEST']._serialized_start=885
+  _globals['_UPDATEBOOKREQUEST']._serialized_end=987
+  _globals['_UPDATEBOOKRESPONSE']._serialized_start=989
+  _globals['_UPDATEBOOKRESPONSE']._serialized_end=1038
+  _globals['_LISTBOOKSREQUEST']._serialized_start=1040
+  _globals['_LISTBOOKSREQUEST']._serialized_end=1126
+  _globals['_LISTBOOKSRESPONSE']._serialized_start=1128
+  _globals['_LISTBOOKSRESPONSE']._serialized_end=1226
+  _globals['_SEARCHBOOKSREQUEST']._serialized_start=1228
+  _globals['_SEARCHBOOKSREQUEST']._serialized_end=1331
+  _globals['_SEARCHBOOKSRESPONSE']._serialized_start=1333
+  _globals['_SEARCHBOOKSRESPONSE']._serialized_end=1433
+  _globals['_CREATEMEMBERREQUEST']._serialized_start=1435
+  _globals['_CREATEMEMBERREQUEST']._serialized_end=1485
+  _globals['_CREATEMEMBERRESPONSE']._serialized_start=1487
+  _globals['_CREATEMEMBERRESPONSE']._serialized_end=1542
+  _globals['_UPDATEMEMBERREQUEST']._serialized_start=1544
+  _globals['_UPDATEMEMBERREQUEST']._serialized_end=1632
+  _globals['_UPDATEMEMBERRESPONSE']._serialized_start=1634
+  _globals['_UPDATEMEMBERRESPONSE']._serialized_end=1689
+  _globals['_LISTMEMBERSREQUEST']._serialized_start=1691
+  _globals['_LISTMEMBERSREQUEST']._serialized_end=1779
+  _globals['_LISTMEMBERSRESPONSE']._serialized_start=1781
+  _globals['_LISTMEMBERSRESPONSE']._serialized_end=1885
+  _globals['_BORROWBOOKREQUEST']._serialized_start=1887
+  _globals['_BORROWBOOKREQUEST']._serialized_end=1942
+  _globals['_BORROWBOOKRESPONSE']._serialized_start=1944
+  _globals['_BORROWBOOKRESPONSE']._serialized_end=1997
+  _globals['_RETURNBOOKREQUEST']._serialized_start=1999
+  _globals['_RETURNBOOKREQUEST']._serialized_end=2035
+  _globals['_RETURNBOOKRESPONSE']._serialized_start=2037
+  _globals['_RETURNBOOKRESPONSE']._serialized_end=2090
+  _globals['_BORROWITEMRESULT']._serialized_start=2092
+  _globals['_BORROWITEMRESULT']._serialized_end=2175
+  _globals['_BORROWBOOKSREQUEST']._serialized_start=2177
+  _globals['_BORROWBOOKSREQUEST']._serialized_end=2234
+  _globals['_BORROWBOOKSRESPONSE']._serialized_start=2236
+  _globals['_BORROWBOOKSRESPONSE']._serialized_end=2301
+  _globals['_RETURNBOOKSREQUEST']._serialized_start=2303
+  _globals['_RETURNBOOKSREQUEST']._serialized_end=2341
+  _globals['_RETURNBOOKSRESPONSE']._serialized_start=2343
+  _globals['_RETURNBOOKSRESPONSE']._serialized_end=2408
+  _globals['_LISTBORROWINGSREQUEST']._serialized_start=2410
+  _globals['_LISTBORROWINGSREQUEST']._serialized_end=2520
+  _globals['_LISTBORROWINGSRESPONSE']._serialized_start=2522
+  _globals['_LISTBORROWINGSRESPONSE']._serialized_end=2629
+  _globals['_AVAILABLECOPY']._serialized_start=2631
+  _globals['_AVAILABLECOPY']._serialized_end=2716
+  _globals['_LISTAVAILABLECOPIESREQUEST']._serialized_start=2718
+  _globals['_LISTAVAILABLECOPIESREQUEST']._serialized_end=2814
+  _globals['_LISTAVAILABLECOPIESRESPONSE']._serialized_start=2816
+  _globals['_LISTAVAILABLECOPIESRESPONSE']._serialized_end=2934
+  _globals['_CREATEBOOKCOPYREQUEST']._serialized_start=2936
+  _globals['_CREATEBOOKCOPYREQUEST']._serialized_end=2997
+  _globals['_CREATEBOOKCOPYRESPONSE']._serialized_start=2999
+  _globals['_CREATEBOOKCOPYRESPONSE']._serialized_end=3056
+  _globals['_LISTCOPIESBYBOOKREQUEST']._serialized_start=3058
+  _globals['_LISTCOPIESBYBOOKREQUEST']._serialized_end=3168
+  _globals['_LISTCOPIESBYBOOKRESPONSE']._serialized_start=3170
+  _globals['_LISTCOPIESBYBOOKRESPONSE']._serialized_end=3280
+  _globals['_STREAMBOOKSREQUEST']._serialized_start=3282
+  _globals['_STREAMBOOKSREQUEST']._serialized_end=3322
+  _globals['_BOOKCHUNK']._serialized_start=3324
+  _globals['_BOOKCHUNK']._serialized_end=3365
+  _globals['_STREAMMEMBERSREQUEST']._serialized_start=3367
+  _globals['_STREAMMEMBERSREQUEST']._serialized_end=3409
+  _globals['_MEMBERCHUNK']._serialized_start=3411
+  _globals['_MEMBERCHUNK']._serialized_end=3458
+  _globals['_STREAMBORROWSREQUEST']._serialized_start=3460
+  _globals['_STREAMBORROWSREQUEST']._serialized_end=3542
+  _globals['_BORROWCHUNK']._serialized_start=3544
+  _globals['_BORROWCHUNK']._serialized_end=3591
+  _globals['_IMPORTBOOKROW']._serialized_start=3593
+  _globals['_IMPORTBOOKROW']._serialized_end=3675
+  _globals['_BULKIMPORTBOOKSREQUEST']._serialized_start=3677
+  _globals['_BULKIMPORTBOOKSREQUEST']._serialized_end=3740
+  _globals['_IMPORTROWERROR']._serialized_start=3742
+  _globals['_IMPORTROWERROR']._serialized_end=3786
+  _globals['_BULKIMPORTBOOKSRESPONSE']._serialized_start=3788
+  _globals['_BULKIMPORTBOOKSRESPONSE']._serialized_end=3903
 # @@protoc_insertion_point(module_scope)
@@ -26,7 +26,7 @@ from proto import library_pb2 as proto_dot_library__pb2
 from proto import auth_pb2 as proto_dot_auth__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1bproto/library_service.proto\x12\x07library\x1a\x13proto/library.proto\x1a\x10proto/auth.proto2\xe7\x07\n\x0eLibraryService\x12\x30\n\x05Login\x12\x12.auth.LoginRequest\x1a\x13.auth.LoginResponse\x12\x45\n\nCreateBook\x12\x1a.library.CreateBookRequest\x1a\x1b.library.CreateBookResponse\x12\x45\n\nUpdateBook\x12\x1a.library.UpdateBookRequest\x1a\x1b.library.UpdateBookResponse\x12\x42\n\tListBooks\x12\x19.library.ListBooksRequest\x1a\x1a.library.ListBooksResponse\x12K\n\x0c\x43reateMember\x12\x1c.library.CreateMemberRequest\x1a\x1d.library.CreateMemberResponse\x12K\n\x0cUpdateMember\x12\x1c.library.UpdateMemberRequest\x1a\x1d.library.UpdateMemberResponse\x12H\n\x0bListMembers\x12\x1b.library.ListMembersRequest\x1a\x1c.library.ListMembersResponse\x12\x45\n\nBorrowBook\x12\x1a.library.BorrowBookRequest\x1a\x1b.library.BorrowBookResponse\x12\x45\n\nReturnBook\x12\x1a.library.ReturnBookRequest\x1a\x1b.library.ReturnBookResponse\x12Q\n\x0eListBorrowings\x12\x1e.library.ListBorrowingsRequest\x1a\x1f.library.ListBorrowingsResponse\x12Q\n\x0e\x43reateBookCopy\x12\x1e.library.CreateBookCopyRequest\x1a\x1f.library.CreateBookCopyResponse\x12`\n\x13ListAvailableCopies\x12#.library.ListAvailableCopiesRequest\x1a$.library.ListAvailableCopiesResponse\x12W\n\x10ListCopiesByBook\x12 .library.ListCopiesByBookRequest\x1a!.library.ListCopiesByBookResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1bproto/library_service.proto\x12\x07library\x1a\x13proto/library.proto\x1a\x10proto/auth.proto2\xef\x0b\n\x0eLibraryService\x12\x30\n\x05Login\x12\x12.auth.LoginRequest\x1a\x13.auth.LoginResponse\x12\x45\n\nCreateBook\x12\x1a.library.CreateBookRequest\x1a\x1b.library.CreateBookResponse\x12\x45\n\nUpdateBook\x12\x1a.library.UpdateBookRequest\x1a\x1b.library.UpdateBookResponse\x12\x42\n\tListBooks\x12\x19.library.ListBooksRequest\x1a\x1a.library.ListBooksResponse\x12H\n\x0bSearchBooks\x12\x1b.library.SearchBooksRequest\x1a\x1c.library.SearchBooksResponse\x12K\n\x0c\x43reateMember\x12\x1c.library.CreateMemberRequest\x1a\x1d.library.CreateMemberResponse\x12K\n\x0cUpdateMember\x12\x1c.library.UpdateMemberRequest\x1a\x1d.library.UpdateMemberResponse\x12H\n\x0bListMembers\x12\x1b.library.ListMembersRequest\x1a\x1c.library.ListMembersResponse\x12\x45\n\nBorrowBook\x12\x1a.library.BorrowBookRequest\x1a\x1b.library.BorrowBookResponse\x12\x45\n\nReturnBook\x12\x1a.library.ReturnBookRequest\x1a\x1b.library.ReturnBookResponse\x12H\n\x0b\x42orrowBooks\x12\x1b.library.BorrowBooksRequest\x1a\x1c.library.BorrowBooksResponse\x12H\n\x0bReturnBooks\x12\x1b.library.ReturnBooksRequest\x1a\x1c.library.ReturnBooksResponse\x12Q\n\x0eListBorrowings\x12\x1e.library.ListBorrowingsRequest\x1a\x1f.library.ListBorrowingsResponse\x12Q\n\x0e\x43reateBookCopy\x12\x1e.library.CreateBookCopyRequest\x1a\x1f.library.CreateBookCopyResponse\x12`\n\x13ListAvailableCopies\x12#.library.ListAvailableCopiesRequest\x1a$.library.ListAvailableCopiesResponse\x12W\n\x10ListCopiesByBook\x12 .library.ListCopiesByBookRequest\x1a!.library.ListCopiesByBookResponse\x12@\n\x0bStreamBooks\x12\x1b.library.StreamBooksRequest\x1a\x12.library.BookChunk0\x01\x12\x46\n\rStreamMembers\x12\x1d.library.StreamMembersRequest\x1a\x14.library.MemberChunk0\x01\x12\x46\n\rStreamBorrows\x12\x1d.library.StreamBorrowsRequest\x1a\x14.library.BorrowChunk0\x01\x12V\n\x0f\x42ulkImportBooks\x12\x1f.library.BulkImportBooksRequest\x1a .library.BulkImportBooksResponse(\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -34,5 +34,5 @@ _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'proto.library_service_pb2',
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
   _globals['_LIBRARYSERVICE']._serialized_start=80
-  _globals['_LIBRARYSERVICE']._serialized_end=1079
+  _globals['_LIBRARYSERVICE']._serialized_end=1599
 # @@protoc_insertion_point(module_scope)
@@ -55,6 +55,11 @@ class LibraryServiceStub(object):
                 request_serializer=proto_dot_library__pb2.ListBooksRequest.SerializeToString,
                 response_deserializer=proto_dot_library__pb2.ListBooksResponse.FromString,
                 _registered_method=True)
+        self.SearchBooks = channel.unary_unary(
+                '/library.LibraryService/SearchBooks',
+                request_serializer=proto_dot_library__pb2.SearchBooksRequest.SerializeToString,
+                response_deserializer=proto_dot_library__pb2.SearchBooksResponse.FromString,
+                _registered_method=True)
         self.CreateMember = channel.unary_unary(
                 '/library.LibraryService/CreateMember',
                 request_serializer=proto_dot_library__pb2.CreateMemberRequest.SerializeToString,
@@ -80,6 +85,16 @@ class LibraryServiceStub(object):
                 request_serializer=proto_dot_library__pb2.ReturnBookRequest.SerializeToString,
                 response_deserializer=proto_dot_library__pb2.ReturnBookResponse.FromString,
                 _registered_method=True)
+        self.BorrowBooks = channel.unary_unary(
+                '/library.LibraryService/BorrowBooks',
+                request_serializer=proto_dot_library__pb2.BorrowBooksRequest.SerializeToString,
+                response_deserializer=proto_dot_library__pb2.BorrowBooksResponse.FromString,
+                _registered_method=True)
+        self.ReturnBooks = channel.unary_unary(
+                '/library.LibraryService/ReturnBooks',
+                request_serializer=proto_dot_library__pb2.ReturnBooksRequest.SerializeToString,
+                response_deserializer=proto_dot_library__pb2.ReturnBooksResponse.FromString,
+                _registered_method=True)
         self.ListBorrowings = channel.unary_unary(
                 '/library.LibraryService/ListBorrowings',
                 request_serializer=proto_dot_library__pb2.ListBorrowingsRequest.SerializeToString,
@@ -100,6 +115,26 @@ class LibraryServiceStub(object):
                 request_serializer=proto_dot_library__pb2.ListCopiesByBookRequest.SerializeToString,
                 response_deserializer=proto_dot_library__pb2.ListCopiesByBookResponse.FromString,
                 _registered_method=True)
+        self.StreamBooks = channel.unary_stream(
+                '/library.LibraryService/StreamBooks',
+                request_serializer=proto_dot_library__pb2.StreamBooksRequest.SerializeToString,
+                response_deserializer=proto_dot_library__pb2.BookChunk.FromString,
+                _registered_method=True)
+        self.StreamMembers = channel.unary_stream(
+                '/library.LibraryService/StreamMembers',
+                request_serializer=proto_dot_library__pb2.StreamMembersRequest.SerializeToString,
+                response_deserializer=proto_dot_library__pb2.MemberChunk.FromString,
+                _registered_method=True)
+        self.StreamBorrows = channel.unary_stream(
+                '/library.LibraryService/StreamBorrows',
+                request_serializer=proto_dot_library__pb2.StreamBorrowsRequest.SerializeToString,
+                response_deserializer=proto_dot_library__pb2.BorrowChunk.FromString,
+                _registered_method=True)
+        self.BulkImportBooks = channel.stream_unary(
+                '/library.LibraryService/BulkImportBooks',
+                request_serializer=proto_dot_library__pb2.BulkImportBooksRequest.SerializeToString,
+                response_deserializer=proto_dot_library__pb2.BulkImportBooksResponse.FromString,
+                _registered_method=True)
 
 
 class LibraryServiceServicer(object):
@@ -129,6 +164,12 @@ class LibraryServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def SearchBooks(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def CreateMember(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -159,6 +200,18 @@ class LibraryServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def BorrowBooks(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ReturnBooks(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def ListBorrowings(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -183,6 +236,30 @@ class LibraryServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def StreamBooks(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StreamMembers(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StreamBorrows(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def BulkImportBooks(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_LibraryServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -206,6 +283,11 @@ def add_LibraryServiceServicer_to_server(servicer, server):
                     request_deserializer=proto_dot_library__pb2.ListBooksRequest.FromString,
                     response_serializer=proto_dot_library__pb2.ListBooksResponse.SerializeToString,
             ),
+            'SearchBooks': grpc.unary_unary_rpc_method_handler(
+                    servicer.SearchBooks,
+                    request_deserializer=proto_dot_library__pb2.SearchBooksRequest.FromString,
+                    response_serializer=proto_dot_library__pb2.SearchBooksResponse.SerializeToString,
+            ),
             'CreateMember': grpc.unary_unary_rpc_method_handler(
                     servicer.CreateMember,
                     request_deserializer=proto_dot_library__pb2.CreateMemberRequest.FromString,
@@ -231,6 +313,16 @@ def add_LibraryServiceServicer_to_server(servicer, server):
                     request_deserializer=proto_dot_library__pb2.ReturnBookRequest.FromString,
                     response_serializer=proto_dot_library__pb2.ReturnBookResponse.SerializeToString,
             ),
+            'BorrowBooks': grpc.unary_unary_rpc_method_handler(
+                    servicer.BorrowBooks,
+                    request_deserializer=proto_dot_library__pb2.BorrowBooksRequest.FromString,
+                    response_serializer=proto_dot_library__pb2.BorrowBooksResponse.SerializeToString,
+            ),
+            'ReturnBooks': grpc.unary_unary_rpc_method_handler(
+                    servicer.ReturnBooks,
+                    request_deserializer=proto_dot_library__pb2.ReturnBooksRequest.FromString,
+                    response_serializer=proto_dot_library__pb2.ReturnBooksResponse.SerializeToString,
+            ),
             'ListBorrowings': grpc.unary_unary_rpc_method_handler(
                     servicer.ListBorrowings,
                     request_deserializer=proto_dot_library__pb2.ListBorrowingsRequest.FromString,
@@ -251,6 +343,26 @@ def add_LibraryServiceServicer_to_server(servicer, server):
                     request_deserializer=proto_dot_library__pb2.ListCopiesByBookRequest.FromString,
                     response_serializer=proto_dot_library__pb2.ListCopiesByBookResponse.SerializeToString,
             ),
+            'StreamBooks': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamBooks,
+                    request_deserializer=proto_dot_library__pb2.StreamBooksRequest.FromString,
+                    response_serializer=proto_dot_library__pb2.BookChunk.SerializeToString,
+            ),
+            'StreamMembers': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamMembers,
+                    request_deserializer=proto_dot_library__pb2.StreamMembersRequest.FromString,
+                    response_serializer=proto_dot_library__pb2.MemberChunk.SerializeToString,
+            ),
+            'StreamBorrows': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamBorrows,
+                    request_deserializer=proto_dot_library__pb2.StreamBorrowsRequest.FromString,
+                    response_serializer=proto_dot_library__pb2.BorrowChunk.SerializeToString,
+            ),
+            'BulkImportBooks': grpc.stream_unary_rpc_method_handler(
+                    servicer.BulkImportBooks,
+                    request_deserializer=proto_dot_library__pb2.BulkImportBooksRequest.FromString,
+                    response_serializer=proto_dot_library__pb2.BulkImportBooksResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'library.LibraryService', rpc_method_handlers)
@@ -370,6 +482,33 @@ class LibraryService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def SearchBooks(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/library.LibraryService/SearchBooks',
+            proto_dot_library__pb2.SearchBooksRequest.SerializeToString,
+            proto_dot_library__pb2.SearchBooksResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def CreateMember(request,
             target,
@@ -505,6 +644,60 @@ class LibraryService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def BorrowBooks(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/library.LibraryService/BorrowBooks',
+            proto_dot_library__pb2.BorrowBooksRequest.SerializeToString,
+            proto_dot_library__pb2.BorrowBooksResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ReturnBooks(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/library.LibraryService/ReturnBooks',
+            proto_dot_library__pb2.ReturnBooksRequest.SerializeToString,
+            proto_dot_library__pb2.ReturnBooksResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def ListBorrowings(request,
             target,
@@ -612,3 +805,111 @@ class LibraryService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def StreamBooks(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/library.LibraryService/StreamBooks',
+            proto_dot_library__pb2.StreamBooksRequest.SerializeToString,
+            proto_dot_library__pb2.BookChunk.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def StreamMembers(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/library.LibraryService/StreamMembers',
+            proto_dot_library__pb2.StreamMembersRequest.SerializeToString,
+            proto_dot_library__pb2.MemberChunk.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def StreamBorrows(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/library.LibraryService/StreamBorrows',
+            proto_dot_library__pb2.StreamBorrowsRequest.SerializeToString,
+            proto_dot_library__pb2.BorrowChunk.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def BulkImportBooks(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            '/library.LibraryService/BulkImportBooks',
+            proto_dot_library__pb2.BulkImportBooksRequest.SerializeToString,
+            proto_dot_library__pb2.BulkImportBooksResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -0,0 +1,54 @@
+"""Partial indexes on active borrows.
+
+Adds a unique index allowing one active borrow per copy and an index for
+listing a member's active borrows newest first. On Postgres the indexes
+are built CONCURRENTLY so lending is not blocked during the upgrade; the
+unique index fails to build if a copy already has two active borrows.
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "002"
+down_revision: Union[str, None] = "001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE = sa.text("status = 'active'")
+
+
+def upgrade() -> None:
+    """Create partial indexes on active borrows."""
+    concurrently = op.get_bind().dialect.name == "postgresql"
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "uq_borrows_active_copy_id",
+            "borrows",
+            ["copy_id"],
+            unique=True,
+            postgresql_where=ACTIVE,
+            sqlite_where=ACTIVE,
+            postgresql_concurrently=concurrently,
+        )
+        op.create_index(
+            "ix_borrows_active_member_borrowed_at",
+            "borrows",
+            ["member_id", sa.text("borrowed_at DESC"), sa.text("id DESC")],
+            postgresql_where=ACTIVE,
+            sqlite_where=ACTIVE,
+            postgresql_concurrently=concurrently,
+        )
+
+
+def downgrade() -> None:
+    """Drop the partial indexes."""
+    op.drop_index("ix_borrows_active_member_borrowed_at", table_name="borrows")
+    op.drop_index("uq_borrows_active_copy_id", table_name="borrows")
@@ -0,0 +1,112 @@
+"""Composite indexes for the hot list queries.
+
+- book_copies (book_id, copy_number) UNIQUE: copy listing order and the
+  per-book copy number rule; replaces ix_book_copies_book_id.
+- book_copies (book_id, copy_number) WHERE status = 'available': available
+  copies per book in order; replaces ix_book_copies_status.
+- books (created_at DESC, id DESC) and members (created_at DESC, id DESC):
+  ListBooks / ListMembers order, including keyset pages.
+- books (title, id): available-copies listing order.
+- borrows (borrowed_at DESC, id DESC) WHERE status = 'active': ListBorrowings
+  without a member; with uq_borrows_active_copy_id this replaces
+  ix_borrows_status.
+
+On Postgres indexes are created and dropped CONCURRENTLY. The unique index
+fails to build if a book already has duplicate copy numbers.
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "003"
+down_revision: Union[str, None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+AVAILABLE = sa.text("status = 'available'")
+ACTIVE = sa.text("status = 'active'")
+
+
+def _concurrently() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def upgrade() -> None:
+    """Create composite indexes and drop the ones they supersede."""
+    concurrently = _concurrently()
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "uq_book_copies_book_id_copy_number",
+            "book_copies",
+            ["book_id", "copy_number"],
+            unique=True,
+            postgresql_concurrently=concurrently,
+        )
+        op.create_index(
+            "ix_book_copies_available_book_id_copy_number",
+            "book_copies",
+            ["book_id", "copy_number"],
+            postgresql_where=AVAILABLE,
+            sqlite_where=AVAILABLE,
+            postgresql_concurrently=concurrently,
+        )
+        op.create_index(
+            "ix_books_created_at_id",
+            "books",
+            [sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_concurrently=concurrently,
+        )
+        op.create_index(
+            "ix_books_title_id",
+            "books",
+            ["title", "id"],
+            postgresql_concurrently=concurrently,
+        )
+        op.create_index(
+            "ix_members_created_at_id",
+            "members",
+            [sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_concurrently=concurrently,
+        )
+        op.create_index(
+            "ix_borrows_active_borrowed_at",
+            "borrows",
+            [sa.text("borrowed_at DESC"), sa.text("id DESC")],
+            postgresql_where=ACTIVE,
+            sqlite_where=ACTIVE,
+            postgresql_concurrently=concurrently,
+        )
+        for name, table in (
+            ("ix_book_copies_book_id", "book_copies"),
+            ("ix_book_copies_status", "book_copies"),
+            ("ix_borrows_status", "borrows"),
+        ):
+            op.drop_index(
+                name, table_name=table, postgresql_concurrently=concurrently
+            )
+
+
+def downgrade() -> None:
+    """Restore the single-column indexes and drop the composite ones."""
+    op.create_index("ix_book_copies_book_id", "book_copies", ["book_id"])
+    op.create_index("ix_book_copies_status", "book_copies", ["status"])
+    op.create_index("ix_borrows_status", "borrows", ["status"])
+    op.drop_index("ix_borrows_active_borrowed_at", table_name="borrows")
+    op.drop_index("ix_members_created_at_id", table_name="members")
+    op.drop_index("ix_books_title_id", table_name="books")
+    op.drop_index("ix_books_created_at_id", table_name="books")
+    op.drop_index(
+        "ix_book_copies_available_book_id_copy_number",
+        table_name="book_copies"
+    )
+    op.drop_index(
+        "uq_book_copies_book_id_copy_number", table_name="book_copies"
+    )
@@ -0,0 +1,54 @@
+"""Denormalized copy_count and available_count on books.
+
+The counts are maintained by the repository in the same transaction as
+each copy change; this migration adds the columns and backfills them from
+book_copies. scripts/reconcile_book_counts.py repairs any later drift.
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "004"
+down_revision: Union[str, None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add the count columns and backfill them."""
+    op.add_column(
+        "books",
+        sa.Column(
+            "copy_count", sa.Integer(), nullable=False, server_default="0"
+        ),
+    )
+    op.add_column(
+        "books",
+        sa.Column(
+            "available_count", sa.Integer(), nullable=False,
+            server_default="0"
+        ),
+    )
+    op.execute(
+        "UPDATE books SET "
+        "copy_count = (SELECT count(*) FROM book_copies "
+        "WHERE book_copies.book_id = books.id), "
+        "available_count = (SELECT count(*) FROM book_copies "
+        "WHERE book_copies.book_id = books.id "
+        "AND book_copies.status = 'available')"
+    )
+
+
+def downgrade() -> None:
+    """Drop the count columns."""
+    with op.batch_alter_table("books") as batch_op:
+        batch_op.drop_column("available_count")
+        batch_op.drop_column("copy_count")
@@ -0,0 +1,66 @@
+"""Indexes for SearchBooks.
+
+- books (isbn): exact ISBN lookups.
+- books USING gin (to_tsvector('english', title || ' ' || author)):
+  full-text and word-prefix matches. An expression index rather than a
+  stored tsvector column, so the model stays portable; queries use
+  models.book.search_document, which renders the same expression.
+- books USING gin (lower(title) gin_trgm_ops): fuzzy title matches.
+  Requires the pg_trgm extension, created here.
+
+The GIN indexes are Postgres only and built CONCURRENTLY.
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the ISBN index and, on Postgres, the search indexes."""
+    postgresql = op.get_bind().dialect.name == "postgresql"
+    if postgresql:
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_books_isbn",
+            "books",
+            ["isbn"],
+            postgresql_concurrently=postgresql,
+        )
+        if not postgresql:
+            return
+        op.create_index(
+            "ix_books_search",
+            "books",
+            [sa.text("to_tsvector('english', (title || ' ') || author)")],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_books_title_trgm",
+            "books",
+            [sa.text("lower(title) gin_trgm_ops")],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Drop the search indexes; pg_trgm is left installed."""
+    if op.get_bind().dialect.name == "postgresql":
+        op.drop_index("ix_books_title_trgm", table_name="books")
+        op.drop_index("ix_books_search", table_name="books")
+    op.drop_index("ix_books_isbn", table_name="books")
@@ -0,0 +1,42 @@
+"""Version columns on books, members and book_copies.
+
+Each row starts at version 1 and every update bumps it; UpdateBook and
+UpdateMember use it for compare-and-set. Adding a column with a constant
+server default does not rewrite the table on Postgres 11+.
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_TABLES = ("books", "members", "book_copies")
+
+
+def upgrade() -> None:
+    """Add the version columns."""
+    for table in _TABLES:
+        op.add_column(
+            table,
+            sa.Column(
+                "version", sa.Integer(), nullable=False, server_default="1"
+            ),
+        )
+
+
+def downgrade() -> None:
+    """Drop the version columns."""
+    for table in _TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column("version")
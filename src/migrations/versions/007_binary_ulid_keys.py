@@ -0,0 +1,148 @@
+"""Binary ULID key columns (ULID_STORAGE=binary).
+
+With ULID_STORAGE=binary every ULID primary and foreign key column is
+converted from its 26-character text form to 16 bytes, which shrinks the
+keys and every index on them:
+
+- Postgres: native uuid, converted in place with the SQL functions
+  ulid_to_uuid(text) and uuid_to_ulid(uuid) created here (kept for ad hoc
+  queries). The foreign keys are dropped around the conversion and
+  recreated. Each table is rewritten once, with its indexes, under an
+  ACCESS EXCLUSIVE lock: schedule downtime for large tables.
+- SQLite: values are rewritten as 16-byte blobs; the declared column types
+  are left as they are, since SQLite stores any value in any column.
+
+With the default ULID_STORAGE=text the upgrade changes nothing. To switch
+an existing database, downgrade to 006 and upgrade again with
+ULID_STORAGE=binary. The downgrade converts binary keys back to text
+whatever ULID_STORAGE says.
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from config import ULID_STORAGE
+from util.ulid_util import ulid_from_bytes, ulid_to_bytes
+
+
+# revision identifiers, used by Alembic.
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_KEY_COLUMNS = {
+    "books": ["id"],
+    "members": ["id"],
+    "staff_users": ["id"],
+    "book_copies": ["id", "book_id"],
+    "borrows": ["id", "copy_id", "member_id"],
+}
+# (constraint, table, column, referenced table); Postgres default names.
+_FOREIGN_KEYS = [
+    ("book_copies_book_id_fkey", "book_copies", "book_id", "books"),
+    ("borrows_copy_id_fkey", "borrows", "copy_id", "book_copies"),
+    ("borrows_member_id_fkey", "borrows", "member_id", "members"),
+]
+
+_ULID_TO_UUID = """
+CREATE OR REPLACE FUNCTION ulid_to_uuid(value text) RETURNS uuid
+LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE AS $$
+    SELECT string_agg(
+        to_hex(substring(bits FROM n FOR 4)::bit(4)::int), '' ORDER BY n
+    )::uuid
+    FROM (
+        SELECT substring(string_agg(
+            (strpos('0123456789ABCDEFGHJKMNPQRSTVWXYZ',
+                    substr(upper(value), i, 1)) - 1)::bit(5)::text,
+            '' ORDER BY i
+        ) FROM 3) AS bits
+        FROM generate_series(1, 26) AS i
+    ) AS encoded, generate_series(1, 125, 4) AS n
+$$
+"""
+
+_UUID_TO_ULID = """
+CREATE OR REPLACE FUNCTION uuid_to_ulid(value uuid) RETURNS text
+LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE AS $$
+    SELECT string_agg(
+        substr('0123456789ABCDEFGHJKMNPQRSTVWXYZ',
+               substring(bits FROM i FOR 5)::bit(5)::int + 1, 1),
+        '' ORDER BY i
+    )
+    FROM (
+        SELECT '00' || ('x' || replace(value::text, '-', ''))::bit(128)::text
+            AS bits
+    ) AS decoded, generate_series(1, 126, 5) AS i
+$$
+"""
+
+
+def _is_uuid(table: str) -> bool:
+    """Whether table's keys are already uuid (Postgres)."""
+    columns = sa.inspect(op.get_bind()).get_columns(table)
+    return any(
+        column["name"] == "id" and isinstance(column["type"], postgresql.UUID)
+        for column in columns
+    )
+
+
+def _alter_postgres(type_sql: str, function: str) -> None:
+    """Convert every key column with function, foreign keys dropped."""
+    for name, table, _, _ in _FOREIGN_KEYS:
+        op.drop_constraint(name, table, type_="foreignkey")
+    for table, columns in _KEY_COLUMNS.items():
+        op.execute(
+            f"ALTER TABLE {table} " + ", ".join(
+                f"ALTER COLUMN {column} TYPE {type_sql} "
+                f"USING {function}({column})"
+                for column in columns
+            )
+        )
+    for name, table, column, referenced in _FOREIGN_KEYS:
+        op.create_foreign_key(name, table, referenced, [column], ["id"])
+
+
+def _rewrite_sqlite(function, from_type: str) -> None:
+    """Rewrite key values stored as from_type ("text" or "blob")."""
+    bind = op.get_bind()
+    bind.connection.driver_connection.create_function(
+        "convert_ulid", 1, function, deterministic=True
+    )
+    for table, columns in _KEY_COLUMNS.items():
+        for column in columns:
+            op.execute(
+                f"UPDATE {table} SET {column} = convert_ulid({column}) "
+                f"WHERE typeof({column}) = '{from_type}'"
+            )
+
+
+def upgrade() -> None:
+    """Convert ULID keys to 16 bytes when ULID_STORAGE=binary."""
+    if ULID_STORAGE != "binary":
+        return
+    if op.get_bind().dialect.name == "postgresql":
+        if not _is_uuid("books"):
+            op.execute(_ULID_TO_UUID)
+            op.execute(_UUID_TO_ULID)
+            _alter_postgres("uuid", "ulid_to_uuid")
+    else:
+        _rewrite_sqlite(ulid_to_bytes, "text")
+
+
+def downgrade() -> None:
+    """Convert binary ULID keys back to text."""
+    if op.get_bind().dialect.name == "postgresql":
+        if _is_uuid("books"):
+            _alter_postgres("varchar(26)", "uuid_to_ulid")
+        op.execute("DROP FUNCTION IF EXISTS ulid_to_uuid(text)")
+        op.execute("DROP FUNCTION IF EXISTS uuid_to_ulid(uuid)")
+    else:
+        _rewrite_sqlite(ulid_from_bytes, "blob")
@@ -0,0 +1,45 @@
+"""Microsecond keyset timestamps on SQLite.
+
+books.created_at, members.created_at and borrows.borrowed_at are now filled
+in by the application, which SQLite stores as 'YYYY-MM-DD HH:MM:SS.ffffff'.
+Rows written earlier through the CURRENT_TIMESTAMP server default hold
+'YYYY-MM-DD HH:MM:SS', which sorts below the cursor value a page token
+binds and made keyset pagination repeat a page. This pads them to the new
+format. Postgres stores timestamps natively and is unaffected.
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "008"
+down_revision: Union[str, None] = "007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_COLUMNS = {
+    "books": "created_at",
+    "members": "created_at",
+    "borrows": "borrowed_at",
+}
+
+
+def upgrade() -> None:
+    """Pad second-precision SQLite timestamps to microseconds."""
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for table, column in _COLUMNS.items():
+        op.execute(
+            f"UPDATE {table} SET {column} = {column} || '.000000' "
+            f"WHERE length({column}) = 19"
+        )
+
+
+def downgrade() -> None:
+    """Nothing to undo; padded values read back unchanged."""
@@ -1,5 +1,7 @@
 """SQLAlchemy declarative base."""
 
+from datetime import datetime, timezone
+
 from sqlalchemy.orm import DeclarativeBase
 
 
@@ -7,3 +9,15 @@ class Base(DeclarativeBase):
     """Base class for all models."""
 
     pass
+
+
+def utc_now() -> datetime:
+    """
+    Current UTC time, as an application-side column default.
+
+    Used for the timestamps list pages are keyset-paginated on. Filling them
+    in Python gives every row microsecond precision in the format the page
+    cursor binds as; SQLite's CURRENT_TIMESTAMP server default stores whole
+    seconds as text, which compares below the cursor's own value.
+    """
+    return datetime.now(timezone.utc)
@@ -1,10 +1,37 @@
 """Book model - title-level catalog entry."""
 
-from sqlalchemy import Column, String, DateTime, Text
+from sqlalchemy import (
+    DDL,
+    Column,
+    String,
+    DateTime,
+    Index,
+    Integer,
+    Text,
+    event,
+    literal_column,
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
-from models.base import Base
+from models.base import Base, utc_now
+from models.types import ulid_type
+
+# Text search configuration for the catalog's full-text index.
+SEARCH_CONFIG = "english"
+
+
+def search_document(title, author):
+    """
+    Full-text document over title and author (Postgres).
+
+    ix_books_search is built on exactly this expression; queries must use it
+    unchanged (no bind parameters) for the planner to match the index.
+    """
+    return func.to_tsvector(
+        literal_column(f"'{SEARCH_CONFIG}'"),
+        title.op("||")(literal_column("' '")).op("||")(author)
+    )
 
 
 class Book(Base):
@@ -12,11 +39,56 @@ class Book(Base):
 
     __tablename__ = "books"
 
-    id = Column(String(26), primary_key=True)
+    id = Column(ulid_type(), primary_key=True)
     title = Column(String(255), nullable=False)
     author = Column(String(255), nullable=False)
     isbn = Column(String(20), nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Denormalized from book_copies; maintained by BookCopyRepository and
+    # BorrowRepository in the same transaction as the copy change.
+    copy_count = Column(Integer, nullable=False, default=0, server_default="0")
+    available_count = Column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    # Keyset pagination key; filled in by the application (see utc_now).
+    created_at = Column(
+        DateTime(timezone=True), default=utc_now, server_default=func.now()
+    )
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Bumped by every catalog edit, for optimistic concurrency; the
+    # denormalized counts above change without bumping it.
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
+
+    __table_args__ = (
+        # ListBooks order (newest first, id as tie-breaker).
+        Index("ix_books_created_at_id", created_at.desc(), id.desc()),
+        # Available-copies listing order (title, id as tie-breaker).
+        Index("ix_books_title_id", title, id),
+        # SearchBooks exact ISBN lookups.
+        Index("ix_books_isbn", isbn),
+        # SearchBooks full-text and trigram (prefix / fuzzy title) matches.
+        Index(
+            "ix_books_search",
+            search_document(title, author),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_books_title_trgm",
+            func.lower(title).label("title_lower"),
+            postgresql_using="gin",
+            postgresql_ops={"title_lower": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
     copies = relationship("BookCopy", back_populates="book")
+
+
+# ix_books_title_trgm needs the pg_trgm operator classes.
+event.listen(
+    Book.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(
+        dialect="postgresql"
+    )
+)
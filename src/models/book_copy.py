@@ -1,10 +1,19 @@
 """BookCopy model - copy-level inventory."""
 
-from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    text,
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from models.base import Base
+from models.types import ulid_type
 
 
 class BookCopy(Base):
@@ -12,12 +21,35 @@ class BookCopy(Base):
 
     __tablename__ = "book_copies"
 
-    id = Column(String(26), primary_key=True)
-    book_id = Column(String(26), ForeignKey("books.id"), nullable=False, index=True)
+    id = Column(ulid_type(), primary_key=True)
+    book_id = Column(ulid_type(), ForeignKey("books.id"), nullable=False)
     copy_number = Column(String(50), nullable=False)
-    status = Column(String(20), nullable=False, default="available", index=True)
+    status = Column(String(20), nullable=False, default="available")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Bumped by every update, status changes included, for optimistic
+    # concurrency.
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
+
+    __table_args__ = (
+        # Copy numbers are unique per book; also serves book_id lookups.
+        Index(
+            "uq_book_copies_book_id_copy_number",
+            book_id,
+            copy_number,
+            unique=True,
+        ),
+        # Available copies per book in copy_number order.
+        Index(
+            "ix_book_copies_available_book_id_copy_number",
+            book_id,
+            copy_number,
+            postgresql_where=text("status = 'available'"),
+            sqlite_where=text("status = 'available'"),
+        ),
+    )
 
     book = relationship("Book", back_populates="copies")
     borrows = relationship("Borrow", back_populates="copy")
@@ -1,10 +1,11 @@
 """Borrow model - lending record."""
 
-from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
-from models.base import Base
+from models.base import Base, utc_now
+from models.types import ulid_type
 
 
 class Borrow(Base):
@@ -12,12 +13,43 @@ class Borrow(Base):
 
     __tablename__ = "borrows"
 
-    id = Column(String(26), primary_key=True)
-    copy_id = Column(String(26), ForeignKey("book_copies.id"), nullable=False, index=True)
-    member_id = Column(String(26), ForeignKey("members.id"), nullable=False, index=True)
-    borrowed_at = Column(DateTime(timezone=True), server_default=func.now())
+    id = Column(ulid_type(), primary_key=True)
+    copy_id = Column(ulid_type(), ForeignKey("book_copies.id"), nullable=False, index=True)
+    member_id = Column(ulid_type(), ForeignKey("members.id"), nullable=False, index=True)
+    # Keyset pagination key; filled in by the application (see utc_now).
+    borrowed_at = Column(
+        DateTime(timezone=True), default=utc_now, server_default=func.now()
+    )
     returned_at = Column(DateTime(timezone=True), nullable=True)
-    status = Column(String(20), nullable=False, default="active", index=True)
+    status = Column(String(20), nullable=False, default="active")
+
+    __table_args__ = (
+        # At most one active borrow per copy, enforced by the database.
+        Index(
+            "uq_borrows_active_copy_id",
+            copy_id,
+            unique=True,
+            postgresql_where=text("status = 'active'"),
+            sqlite_where=text("status = 'active'"),
+        ),
+        # All active borrows in listing (keyset) order.
+        Index(
+            "ix_borrows_active_borrowed_at",
+            borrowed_at.desc(),
+            id.desc(),
+            postgresql_where=text("status = 'active'"),
+            sqlite_where=text("status = 'active'"),
+        ),
+        # Active borrows per member in listing (keyset) order.
+        Index(
+            "ix_borrows_active_member_borrowed_at",
+            member_id,
+            borrowed_at.desc(),
+            id.desc(),
+            postgresql_where=text("status = 'active'"),
+            sqlite_where=text("status = 'active'"),
+        ),
+    )
 
     copy = relationship("BookCopy", back_populates="borrows")
     member = relationship("Member", back_populates="borrows")
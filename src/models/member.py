@@ -1,10 +1,11 @@
 """Member model."""
 
-from sqlalchemy import Column, String, DateTime
+from sqlalchemy import Column, String, DateTime, Index, Integer
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
-from models.base import Base
+from models.base import Base, utc_now
+from models.types import ulid_type
 
 
 class Member(Base):
@@ -12,10 +13,22 @@ class Member(Base):
 
     __tablename__ = "members"
 
-    id = Column(String(26), primary_key=True)
+    id = Column(ulid_type(), primary_key=True)
     name = Column(String(255), nullable=False)
     email = Column(String(255), nullable=False, unique=True, index=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Keyset pagination key; filled in by the application (see utc_now).
+    created_at = Column(
+        DateTime(timezone=True), default=utc_now, server_default=func.now()
+    )
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Bumped by every update, for optimistic concurrency.
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
+
+    __table_args__ = (
+        # ListMembers order (newest first, id as tie-breaker).
+        Index("ix_members_created_at_id", created_at.desc(), id.desc()),
+    )
 
     borrows = relationship("Borrow", back_populates="member")
@@ -4,6 +4,7 @@ from sqlalchemy import Column, String, DateTime
 from sqlalchemy.sql import func
 
 from models.base import Base
+from models.types import ulid_type
 
 
 class StaffUser(Base):
@@ -11,7 +12,7 @@ class StaffUser(Base):
 
     __tablename__ = "staff_users"
 
-    id = Column(String(26), primary_key=True)
+    id = Column(ulid_type(), primary_key=True)
     username = Column(String(100), nullable=False, unique=True, index=True)
     password_hash = Column(String(255), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,46 @@
+"""Column types shared by the models."""
+
+from sqlalchemy import LargeBinary, String
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.types import TypeDecorator, TypeEngine
+
+from config import ULID_STORAGE
+from util.ulid_util import is_valid_ulid, ulid_from_bytes, ulid_to_bytes
+
+
+class BinaryULID(TypeDecorator):
+    """
+    ULID stored in 16 bytes: uuid on Postgres, a 16-byte blob elsewhere.
+
+    Python values stay 26-character ULID strings, the form protos, page
+    cursors and cache keys use; the conversion happens when binding and
+    reading. A malformed string binds as NULL, so it matches no row.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(postgresql.UUID(as_uuid=False))
+        return dialect.type_descriptor(LargeBinary(16))
+
+    def process_bind_param(self, value, dialect):
+        if value is None or not is_valid_ulid(value):
+            return None
+        data = ulid_to_bytes(value)
+        return data.hex() if dialect.name == "postgresql" else data
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if dialect.name == "postgresql":
+            return ulid_from_bytes(bytes.fromhex(value.replace("-", "")))
+        return ulid_from_bytes(value)
+
+
+def ulid_type() -> TypeEngine:
+    """Column type for ULID keys under the configured ULID_STORAGE."""
+    if ULID_STORAGE == "binary":
+        return BinaryULID()
+    return String(26)
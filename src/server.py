@@ -1,47 +1,123 @@
 """
 gRPC server for Library Management.
 """
+import asyncio
 import logging
+import multiprocessing
+import os
 import signal
+import socket
 import sys
+import time
 from pathlib import Path
 
 import grpc
 from concurrent import futures
+from grpc_health.v1 import health, health_pb2, health_pb2_grpc
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 sys.path.insert(0, str(Path(__file__).resolve().parent / "generated"))
 
-from config import SERVER_PORT
-from app.library.grpc_handlers import LibraryServiceHandler
+from config import (
+    DATABASE_URL,
+    GRPC_MAX_CONCURRENT_RPCS,
+    GRPC_MAX_WORKERS,
+    JWT_SECRET,
+    METRICS_PORT,
+    SERVER_MODE,
+    SERVER_PORT,
+    SERVER_PROCESSES,
+    SERVER_SHUTDOWN_GRACE_SECONDS,
+    WORKER_MAX_RESTARTS,
+    WORKER_READY_TIMEOUT_SECONDS,
+    WORKER_RESTART_BACKOFF_MAX_SECONDS,
+    WORKER_RESTART_BACKOFF_SECONDS,
+)
+from app.auth.interceptor import AsyncAuthInterceptor, AuthInterceptor
+from app.library.interceptor import (
+    AsyncMetricsInterceptor,
+    AsyncSessionInterceptor,
+    MetricsInterceptor,
+    SessionInterceptor,
+)
+from app.library.catalog_cache import start_invalidation_listener
+from app.library.grpc_handlers import (
+    AsyncLibraryServiceHandler,
+    LibraryServiceHandler,
+)
 from proto import library_service_pb2_grpc
+from util import database
+from util.metrics import start_metrics_server
 
 logging.basicConfig(
     level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    format="%(asctime)s - %(process)d - %(name)s - %(levelname)s - %(message)s",
     stream=sys.stdout
 )
 logger = logging.getLogger(__name__)
 
+SERVICE_NAME = "library.LibraryService"
+# How often the prefork parent checks that its workers are alive.
+WORKER_CHECK_INTERVAL_SECONDS = 1.0
+
 server = None
 
 
 def serve():
-    """Start the gRPC server."""
+    """Start the gRPC server in the configured SERVER_MODE and SERVER_PROCESSES."""
+    if SERVER_PROCESSES > 1:
+        serve_prefork(SERVER_PROCESSES)
+        return
+    start_metrics_server(METRICS_PORT)
+    if SERVER_MODE == "async":
+        asyncio.run(serve_async())
+    else:
+        serve_sync()
+
+
+def serve_sync(options: list[tuple] | None = None, on_ready=None):
+    """
+    Start the thread pool gRPC server and block until shutdown.
+
+    on_ready is called once the server is serving.
+    """
     global server
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+    database.check_pool_capacity(GRPC_MAX_WORKERS)
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=GRPC_MAX_WORKERS),
+        interceptors=[
+            MetricsInterceptor(),
+            AuthInterceptor(JWT_SECRET),
+            SessionInterceptor(),
+        ],
+        options=options,
+        maximum_concurrent_rpcs=GRPC_MAX_CONCURRENT_RPCS or None
+    )
     library_service_pb2_grpc.add_LibraryServiceServicer_to_server(
         LibraryServiceHandler(),
         server
     )
+    health_servicer = health.HealthServicer()
+    health_pb2_grpc.add_HealthServicer_to_server(health_servicer, server)
     server.add_insecure_port(f"[::]:{SERVER_PORT}")
     server.start()
-    logger.info("gRPC server started on port %s", SERVER_PORT)
+    start_invalidation_listener(DATABASE_URL)
+    _set_serving(health_servicer, health_pb2.HealthCheckResponse.SERVING)
+    if on_ready is not None:
+        on_ready()
+    logger.info(
+        "gRPC server started on port %s with %s workers",
+        SERVER_PORT,
+        GRPC_MAX_WORKERS
+    )
 
     def shutdown(signum, frame):
         logger.info("Shutting down server...")
+        _set_serving(
+            health_servicer, health_pb2.HealthCheckResponse.NOT_SERVING
+        )
         if server:
-            server.stop(0)
+            server.stop(SERVER_SHUTDOWN_GRACE_SECONDS).wait()
         sys.exit(0)
 
     signal.signal(signal.SIGINT, shutdown)
@@ -49,5 +125,212 @@ def serve():
     server.wait_for_termination()
 
 
+async def serve_async(options: list[tuple] | None = None, on_ready=None):
+    """
+    Start the grpc.aio server backed by AsyncSession.
+
+    on_ready is called once the server is serving.
+    """
+    global server
+    database.check_async_pool_capacity(GRPC_MAX_CONCURRENT_RPCS)
+    server = grpc.aio.server(
+        interceptors=[
+            AsyncMetricsInterceptor(),
+            AsyncAuthInterceptor(JWT_SECRET),
+            AsyncSessionInterceptor(),
+        ],
+        options=options,
+        maximum_concurrent_rpcs=GRPC_MAX_CONCURRENT_RPCS or None
+    )
+    library_service_pb2_grpc.add_LibraryServiceServicer_to_server(
+        AsyncLibraryServiceHandler(),
+        server
+    )
+    health_servicer = health.aio.HealthServicer()
+    health_pb2_grpc.add_HealthServicer_to_server(health_servicer, server)
+    server.add_insecure_port(f"[::]:{SERVER_PORT}")
+    await server.start()
+    start_invalidation_listener(DATABASE_URL)
+    await _set_serving_async(
+        health_servicer, health_pb2.HealthCheckResponse.SERVING
+    )
+    if on_ready is not None:
+        on_ready()
+    logger.info("gRPC aio server started on port %s", SERVER_PORT)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+    await stop.wait()
+    logger.info("Shutting down server...")
+    await _set_serving_async(
+        health_servicer, health_pb2.HealthCheckResponse.NOT_SERVING
+    )
+    await server.stop(SERVER_SHUTDOWN_GRACE_SECONDS)
+    if database.async_engine is not None:
+        await database.async_engine.dispose()
+
+
+def serve_prefork(processes: int):
+    """
+    Run worker servers that share SERVER_PORT through SO_REUSEPORT.
+
+    The parent never creates gRPC objects or database connections. Each
+    worker signals readiness once it is serving; per-worker health checks
+    cannot be addressed through the shared port. The parent restarts
+    workers that die or are not ready within WORKER_READY_TIMEOUT_SECONDS,
+    with exponential backoff, and gives up with exit status 1 after
+    WORKER_MAX_RESTARTS consecutive failures of one worker. On shutdown it
+    forwards SIGTERM to all workers, killing any that outlive the grace
+    period.
+    """
+    if not hasattr(socket, "SO_REUSEPORT"):
+        raise RuntimeError("SO_REUSEPORT is not supported on this platform")
+    ctx = multiprocessing.get_context("fork")
+    workers = [_WorkerSlot(index) for index in range(processes)]
+    for worker in workers:
+        worker.start(ctx)
+    stopping = False
+    failed = False
+
+    def shutdown(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+    logger.info(
+        "Prefork server on port %s with %s %s workers",
+        SERVER_PORT,
+        processes,
+        SERVER_MODE
+    )
+
+    while not stopping and not failed:
+        for worker in workers:
+            if stopping:
+                break
+            failed = not worker.supervise(ctx)
+            if failed:
+                break
+        time.sleep(WORKER_CHECK_INTERVAL_SECONDS)
+
+    logger.info("Shutting down %s workers...", len(workers))
+    processes_left = [w.process for w in workers if w.process is not None]
+    for process in processes_left:
+        if process.is_alive():
+            os.kill(process.pid, signal.SIGTERM)
+    deadline = time.monotonic() + SERVER_SHUTDOWN_GRACE_SECONDS + 5
+    for process in processes_left:
+        process.join(max(0.0, deadline - time.monotonic()))
+        if process.is_alive():
+            logger.warning("Worker pid %s did not stop; killing", process.pid)
+            process.kill()
+            process.join()
+    if failed:
+        sys.exit(1)
+
+
+class _WorkerSlot:
+    """One prefork worker position: its process, readiness and failures."""
+
+    def __init__(self, index: int):
+        """Initialize an empty slot; start forks the worker."""
+        self.index = index
+        self.process = None
+        self.ready = None
+        self.started_at = 0.0
+        # Consecutive failures; reset once a worker becomes ready.
+        self.failures = 0
+        self.restart_at = 0.0
+
+    def start(self, ctx) -> None:
+        """Fork the worker with a fresh readiness event."""
+        self.ready = ctx.Event()
+        self.process = ctx.Process(
+            target=_run_worker,
+            args=(self.index, self.ready),
+            name=f"library-grpc-worker-{self.index}"
+        )
+        self.process.start()
+        self.started_at = time.monotonic()
+
+    def supervise(self, ctx) -> bool:
+        """
+        Check the worker once, scheduling or performing a restart.
+
+        Returns False when the worker has failed more than
+        WORKER_MAX_RESTARTS times in a row.
+        """
+        now = time.monotonic()
+        if self.process is None:
+            if now >= self.restart_at:
+                self.start(ctx)
+            return True
+        if self.ready.is_set():
+            self.failures = 0
+            if self.process.is_alive():
+                return True
+            problem = f"exited with code {self.process.exitcode}"
+        elif not self.process.is_alive():
+            problem = (
+                f"exited with code {self.process.exitcode} before serving"
+            )
+        elif now - self.started_at > WORKER_READY_TIMEOUT_SECONDS:
+            self.process.kill()
+            self.process.join()
+            problem = f"not serving after {WORKER_READY_TIMEOUT_SECONDS}s"
+        else:
+            return True
+        pid, self.process = self.process.pid, None
+        self.failures += 1
+        if self.failures > WORKER_MAX_RESTARTS:
+            logger.error(
+                "Worker %s (pid %s) %s; %s consecutive failures, giving up",
+                self.index, pid, problem, self.failures
+            )
+            return False
+        delay = min(
+            WORKER_RESTART_BACKOFF_SECONDS * 2 ** (self.failures - 1),
+            WORKER_RESTART_BACKOFF_MAX_SECONDS
+        )
+        logger.warning(
+            "Worker %s (pid %s) %s; restarting in %.1fs",
+            self.index, pid, problem, delay
+        )
+        self.restart_at = now + delay
+        return True
+
+
+def _run_worker(index: int, ready):
+    """
+    Prefork worker entry point: fresh DB pool, then serve with SO_REUSEPORT.
+
+    Sets the ready event once the server is serving.
+    """
+    database.init_engine()
+    if METRICS_PORT:
+        start_metrics_server(METRICS_PORT + index)
+    logger.info("Worker %s started", index)
+    options = [("grpc.so_reuseport", 1)]
+    if SERVER_MODE == "async":
+        asyncio.run(serve_async(options, ready.set))
+    else:
+        serve_sync(options, ready.set)
+
+
+def _set_serving(health_servicer, status):
+    """Set overall and LibraryService health status."""
+    health_servicer.set("", status)
+    health_servicer.set(SERVICE_NAME, status)
+
+
+async def _set_serving_async(health_servicer, status):
+    """Set overall and LibraryService health status on the aio servicer."""
+    await health_servicer.set("", status)
+    await health_servicer.set(SERVICE_NAME, status)
+
+
 if __name__ == "__main__":
     serve()
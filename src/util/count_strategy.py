@@ -0,0 +1,208 @@
+"""
+Count strategies for paginated list totals.
+
+Exact runs SELECT count(*). Cached serves a count from an in-process TTL
+cache that is invalidated when a transaction that wrote to the counted
+table through the ORM commits.
+Estimated uses Postgres planner statistics (pg_class.reltuples for whole
+tables, EXPLAIN row estimates for filtered queries) and falls back to an
+exact count on other databases.
+"""
+import threading
+import time
+from collections import OrderedDict
+from itertools import chain
+
+from sqlalchemy import event
+from sqlalchemy.orm import Query, Session
+
+from config import COUNT_CACHE_MAX_ENTRIES, COUNT_CACHE_TTL_SECONDS
+
+COUNT_EXACT = "exact"
+COUNT_CACHED = "cached"
+COUNT_ESTIMATED = "estimated"
+
+# session.info key holding the tables written by the open transaction.
+_CHANGED_TABLES = "count_cache_changed_tables"
+
+
+class CountCache:
+    """Thread-safe bounded TTL cache of counts keyed by (table, *filters)."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        """Initialize with entry lifetime and maximum number of entries."""
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, tuple[int, float]] = OrderedDict()
+        # Per-table invalidation generations, so a count taken before an
+        # invalidation is not stored after it.
+        self._generations: dict[str, int] = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> int | None:
+        """Return cached count for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def generation(self, table: str) -> tuple[int, int]:
+        """Invalidation generation of a table; read it before counting."""
+        with self._lock:
+            return self._epoch, self._generations.get(table, 0)
+
+    def set(
+        self,
+        key: tuple,
+        value: int,
+        generation: tuple[int, int] | None = None
+    ) -> None:
+        """
+        Store a count, evicting the oldest entry when full.
+
+        With generation, only if the table has not been invalidated since
+        that generation was read.
+        """
+        with self._lock:
+            if generation is not None and generation != (
+                self._epoch, self._generations.get(key[0], 0)
+            ):
+                return
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, table: str) -> None:
+        """Drop every cached count for a table."""
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == table]:
+                del self._entries[key]
+            self._generations[table] = self._generations.get(table, 0) + 1
+
+    def clear(self) -> None:
+        """Drop all cached counts."""
+        with self._lock:
+            self._entries.clear()
+            self._epoch += 1
+
+
+count_cache = CountCache(COUNT_CACHE_TTL_SECONDS, COUNT_CACHE_MAX_ENTRIES)
+
+
+def count_rows(
+    session: Session,
+    query: Query,
+    cache_key: tuple,
+    mode: str = COUNT_EXACT
+) -> tuple[int, bool]:
+    """
+    Count rows matched by query using the requested strategy.
+
+    Args:
+        session: Database session.
+        query: Query whose rows are counted.
+        cache_key: Tuple identifying the count; first element is the table name.
+        mode: COUNT_EXACT, COUNT_CACHED or COUNT_ESTIMATED.
+
+    Returns:
+        (count, is_exact). is_exact is False for cache hits and estimates.
+        Cached mode serves cache hits on any session but only fills the
+        cache from primary sessions.
+    """
+    if mode == COUNT_CACHED:
+        cached = count_cache.get(cache_key)
+        if cached is not None:
+            return cached, False
+        generation = count_cache.generation(cache_key[0])
+        total = query.count()
+        if (
+            not session.info.get("replica")
+            and cache_key[0] not in session.info.get(_CHANGED_TABLES, ())
+        ):
+            # Neither a count from a replica, which may lag a commit whose
+            # invalidation already ran, nor one that includes the session's
+            # uncommitted writes is cached.
+            count_cache.set(cache_key, total, generation)
+        return total, True
+    if mode == COUNT_ESTIMATED:
+        estimate = _estimate_count(session, query, cache_key[0])
+        if estimate is not None:
+            return estimate, False
+    return query.count(), True
+
+
+def _estimate_count(session: Session, query: Query, table: str) -> int | None:
+    """Planner row estimate on Postgres; None when unavailable."""
+    connection = session.connection()
+    if connection.dialect.name != "postgresql":
+        return None
+    if query.whereclause is None:
+        rows = connection.exec_driver_sql(
+            "SELECT reltuples::bigint FROM pg_class "
+            "WHERE oid = to_regclass(%(table)s)",
+            {"table": table}
+        ).scalar()
+    else:
+        sql = str(query.statement.compile(
+            dialect=connection.dialect,
+            compile_kwargs={"literal_binds": True}
+        ))
+        plan = connection.exec_driver_sql(
+            "EXPLAIN (FORMAT JSON) " + sql
+        ).scalar()
+        rows = plan[0]["Plan"]["Plan Rows"]
+    # reltuples is -1 for tables that have never been analyzed.
+    if rows is None or rows < 0:
+        return None
+    return int(rows)
+
+
+def record_table_write(session: Session, table: str) -> None:
+    """
+    Mark table as written by the session's open transaction.
+
+    For statements the ORM hooks below do not see; the table's counts are
+    invalidated when the session commits.
+    """
+    session.info.setdefault(_CHANGED_TABLES, set()).add(table)
+
+
+@event.listens_for(Session, "after_flush")
+def _record_flushed_tables(session, flush_context):
+    """Remember tables touched by an ORM flush."""
+    for obj in chain(session.new, session.dirty, session.deleted):
+        record_table_write(session, obj.__table__.name)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _record_bulk_dml_tables(orm_execute_state):
+    """Remember tables targeted by ORM-enabled insert/update/delete."""
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        record_table_write(
+            orm_execute_state.session,
+            orm_execute_state.statement.table.name
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_tables(session):
+    """Invalidate counts for tables written by the committed transaction."""
+    for table in session.info.pop(_CHANGED_TABLES, ()):
+        count_cache.invalidate(table)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_tables(session):
+    """Rolled-back writes leave the cached counts valid."""
+    session.info.pop(_CHANGED_TABLES, None)
@@ -0,0 +1,88 @@
+"""
+Opaque page token encoding for keyset (cursor) pagination.
+"""
+import base64
+import math
+from datetime import datetime
+
+from util.ulid_util import is_valid_ulid
+
+_SEPARATOR = "|"
+
+
+def encode_page_token(timestamp: datetime, row_id: str) -> str:
+    """
+    Encode the sort key of the last row on a page as a page token.
+
+    Args:
+        timestamp: Sort timestamp of the last row (e.g. created_at).
+        row_id: ULID of the last row, used as tie-breaker.
+
+    Returns:
+        URL-safe opaque token string.
+    """
+    raw = f"{timestamp.isoformat()}{_SEPARATOR}{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_page_token(token: str) -> tuple[datetime, str] | None:
+    """
+    Decode a page token produced by encode_page_token.
+
+    Args:
+        token: Token string from a client request.
+
+    Returns:
+        (timestamp, row_id) tuple, or None if the token is malformed.
+    """
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        timestamp_str, row_id = raw.split(_SEPARATOR, 1)
+        timestamp = datetime.fromisoformat(timestamp_str)
+    except ValueError:
+        return None
+    if not is_valid_ulid(row_id):
+        return None
+    return timestamp, row_id
+
+
+def encode_rank_token(rank: float, row_id: str) -> str:
+    """
+    Encode the (rank, id) sort key of the last search result as a page token.
+
+    Args:
+        rank: Relevance score of the last row; repr round-trips exactly.
+        row_id: ULID of the last row, used as tie-breaker.
+
+    Returns:
+        URL-safe opaque token string.
+    """
+    raw = f"{rank!r}{_SEPARATOR}{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_rank_token(token: str) -> tuple[float, str] | None:
+    """
+    Decode a page token produced by encode_rank_token.
+
+    Args:
+        token: Token string from a client request.
+
+    Returns:
+        (rank, row_id) tuple, or None if the token is malformed.
+    """
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        rank_str, row_id = raw.split(_SEPARATOR, 1)
+        rank = float(rank_str)
+    except ValueError:
+        return None
+    if not is_valid_ulid(row_id) or not math.isfinite(rank):
+        return None
+    return rank, row_id
@@ -1,19 +1,247 @@
 """
 Database session management for SQLAlchemy.
 """
-from sqlalchemy import create_engine
+import itertools
+import logging
+import threading
+import time
+
+from sqlalchemy import Engine, create_engine, event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
-from config import DATABASE_URL
+from config import (
+    ASYNC_DATABASE_URL,
+    DATABASE_REPLICA_RETRY_SECONDS,
+    DATABASE_REPLICA_SELECTION,
+    DATABASE_REPLICA_URLS,
+    DATABASE_URL,
+    DB_MAX_OVERFLOW,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_STATEMENT_TIMEOUT_MS,
+)
 from models.base import Base
+from util.metrics import (
+    DB_READ_SESSIONS,
+    POOL_CHECKOUT_TIMEOUTS,
+    POOL_CHECKOUT_WAIT_SECONDS,
+)
 
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,
-    echo=False,
+logger = logging.getLogger(__name__)
+
+# Smoothing factor for the per-replica statement latency average.
+_LATENCY_ALPHA = 0.2
+# least_latency sends every Nth read round-robin so slow replicas are
+# re-measured once they recover.
+_EXPLORE_EVERY = 10
+
+
+class _TimedCheckoutMixin:
+    """Records how long each pool checkout waits for a connection."""
+
+    def _do_get(self):
+        label = self._orig_logging_name or "default"
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            POOL_CHECKOUT_TIMEOUTS.labels(pool=label).inc()
+            raise
+        finally:
+            POOL_CHECKOUT_WAIT_SECONDS.labels(pool=label).observe(
+                time.perf_counter() - start
+            )
+
+
+class TimedQueuePool(_TimedCheckoutMixin, QueuePool):
+    """QueuePool that exports checkout wait time metrics."""
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that exports checkout wait time metrics."""
+
+
+def engine_options(url: str, name: str, is_async: bool = False) -> dict:
+    """
+    Pool and connection options for an engine on url.
+
+    In-memory SQLite keeps SQLAlchemy's default single-connection pool.
+    statement_timeout is only applied on Postgres.
+    """
+    parsed = make_url(url)
+    options = {"pool_pre_ping": True, "echo": False}
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (
+        None, "", ":memory:"
+    ):
+        return options
+    options.update(
+        poolclass=TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_logging_name=name,
+    )
+    if parsed.get_backend_name() == "postgresql" and DB_STATEMENT_TIMEOUT_MS:
+        if parsed.get_driver_name() == "asyncpg":
+            options["connect_args"] = {"server_settings": {
+                "statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)
+            }}
+        else:
+            options["connect_args"] = {
+                "options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"
+            }
+    return options
+
+
+class ReplicaRouter:
+    """
+    Chooses a read replica per session.
+
+    "round_robin" rotates through healthy replicas. "least_latency" picks
+    the replica with the lowest moving average statement time, sending
+    every _EXPLORE_EVERY-th read round-robin to keep the averages fresh.
+    A replica is skipped for retry_seconds after a connection error;
+    choose returns None when every replica is down.
+    """
+
+    def __init__(
+        self,
+        engines: list[Engine],
+        selection: str = "round_robin",
+        retry_seconds: float = 30.0
+    ):
+        """Instrument the (sync) replica engines."""
+        self.engines = engines
+        self.selection = selection
+        self.retry_seconds = retry_seconds
+        self._latency: list[float | None] = [None] * len(engines)
+        self._down_until = [0.0] * len(engines)
+        self._turns = itertools.count()
+        self._lock = threading.Lock()
+        for index, engine in enumerate(engines):
+            self._instrument(index, engine)
+
+    def choose(self) -> int | None:
+        """Index of the replica for the next read session, or None."""
+        now = time.monotonic()
+        with self._lock:
+            healthy = [
+                i for i, until in enumerate(self._down_until) if until <= now
+            ]
+            if not healthy:
+                return None
+            turn = next(self._turns)
+            if self.selection == "least_latency" and turn % _EXPLORE_EVERY:
+                # Unmeasured replicas sort first so they get measured.
+                return min(healthy, key=lambda i: self._latency[i] or 0.0)
+            return healthy[turn % len(healthy)]
+
+    def record_latency(self, index: int, seconds: float) -> None:
+        """Fold one statement's duration into the replica's average."""
+        with self._lock:
+            average = self._latency[index]
+            self._latency[index] = seconds if average is None else (
+                average + _LATENCY_ALPHA * (seconds - average)
+            )
+
+    def mark_down(self, index: int) -> None:
+        """Skip the replica for retry_seconds."""
+        with self._lock:
+            self._down_until[index] = time.monotonic() + self.retry_seconds
+
+    def _instrument(self, index: int, engine: Engine) -> None:
+        @event.listens_for(engine, "before_cursor_execute")
+        def _start(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("replica_query_start", []).append(
+                time.perf_counter()
+            )
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _end(conn, cursor, statement, parameters, context, executemany):
+            started = conn.info["replica_query_start"].pop()
+            self.record_latency(index, time.perf_counter() - started)
+
+        @event.listens_for(engine, "handle_error")
+        def _error(context):
+            if context.connection is not None:
+                context.connection.info.pop("replica_query_start", None)
+            if context.is_disconnect or context.connection is None:
+                self.mark_down(index)
+
+
+def check_pool_capacity(concurrency: int) -> None:
+    """
+    Ensure the pool can hand every concurrent worker a connection.
+
+    Raises ValueError when pool_size + max_overflow is below concurrency.
+    Pools with unlimited overflow (max_overflow < 0) always pass.
+    """
+    if DB_MAX_OVERFLOW < 0:
+        return
+    capacity = DB_POOL_SIZE + DB_MAX_OVERFLOW
+    if capacity < concurrency:
+        raise ValueError(
+            f"DB pool capacity {capacity} (DB_POOL_SIZE={DB_POOL_SIZE} + "
+            f"DB_MAX_OVERFLOW={DB_MAX_OVERFLOW}) is below the "
+            f"{concurrency} RPCs the server handles concurrently"
+        )
+
+
+def check_async_pool_capacity(max_concurrent_rpcs: int) -> None:
+    """
+    check_pool_capacity for the grpc.aio server.
+
+    Every in-flight RPC can hold an AsyncSession, so the pool must cover
+    max_concurrent_rpcs. With no cap (0) concurrency is unbounded and the
+    pool can be exhausted; that is logged as a warning.
+    """
+    if max_concurrent_rpcs <= 0:
+        logger.warning(
+            "GRPC_MAX_CONCURRENT_RPCS is unset: async server concurrency is "
+            "unbounded against a pool of %s connections; set it to at most "
+            "DB_POOL_SIZE + DB_MAX_OVERFLOW",
+            "unlimited" if DB_MAX_OVERFLOW < 0
+            else DB_POOL_SIZE + DB_MAX_OVERFLOW
+        )
+        return
+    check_pool_capacity(max_concurrent_rpcs)
+
+
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL, "primary"))
+
+# Objects stay loaded after commit, so writes need no refresh SELECT: the
+# flush already brings back server defaults such as created_at with
+# INSERT ... RETURNING (the mappers' default eager_defaults="auto").
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Created on first use so the sync server does not need the async drivers.
+async_engine: AsyncEngine | None = None
+AsyncSessionLocal: async_sessionmaker[AsyncSession] | None = None
+
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+# Read replicas; None when DATABASE_REPLICA_URLS is empty.
+replica_router: ReplicaRouter | None = None
+ReplicaSessions: list[sessionmaker] = []
+async_replica_router: ReplicaRouter | None = None
+AsyncReplicaSessions: list[async_sessionmaker[AsyncSession]] = []
 
 
 def get_session() -> Session:
@@ -21,6 +249,132 @@ def get_session() -> Session:
     return SessionLocal()
 
 
+def get_read_session(consistent: bool = False) -> Session:
+    """
+    Get a session for a read-only request.
+
+    Routed to a replica, so it may lag the primary; sessions on a replica
+    have info["replica"] set. consistent=True, no configured replicas or
+    no healthy replica all give a primary session.
+    """
+    if not consistent and replica_router is not None:
+        index = replica_router.choose()
+        if index is not None:
+            DB_READ_SESSIONS.labels(target=f"replica{index}").inc()
+            return ReplicaSessions[index]()
+    DB_READ_SESSIONS.labels(target="primary").inc()
+    return SessionLocal()
+
+
+def init_replicas(urls: list[str] | None = None) -> None:
+    """
+    Build (or rebuild after fork) the replica engines and router.
+
+    Inherited replica pools are dropped without closing the parent's
+    connections.
+    """
+    global replica_router, ReplicaSessions
+    urls = DATABASE_REPLICA_URLS if urls is None else urls
+    if replica_router is not None:
+        for replica in replica_router.engines:
+            replica.dispose(close=False)
+    engines = [
+        create_engine(url, **engine_options(url, f"replica{index}"))
+        for index, url in enumerate(urls)
+    ]
+    replica_router = ReplicaRouter(
+        engines, DATABASE_REPLICA_SELECTION, DATABASE_REPLICA_RETRY_SECONDS
+    ) if engines else None
+    ReplicaSessions = [
+        sessionmaker(
+            autocommit=False,
+            autoflush=False,
+            bind=replica,
+            info={"replica": True}
+        )
+        for replica in engines
+    ]
+
+
+init_replicas()
+
+
+def init_engine(url: str | None = None) -> None:
+    """
+    Replace the sync engine and session factory, and the replicas'.
+
+    Used by prefork workers after fork: the inherited pool is dropped
+    without closing the parent's connections, then a fresh one is built.
+    """
+    global engine, SessionLocal
+    url = url or DATABASE_URL
+    engine.dispose(close=False)
+    engine = create_engine(url, **engine_options(url, "primary"))
+    SessionLocal = sessionmaker(
+        autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+    )
+    init_replicas()
+
+
+def to_async_url(url: str) -> str:
+    """Map a sync database URL to its asyncio driver (asyncpg, aiosqlite)."""
+    scheme, sep, rest = url.partition("://")
+    return _ASYNC_DRIVERS.get(scheme, scheme) + sep + rest
+
+
+def init_async_engine(url: str | None = None) -> AsyncEngine:
+    """Create the async engine and session factory, and the replicas'."""
+    global async_engine, AsyncSessionLocal
+    global async_replica_router, AsyncReplicaSessions
+    url = url or ASYNC_DATABASE_URL or to_async_url(DATABASE_URL)
+    async_engine = create_async_engine(
+        url, **engine_options(url, "async", is_async=True)
+    )
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+    replicas = [
+        create_async_engine(
+            to_async_url(replica_url),
+            **engine_options(
+                to_async_url(replica_url), f"async_replica{index}",
+                is_async=True
+            )
+        )
+        for index, replica_url in enumerate(DATABASE_REPLICA_URLS)
+    ]
+    async_replica_router = ReplicaRouter(
+        [replica.sync_engine for replica in replicas],
+        DATABASE_REPLICA_SELECTION,
+        DATABASE_REPLICA_RETRY_SECONDS
+    ) if replicas else None
+    AsyncReplicaSessions = [
+        async_sessionmaker(replica, autoflush=False, info={"replica": True})
+        for replica in replicas
+    ]
+    return async_engine
+
+
+def get_async_session() -> AsyncSession:
+    """Get a new async database session."""
+    if AsyncSessionLocal is None:
+        init_async_engine()
+    return AsyncSessionLocal()
+
+
+def get_async_read_session(consistent: bool = False) -> AsyncSession:
+    """Async counterpart of get_read_session."""
+    if AsyncSessionLocal is None:
+        init_async_engine()
+    if not consistent and async_replica_router is not None:
+        index = async_replica_router.choose()
+        if index is not None:
+            DB_READ_SESSIONS.labels(target=f"replica{index}").inc()
+            return AsyncReplicaSessions[index]()
+    DB_READ_SESSIONS.labels(target="primary").inc()
+    return AsyncSessionLocal()
+
+
 def init_db():
     """Create all tables (for development; use Alembic in production)."""
     Base.metadata.create_all(bind=engine)
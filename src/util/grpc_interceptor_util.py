@@ -0,0 +1,24 @@
+"""
+Helpers for server interceptors that wrap a gRPC method handler's behavior.
+"""
+import grpc
+
+
+def handler_factory(handler):
+    """Return (behavior, grpc handler factory) for the handler's rpc kind."""
+    if handler.unary_unary:
+        return handler.unary_unary, grpc.unary_unary_rpc_method_handler
+    if handler.unary_stream:
+        return handler.unary_stream, grpc.unary_stream_rpc_method_handler
+    if handler.stream_unary:
+        return handler.stream_unary, grpc.stream_unary_rpc_method_handler
+    return handler.stream_stream, grpc.stream_stream_rpc_method_handler
+
+
+def rewrap(handler, behavior, factory):
+    """Build a method handler like handler around a new behavior."""
+    return factory(
+        behavior,
+        request_deserializer=handler.request_deserializer,
+        response_serializer=handler.response_serializer
+    )
@@ -0,0 +1,87 @@
+"""
+Prometheus metrics shared across the server.
+"""
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
+
+# Latency buckets in seconds shared by the RPC and database histograms.
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+POOL_CHECKOUT_WAIT_SECONDS = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the SQLAlchemy pool.",
+    ["pool"],
+    buckets=LATENCY_BUCKETS,
+)
+POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts",
+    "Pool checkouts that gave up after pool_timeout.",
+    ["pool"],
+)
+DB_READ_SESSIONS = Counter(
+    "db_read_sessions",
+    "Read-only sessions by target (primary or replicaN).",
+    ["target"],
+)
+AUTH_TOKEN_CACHE_LOOKUPS = Counter(
+    "auth_token_cache_lookups",
+    "Verified-token cache lookups by result (hit or miss).",
+    ["result"],
+)
+CATALOG_CACHE_LOOKUPS = Counter(
+    "catalog_cache_lookups",
+    "Book/member snapshot cache lookups by kind and result (hit or miss).",
+    ["kind", "result"],
+)
+CATALOG_CACHE_INVALIDATIONS = Counter(
+    "catalog_cache_invalidations",
+    "Snapshot cache invalidations by source (local commit or notify).",
+    ["source"],
+)
+RPC_DB_SECONDS = Histogram(
+    "rpc_db_seconds",
+    "Time an RPC spent executing database statements, per method.",
+    ["method"],
+    buckets=LATENCY_BUCKETS,
+)
+RPC_DB_QUERIES = Histogram(
+    "rpc_db_queries",
+    "Database statements executed by an RPC, per method.",
+    ["method"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144),
+)
+RPC_LATENCY_SECONDS = Histogram(
+    "rpc_latency_seconds",
+    "Server-side RPC latency, per method.",
+    ["method"],
+    buckets=LATENCY_BUCKETS,
+)
+RPC_RESPONSES = Counter(
+    "rpc_responses",
+    "Completed RPCs by method and gRPC status code.",
+    ["method", "code"],
+)
+RPC_IN_FLIGHT = Gauge(
+    "rpc_in_flight",
+    "RPCs currently being served, per method.",
+    ["method"],
+)
+RPC_LAZY_LOADS = Counter(
+    "rpc_lazy_loads",
+    "Relationships lazily loaded while serving an RPC, per method.",
+    ["method"],
+)
+DB_QUERY_SECONDS = Histogram(
+    "db_query_seconds",
+    "Database statement execution time by operation.",
+    ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+
+
+def start_metrics_server(port: int) -> None:
+    """Serve all metrics at /metrics on port (0 disables)."""
+    if port:
+        start_http_server(port)
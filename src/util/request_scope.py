@@ -0,0 +1,298 @@
+"""
+Request-scoped database sessions with per-RPC query accounting.
+
+An RPC runs inside rpc_scope (async_rpc_scope on the grpc.aio server). Its
+session, or AsyncSession, is opened on first use, so a call rejected before
+touching the database never checks out a connection. The session is rolled
+back if the RPC raises and closed when the RPC ends.
+
+Every statement executed on any engine is timed into db_query_seconds.
+Statements executed while a scope is active are also counted and summed for
+its RPC, and the totals are exported per method.
+
+The scope also guards against N+1 queries. A relationship lazily loaded
+during an RPC is logged with its statement, and an RPC that runs more than
+its statement budget (RPC_MAX_QUERIES) is logged. In strict mode
+(QUERY_GUARD_STRICT, or strict=True) both raise QueryGuardError instead.
+"""
+import contextvars
+import logging
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Iterator
+
+from sqlalchemy import Engine, event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from config import QUERY_GUARD_STRICT, RPC_MAX_QUERIES
+from util import database
+from util.metrics import (
+    DB_QUERY_SECONDS,
+    RPC_DB_QUERIES,
+    RPC_DB_SECONDS,
+    RPC_LAZY_LOADS,
+)
+
+logger = logging.getLogger(__name__)
+
+# conn.info key holding start times of statements in flight.
+_QUERY_START = "query_start"
+# db_query_seconds operation labels; other statements are "other".
+_OPERATIONS = frozenset({"select", "insert", "update", "delete"})
+
+
+class QueryGuardError(Exception):
+    """Raised in strict mode on a lazy load or a statement budget overrun."""
+
+
+class RequestScope:
+    """Database state for one RPC: lazily opened sessions and their totals."""
+
+    def __init__(
+        self,
+        method: str | None = None,
+        max_queries: int = 0,
+        strict: bool = False
+    ):
+        """
+        Initialize for the RPC method name (None when not intercepted).
+
+        max_queries is the statement budget (0 = none); strict raises
+        QueryGuardError where the guard would otherwise log.
+        """
+        self.method = method
+        self.max_queries = max_queries
+        self.strict = strict
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.lazy_loads: list[str] = []
+        self._session: Session | None = None
+        self._async_session: AsyncSession | None = None
+
+    def session(self) -> Session:
+        """The RPC's primary session, opened on first use."""
+        if self._session is None:
+            self._session = database.get_session()
+        return self._session
+
+    def read_session(self, consistent: bool = False) -> Session:
+        """
+        The RPC's session for a read-only request, opened on first use.
+
+        See get_read_session; if the RPC already opened a session it is
+        reused, whichever database it is on.
+        """
+        if self._session is None:
+            self._session = database.get_read_session(consistent)
+        return self._session
+
+    def async_session(self) -> AsyncSession:
+        """The RPC's primary AsyncSession, opened on first use."""
+        if self._async_session is None:
+            self._async_session = database.get_async_session()
+        return self._async_session
+
+    def async_read_session(self, consistent: bool = False) -> AsyncSession:
+        """Async counterpart of read_session."""
+        if self._async_session is None:
+            self._async_session = database.get_async_read_session(consistent)
+        return self._async_session
+
+    async def aclose(self, failed: bool) -> None:
+        """Roll back if the RPC failed, then close every session opened."""
+        session, self._async_session = self._async_session, None
+        try:
+            if session is not None:
+                try:
+                    if failed:
+                        await session.rollback()
+                finally:
+                    await session.close()
+        finally:
+            self.close(failed)
+
+    def close(self, failed: bool) -> None:
+        """Roll back if the RPC failed, then close the session if opened."""
+        session, self._session = self._session, None
+        if session is None:
+            return
+        try:
+            if failed:
+                session.rollback()
+        finally:
+            session.close()
+
+    def lazy_load(self, relationship: str, statement: str) -> None:
+        """Report a relationship lazily loaded during the RPC."""
+        self.lazy_loads.append(relationship)
+        RPC_LAZY_LOADS.labels(method=self.method or "unknown").inc()
+        message = (
+            f"Lazy load of {relationship} in {self.method or 'request'}: "
+            f"{statement}"
+        )
+        if self.strict:
+            raise QueryGuardError(message)
+        logger.warning(message)
+
+    def check_budget(self) -> None:
+        """Report the RPC if it ran more statements than max_queries."""
+        if not self.max_queries or self.queries <= self.max_queries:
+            return
+        message = (
+            f"{self.method or 'Request'} ran {self.queries} statements, "
+            f"over its budget of {self.max_queries}"
+        )
+        if self.strict:
+            raise QueryGuardError(message)
+        logger.warning(message)
+
+    def record(self) -> None:
+        """Export the RPC's statement count and database time."""
+        if self.method is None:
+            return
+        RPC_DB_QUERIES.labels(method=self.method).observe(self.queries)
+        RPC_DB_SECONDS.labels(method=self.method).observe(self.db_seconds)
+        logger.debug(
+            "%s: %s queries, %.1fms in database",
+            self.method, self.queries, self.db_seconds * 1000
+        )
+
+
+_current_scope: contextvars.ContextVar[RequestScope | None] = (
+    contextvars.ContextVar("rpc_scope", default=None)
+)
+
+
+def current_scope() -> RequestScope | None:
+    """The scope of the RPC being served, if any."""
+    return _current_scope.get()
+
+
+@contextmanager
+def rpc_scope(
+    method: str | None = None,
+    max_queries: int | None = None,
+    strict: bool | None = None
+) -> Iterator[RequestScope]:
+    """
+    Run the body inside the RPC's request scope.
+
+    Joins the scope already active (opened by SessionInterceptor) or opens
+    one; max_queries and strict default to RPC_MAX_QUERIES and
+    QUERY_GUARD_STRICT and only apply when a scope is opened. Only the
+    outermost entry closes the session, rolling back if the body raised,
+    records the totals and checks the statement budget.
+    """
+    scope = _current_scope.get()
+    if scope is not None:
+        yield scope
+        return
+    scope = _new_scope(method, max_queries, strict)
+    token = _current_scope.set(scope)
+    failed = True
+    try:
+        yield scope
+        failed = False
+    finally:
+        _current_scope.reset(token)
+        try:
+            scope.close(failed)
+        finally:
+            scope.record()
+    scope.check_budget()
+
+
+@asynccontextmanager
+async def async_rpc_scope(
+    method: str | None = None,
+    max_queries: int | None = None,
+    strict: bool | None = None
+) -> AsyncIterator[RequestScope]:
+    """
+    grpc.aio counterpart of rpc_scope.
+
+    Joins the active scope or opens one, like rpc_scope; the outermost
+    entry also closes the scope's AsyncSession. Statements run through the
+    AsyncSession (run_sync included) are counted and guarded like any
+    other statement in the scope.
+    """
+    scope = _current_scope.get()
+    if scope is not None:
+        yield scope
+        return
+    scope = _new_scope(method, max_queries, strict)
+    token = _current_scope.set(scope)
+    failed = True
+    try:
+        yield scope
+        failed = False
+    finally:
+        _current_scope.reset(token)
+        try:
+            await scope.aclose(failed)
+        finally:
+            scope.record()
+    scope.check_budget()
+
+
+def _new_scope(
+    method: str | None,
+    max_queries: int | None,
+    strict: bool | None
+) -> RequestScope:
+    """A scope with the configured budget and strictness as defaults."""
+    return RequestScope(
+        method,
+        RPC_MAX_QUERIES if max_queries is None else max_queries,
+        QUERY_GUARD_STRICT if strict is None else strict
+    )
+
+
+def _operation(statement: str) -> str:
+    """db_query_seconds label for a SQL statement."""
+    keyword = statement.lstrip()[:6].lower()
+    return keyword if keyword in _OPERATIONS else "other"
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_QUERY_START, []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _end_query(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get(_QUERY_START)
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    DB_QUERY_SECONDS.labels(operation=_operation(statement)).observe(elapsed)
+    scope = _current_scope.get()
+    if scope is not None:
+        scope.queries += 1
+        scope.db_seconds += elapsed
+
+
+@event.listens_for(Engine, "handle_error")
+def _abandon_query(context):
+    if context.connection is not None:
+        starts = context.connection.info.get(_QUERY_START)
+        if starts:
+            starts.pop()
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _detect_lazy_load(orm_execute_state: ORMExecuteState):
+    scope = _current_scope.get()
+    if (
+        scope is None
+        or not orm_execute_state.is_select
+        or orm_execute_state.lazy_loaded_from is None
+    ):
+        return
+    path = orm_execute_state.loader_strategy_path
+    relationship = (
+        str(path[-1]) if path
+        else orm_execute_state.lazy_loaded_from.class_.__name__
+    )
+    scope.lazy_load(relationship, str(orm_execute_state.statement))
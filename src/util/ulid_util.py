@@ -1,7 +1,65 @@
 """
-ULID generation and validation utilities.
+ULID generation, validation and binary conversion utilities.
+
+ULIDs are built as one 128-bit int (48-bit millisecond timestamp, 80
+random bits) and encoded with a table of Crockford base32 character pairs,
+without constructing ulid.ULID objects. Within a millisecond the random
+part is incremented instead of redrawn, so the ULIDs one process generates
+sort in generation order, batches included.
 """
-from ulid import ULID
+import os
+import re
+import threading
+import time
+
+_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+# Two Crockford characters for every 10-bit value; 13 pairs encode a ULID.
+_PAIRS = [first + second for first in _ALPHABET for second in _ALPHABET]
+_SHIFTS = range(120, -1, -10)
+# Crockford base32 to the digits int(..., 32) parses.
+_TO_BASE32 = str.maketrans(
+    _ALPHABET + _ALPHABET.lower(),
+    "0123456789abcdefghijklmnopqrstuv" * 2
+)
+# 26 characters whose value fits in 128 bits.
+_ULID_PATTERN = re.compile(r"[0-7][0-9A-HJKMNP-TV-Z]{25}", re.IGNORECASE)
+_RANDOM_LIMIT = 1 << 80
+
+_lock = threading.Lock()
+# Millisecond and random part of the last ULID handed out.
+_last_ms = 0
+_last_random = 0
+
+
+def _reset_after_fork() -> None:
+    """A forked child must not continue its parent's random sequence."""
+    global _last_ms, _last_random, _lock
+    _lock = threading.Lock()
+    _last_ms = _last_random = 0
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _reserve(count: int) -> int:
+    """Reserve count consecutive ULID values; return the first as an int."""
+    global _last_ms, _last_random
+    now = time.time_ns() // 1_000_000
+    with _lock:
+        if now > _last_ms:
+            ms, random = now, int.from_bytes(os.urandom(10), "big")
+        else:
+            # Same millisecond, or the clock stepped back.
+            ms, random = _last_ms, _last_random + 1
+        if random + count > _RANDOM_LIMIT:
+            ms, random = ms + 1, int.from_bytes(os.urandom(10), "big") >> 1
+        _last_ms, _last_random = ms, random + count - 1
+    return ms << 80 | random
+
+
+def _encode(value: int) -> str:
+    """Crockford base32 encoding of a 128-bit int as 26 characters."""
+    return "".join([_PAIRS[value >> shift & 0x3FF] for shift in _SHIFTS])
 
 
 def generate_ulid() -> str:
@@ -11,7 +69,26 @@ def generate_ulid() -> str:
     Returns:
         A 26-character ULID string (time-ordered, URL-safe).
     """
-    return str(ULID())
+    return _encode(_reserve(1))
+
+
+def generate_many(count: int) -> list[str]:
+    """
+    Generate count ULID strings in one step.
+
+    Reads the clock and takes the lock once for the whole batch; the ULIDs
+    share a timestamp and have consecutive random parts.
+
+    Args:
+        count: Number of ULIDs to generate.
+
+    Returns:
+        List of 26-character ULID strings, in ascending order.
+    """
+    if count <= 0:
+        return []
+    first = _reserve(count)
+    return [_encode(first + i) for i in range(count)]
 
 
 def is_valid_ulid(value: str) -> bool:
@@ -24,10 +101,26 @@ def is_valid_ulid(value: str) -> bool:
     Returns:
         True if valid ULID, False otherwise.
     """
-    if not value or len(value) != 26:
-        return False
-    try:
-        ULID.from_str(value)
-        return True
-    except (ValueError, TypeError):
-        return False
+    return (
+        isinstance(value, str)
+        and _ULID_PATTERN.fullmatch(value) is not None
+    )
+
+
+def ulid_to_bytes(value: str) -> bytes:
+    """
+    Binary (16-byte, big-endian) form of a ULID string.
+
+    Byte order matches string order, so sorting either sorts by time.
+
+    Raises:
+        ValueError: If value is not a valid ULID.
+    """
+    if not is_valid_ulid(value):
+        raise ValueError(f"Invalid ULID: {value!r}")
+    return int(value.translate(_TO_BASE32), 32).to_bytes(16, "big")
+
+
+def ulid_from_bytes(data: bytes) -> str:
+    """ULID string for its 16-byte binary form."""
+    return _encode(int.from_bytes(data, "big"))
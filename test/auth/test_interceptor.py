@@ -0,0 +1,172 @@
+"""
+Tests for the authentication server interceptors.
+"""
+import sys
+from pathlib import Path
+
+root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(root / "src"))
+sys.path.insert(0, str(root / "src" / "generated"))
+
+import collections
+import unittest
+
+import grpc
+
+from app.auth.auth_service import AuthService
+from app.auth.interceptor import (
+    AsyncAuthInterceptor,
+    AuthInterceptor,
+    current_user_id,
+    token_from_metadata,
+)
+
+SECRET = "test-secret-key-with-enough-length!"
+
+_CallDetails = collections.namedtuple(
+    "_CallDetails", ["method", "invocation_metadata"]
+)
+
+
+class Aborted(Exception):
+    """Raised by MockContext.abort."""
+
+
+class MockContext:
+    """Mock gRPC context with abort."""
+
+    def __init__(self, metadata=None):
+        self._metadata = metadata or []
+        self.code = None
+        self.details = None
+
+    def invocation_metadata(self):
+        """Return metadata pairs."""
+        return self._metadata
+
+    def abort(self, code, details):
+        """Record status and stop the call."""
+        self.code = code
+        self.details = details
+        raise Aborted()
+
+
+class AsyncMockContext(MockContext):
+    """Mock grpc.aio context with awaitable abort."""
+
+    async def abort(self, code, details):
+        """Record status and stop the call."""
+        MockContext.abort(self, code, details)
+
+
+def _current_user(request, context):
+    return current_user_id.get()
+
+
+async def _current_user_async(request, context):
+    return current_user_id.get()
+
+
+def _bearer(token):
+    return [("authorization", f"Bearer {token}")]
+
+
+class TestTokenFromMetadata(unittest.TestCase):
+    """Tests for token_from_metadata."""
+
+    def test_case_insensitive_key(self):
+        """Authorization header is matched regardless of case."""
+        self.assertEqual(
+            token_from_metadata([("Authorization", "Bearer abc")]), "abc"
+        )
+
+    def test_missing_or_malformed(self):
+        """No header or non-Bearer scheme yields None."""
+        self.assertIsNone(token_from_metadata([]))
+        self.assertIsNone(token_from_metadata(None))
+        self.assertIsNone(token_from_metadata([("authorization", "Basic abc")]))
+
+
+class TestAuthInterceptor(unittest.TestCase):
+    """Tests for AuthInterceptor."""
+
+    def setUp(self):
+        self.interceptor = AuthInterceptor(SECRET)
+        self.token = AuthService._create_token("user-1", SECRET)
+
+    def _intercept(self, method):
+        handler = grpc.unary_unary_rpc_method_handler(_current_user)
+        return self.interceptor.intercept_service(
+            lambda details: handler, _CallDetails(method, ())
+        )
+
+    def test_valid_token_sets_current_user(self):
+        """Behavior sees the authenticated user id; it is reset afterwards."""
+        handler = self._intercept("/library.LibraryService/ListBooks")
+        result = handler.unary_unary(None, MockContext(_bearer(self.token)))
+        self.assertEqual(result, "user-1")
+        self.assertIsNone(current_user_id.get())
+
+    def test_missing_token_aborts(self):
+        """Calls without a token abort with UNAUTHENTICATED."""
+        handler = self._intercept("/library.LibraryService/ListBooks")
+        context = MockContext()
+        with self.assertRaises(Aborted):
+            handler.unary_unary(None, context)
+        self.assertEqual(context.code, grpc.StatusCode.UNAUTHENTICATED)
+        self.assertEqual(context.details, "Missing or invalid authorization")
+
+    def test_invalid_token_aborts(self):
+        """Calls with a bad token abort with UNAUTHENTICATED."""
+        handler = self._intercept("/library.LibraryService/ListBooks")
+        context = MockContext(_bearer("garbage"))
+        with self.assertRaises(Aborted):
+            handler.unary_unary(None, context)
+        self.assertEqual(context.details, "Invalid or expired token")
+
+    def test_login_and_other_services_pass_through(self):
+        """Login and non-library methods are not authenticated."""
+        for method in (
+            "/library.LibraryService/Login",
+            "/grpc.health.v1.Health/Check",
+        ):
+            handler = self._intercept(method)
+            self.assertIsNone(handler.unary_unary(None, MockContext()))
+
+
+class TestAsyncAuthInterceptor(unittest.IsolatedAsyncioTestCase):
+    """Tests for AsyncAuthInterceptor."""
+
+    async def asyncSetUp(self):
+        self.interceptor = AsyncAuthInterceptor(SECRET)
+        self.token = AuthService._create_token("user-1", SECRET)
+
+    async def _intercept(self, method):
+        handler = grpc.unary_unary_rpc_method_handler(_current_user_async)
+
+        async def continuation(details):
+            return handler
+
+        return await self.interceptor.intercept_service(
+            continuation, _CallDetails(method, ())
+        )
+
+    async def test_valid_token_sets_current_user(self):
+        """Behavior sees the authenticated user id."""
+        handler = await self._intercept("/library.LibraryService/ListBooks")
+        result = await handler.unary_unary(
+            None, AsyncMockContext(_bearer(self.token))
+        )
+        self.assertEqual(result, "user-1")
+
+    async def test_missing_token_aborts(self):
+        """Calls without a token abort with UNAUTHENTICATED."""
+        handler = await self._intercept("/library.LibraryService/ListBooks")
+        context = AsyncMockContext()
+        with self.assertRaises(Aborted):
+            await handler.unary_unary(None, context)
+        self.assertEqual(context.code, grpc.StatusCode.UNAUTHENTICATED)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,183 @@
+"""
+Tests for the bcrypt password pool.
+"""
+import sys
+from pathlib import Path
+
+root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(root / "src"))
+sys.path.insert(0, str(root / "src" / "generated"))
+
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import grpc
+
+from app.auth.password_pool import (
+    PasswordPool,
+    PasswordPoolFullError,
+    PasswordPoolTimeoutError,
+    _checkpw,
+)
+from app.library.grpc_handlers import LibraryServiceHandler
+from proto import auth_pb2
+
+
+def _exit_first_time(marker: str) -> str:
+    """Kill the pool process running the job unless marker exists."""
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        os._exit(1)
+    return "done"
+
+
+def _sleep(seconds: float) -> float:
+    """Block a pool process for seconds."""
+    time.sleep(seconds)
+    return seconds
+
+
+class MockContext:
+    """Mock gRPC context for testing."""
+
+    def __init__(self):
+        self._code = None
+        self._details = None
+
+    def set_code(self, code):
+        """Set status code."""
+        self._code = code
+
+    def set_details(self, details):
+        """Set error details."""
+        self._details = details
+
+
+class TestPasswordPool(unittest.TestCase):
+    """Tests for PasswordPool."""
+
+    def setUp(self):
+        """Create a single-process pool."""
+        self.pool = PasswordPool(processes=1, max_pending=2)
+
+    def tearDown(self):
+        """Stop the pool processes."""
+        self.pool.shutdown()
+
+    def test_hash_and_verify_round_trip(self):
+        """A hash produced by the pool verifies the same password only."""
+        hashed = self.pool.hash("secret")
+        self.assertTrue(self.pool.verify("secret", hashed))
+        self.assertFalse(self.pool.verify("wrong", hashed))
+
+    def test_verify_async(self):
+        """verify_async awaits the pool result."""
+        hashed = self.pool.hash("secret")
+        self.assertTrue(
+            asyncio.run(self.pool.verify_async("secret", hashed))
+        )
+
+    def test_full_pool_fails_fast(self):
+        """Submitting past max_pending raises instead of queueing."""
+        hashed = self.pool.hash("secret").encode("utf-8")
+        pending = [
+            self.pool._submit(_checkpw, b"secret", hashed)
+            for _ in range(2)
+        ]
+        with self.assertRaises(PasswordPoolFullError):
+            self.pool._submit(_checkpw, b"secret", hashed)
+        for future in pending:
+            self.assertTrue(future.result())
+
+    def test_inline_mode_runs_without_processes(self):
+        """processes=0 hashes in the calling thread."""
+        pool = PasswordPool(processes=0, max_pending=1)
+        hashed = pool.hash("secret")
+        self.assertTrue(pool.verify("secret", hashed))
+        self.assertIsNone(pool._executor)
+
+    def test_inline_verify_async_keeps_event_loop_running(self):
+        """processes=0 verify_async runs bcrypt off the event loop thread."""
+        pool = PasswordPool(processes=0, max_pending=1)
+        self.addCleanup(pool.shutdown)
+        hashed = pool.hash("secret")
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        async def run():
+            ticker = asyncio.create_task(tick())
+            await asyncio.sleep(0)
+            start = ticks
+            try:
+                return await pool.verify_async("secret", hashed), ticks - start
+            finally:
+                ticker.cancel()
+
+        with mock.patch(
+            "app.auth.password_pool._checkpw",
+            side_effect=lambda *args: time.sleep(0.2) or _checkpw(*args)
+        ):
+            verified, progressed = asyncio.run(run())
+        self.assertTrue(verified)
+        self.assertGreater(progressed, 5)
+        self.assertIsNone(pool._executor)
+
+    def test_inline_verify_async_holds_slot_until_thread_finishes(self):
+        """A timed-out inline job still counts against max_pending."""
+        pool = PasswordPool(processes=0, max_pending=1, timeout=0.1)
+        self.addCleanup(pool.shutdown)
+        with mock.patch(
+            "app.auth.password_pool._checkpw",
+            side_effect=lambda *args: _sleep(0.5)
+        ):
+            with self.assertRaises(PasswordPoolTimeoutError):
+                asyncio.run(pool.verify_async("secret", "hash"))
+            with self.assertRaises(PasswordPoolFullError):
+                pool._submit(_sleep, 0)
+
+    def test_worker_death_mid_job_rebuilds_pool_and_retries(self):
+        """A job whose worker dies is retried once on a fresh executor."""
+        self.pool.hash("warm-up")
+        broken = self.pool._executor
+        with tempfile.TemporaryDirectory() as tmp:
+            marker = os.path.join(tmp, "died")
+            self.assertEqual(self.pool._call(_exit_first_time, marker), "done")
+        self.assertIsNot(self.pool._executor, broken)
+        hashed = self.pool.hash("secret")
+        self.assertTrue(self.pool.verify("secret", hashed))
+
+    def test_slow_job_times_out_and_keeps_its_slot(self):
+        """Callers stop waiting after timeout; the job holds its slot."""
+        pool = PasswordPool(processes=1, max_pending=1, timeout=0.2)
+        self.addCleanup(pool.shutdown)
+        with self.assertRaises(PasswordPoolTimeoutError):
+            pool._call(_sleep, 1.5)
+        with self.assertRaises(PasswordPoolFullError):
+            pool._submit(_sleep, 0)
+
+
+class TestLoginBackPressure(unittest.TestCase):
+    """Login maps a saturated pool to RESOURCE_EXHAUSTED."""
+
+    def test_login_returns_resource_exhausted_when_pool_full(self):
+        """Login fails fast instead of blocking on bcrypt."""
+        ctx = MockContext()
+        with mock.patch(
+            "app.library.grpc_handlers.AuthService.login",
+            side_effect=PasswordPoolFullError("full")
+        ):
+            resp = LibraryServiceHandler().Login(
+                auth_pb2.LoginRequest(username="staff1", password="pw"),
+                ctx
+            )
+        self.assertEqual(resp.token, "")
+        self.assertEqual(ctx._code, grpc.StatusCode.RESOURCE_EXHAUSTED)
@@ -0,0 +1,90 @@
+"""
+Tests for TokenCache and cached token validation.
+"""
+import sys
+import time
+from pathlib import Path
+
+root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(root / "src"))
+sys.path.insert(0, str(root / "src" / "generated"))
+
+import unittest
+
+from app.auth.auth_service import AuthService
+from app.auth.token_cache import TokenCache, token_cache
+
+SECRET = "test-secret-key-with-enough-length!"
+
+
+class TestTokenCache(unittest.TestCase):
+    """Tests for TokenCache."""
+
+    def test_put_then_get(self):
+        """Cached subject is returned until expiry."""
+        cache = TokenCache(10)
+        cache.put("tok", SECRET, "user-1", time.time() + 60)
+        self.assertEqual(cache.get("tok", SECRET), "user-1")
+
+    def test_expired_entry_is_dropped(self):
+        """Entries past their exp are not returned."""
+        cache = TokenCache(10)
+        cache.put("tok", SECRET, "user-1", time.time() - 1)
+        self.assertIsNone(cache.get("tok", SECRET))
+
+    def test_secret_is_part_of_key(self):
+        """A token cached under one secret does not match another."""
+        cache = TokenCache(10)
+        cache.put("tok", SECRET, "user-1", time.time() + 60)
+        self.assertIsNone(cache.get("tok", "other-secret"))
+
+    def test_least_recently_used_evicted(self):
+        """Oldest unused entry is evicted when full."""
+        cache = TokenCache(2)
+        exp = time.time() + 60
+        cache.put("a", SECRET, "user-a", exp)
+        cache.put("b", SECRET, "user-b", exp)
+        cache.get("a", SECRET)
+        cache.put("c", SECRET, "user-c", exp)
+        self.assertEqual(cache.get("a", SECRET), "user-a")
+        self.assertIsNone(cache.get("b", SECRET))
+        self.assertEqual(cache.get("c", SECRET), "user-c")
+
+    def test_zero_size_disables_cache(self):
+        """max_entries=0 never caches."""
+        cache = TokenCache(0)
+        cache.put("tok", SECRET, "user-1", time.time() + 60)
+        self.assertIsNone(cache.get("tok", SECRET))
+
+
+class TestValidateSessionCache(unittest.TestCase):
+    """Tests for AuthService.validate_session caching."""
+
+    def setUp(self):
+        """Start from an empty global cache."""
+        token_cache.clear()
+
+    def tearDown(self):
+        token_cache.clear()
+
+    def test_valid_token_is_cached(self):
+        """First validation populates the cache."""
+        token = AuthService._create_token("user-1", SECRET)
+        self.assertIsNone(token_cache.get(token, SECRET))
+        self.assertEqual(AuthService.validate_session(token, SECRET), "user-1")
+        self.assertEqual(token_cache.get(token, SECRET), "user-1")
+
+    def test_invalid_token_not_cached(self):
+        """Rejected tokens are not cached."""
+        self.assertIsNone(AuthService.validate_session("garbage", SECRET))
+        self.assertIsNone(token_cache.get("garbage", SECRET))
+
+    def test_wrong_secret_still_rejected_after_cache(self):
+        """A cached token does not validate under a different secret."""
+        token = AuthService._create_token("user-1", SECRET)
+        AuthService.validate_session(token, SECRET)
+        self.assertIsNone(AuthService.validate_session(token, "other-secret"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+Tests for the prefork supervisor in server.py.
+"""
+import sys
+from pathlib import Path
+
+root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(root / "src"))
+sys.path.insert(0, str(root / "src" / "generated"))
+
+import os
+import signal
+import threading
+import time
+import unittest
+from unittest import mock
+
+import server
+
+
+def _crash_on_start(index, ready):
+    """Worker that fails before serving."""
+    os._exit(3)
+
+
+def _never_ready(index, ready):
+    """Worker that hangs without ever serving."""
+    time.sleep(60)
+
+
+def _serve_until_terminated(index, ready):
+    """Worker that serves until SIGTERM."""
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    ready.set()
+    time.sleep(60)
+
+
+class TestServePrefork(unittest.TestCase):
+    """Readiness, backoff and give-up behaviour of serve_prefork."""
+
+    def setUp(self):
+        """Use fast supervision timings and keep the test's signal handlers."""
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            self.addCleanup(signal.signal, signum, signal.getsignal(signum))
+        patcher = mock.patch.multiple(
+            server,
+            WORKER_CHECK_INTERVAL_SECONDS=0.02,
+            WORKER_READY_TIMEOUT_SECONDS=0.3,
+            WORKER_RESTART_BACKOFF_SECONDS=0.05,
+            WORKER_RESTART_BACKOFF_MAX_SECONDS=0.1,
+            WORKER_MAX_RESTARTS=2,
+            SERVER_SHUTDOWN_GRACE_SECONDS=0,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_crashing_worker_backs_off_then_exits_non_zero(self):
+        """A worker that keeps dying at startup is retried, then given up."""
+        with mock.patch.object(server, "_run_worker", _crash_on_start):
+            with self.assertLogs("server", "WARNING") as logs:
+                with self.assertRaises(SystemExit) as exit_info:
+                    server.serve_prefork(1)
+        self.assertEqual(exit_info.exception.code, 1)
+        output = "\n".join(logs.output)
+        self.assertIn("exited with code 3 before serving", output)
+        self.assertIn("restarting in 0.1s", output)
+        self.assertIn("3 consecutive failures, giving up", output)
+
+    def test_worker_that_never_serves_is_restarted(self):
+        """A worker not ready within the timeout is killed and restarted."""
+        with mock.patch.object(server, "_run_worker", _never_ready):
+            with self.assertLogs("server", "WARNING") as logs:
+                with self.assertRaises(SystemExit):
+                    server.serve_prefork(1)
+        self.assertIn("not serving after 0.3s", "\n".join(logs.output))
+
+    def test_ready_worker_runs_until_shutdown(self):
+        """A worker that signals readiness is left alone until SIGTERM."""
+        timer = threading.Timer(
+            1.0, os.kill, (os.getpid(), signal.SIGTERM)
+        )
+        timer.start()
+        self.addCleanup(timer.cancel)
+        with mock.patch.object(
+            server, "_run_worker", _serve_until_terminated
+        ):
+            with self.assertNoLogs("server", "WARNING"):
+                server.serve_prefork(2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -53,7 +53,9 @@ class TestGrpcWebIntegration(unittest.TestCase):
         self.engine = create_engine("sqlite:///:memory:")
         Base.metadata.create_all(self.engine)
         database.engine = self.engine
-        database.SessionLocal = sessionmaker(bind=self.engine)
+        database.SessionLocal = sessionmaker(
+            bind=self.engine, expire_on_commit=False
+        )
         session = database.SessionLocal()
         auth = AuthService("test-secret")
         StaffUserRepository.create(session, "admin", auth.hash_password("admin123"))
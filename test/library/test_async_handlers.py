@@ -0,0 +1,221 @@
+"""
+Tests for the grpc.aio LibraryService handler.
+"""
+import sys
+from pathlib import Path
+
+root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(root / "src"))
+sys.path.insert(0, str(root / "src" / "generated"))
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+import grpc
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models.base import Base
+from util import database, request_scope
+from app.auth.auth_service import AuthService
+from app.auth.repository import StaffUserRepository
+from app.library.grpc_handlers import AsyncLibraryServiceHandler
+from app.library.interceptor import AsyncSessionInterceptor
+from app.library.repository import BookCopyRepository
+from proto import library_pb2, auth_pb2
+
+JWT_SECRET = os.getenv("JWT_SECRET", "change-me-in-production")
+
+
+class MockContext:
+    """Mock grpc.aio servicer context for testing."""
+
+    def __init__(self):
+        self._code = None
+        self._details = None
+        self._metadata = {}
+
+    def set_code(self, code):
+        """Set status code."""
+        self._code = code
+
+    def set_details(self, details):
+        """Set error details."""
+        self._details = details
+
+    def invocation_metadata(self):
+        """Return metadata for auth."""
+        return [(k, v) for k, v in self._metadata.items()]
+
+    def set_metadata(self, key, value):
+        """Set metadata (e.g. authorization)."""
+        self._metadata[key] = value
+
+
+class TestAsyncLibraryServiceHandler(unittest.IsolatedAsyncioTestCase):
+    """Flows through AsyncLibraryServiceHandler on aiosqlite."""
+
+    async def asyncSetUp(self):
+        """Create a file-backed SQLite database shared by sync and async engines."""
+        fd, self.db_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        self.engine = create_engine(f"sqlite:///{self.db_path}")
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        session = self.Session()
+        auth = AuthService(JWT_SECRET)
+        StaffUserRepository.create(
+            session, "staff1", auth.hash_password("password123")
+        )
+        session.close()
+        database.init_async_engine(f"sqlite+aiosqlite:///{self.db_path}")
+        self.handler = AsyncLibraryServiceHandler()
+        self.ctx = MockContext()
+
+    async def asyncTearDown(self):
+        """Dispose engines and remove the database file."""
+        await database.async_engine.dispose()
+        database.async_engine = None
+        database.AsyncSessionLocal = None
+        self.engine.dispose()
+        os.remove(self.db_path)
+
+    async def _login(self):
+        resp = await self.handler.Login(
+            auth_pb2.LoginRequest(username="staff1", password="password123"),
+            self.ctx
+        )
+        self.ctx.set_metadata("authorization", f"Bearer {resp.token}")
+        return resp
+
+    async def test_login_invalid_password_is_unauthenticated(self):
+        """Login with a wrong password sets UNAUTHENTICATED."""
+        resp = await self.handler.Login(
+            auth_pb2.LoginRequest(username="staff1", password="wrong"),
+            self.ctx
+        )
+        self.assertEqual(resp.token, "")
+        self.assertEqual(self.ctx._code, grpc.StatusCode.UNAUTHENTICATED)
+
+    async def test_requires_auth(self):
+        """Authenticated RPCs reject calls without a token."""
+        await self.handler.ListBooks(library_pb2.ListBooksRequest(), self.ctx)
+        self.assertEqual(self.ctx._code, grpc.StatusCode.UNAUTHENTICATED)
+
+    async def test_create_book_borrow_and_list_flow(self):
+        """Create, borrow and list through the async handler."""
+        login_resp = await self._login()
+        self.assertTrue(len(login_resp.token) > 0)
+
+        book_resp = await self.handler.CreateBook(
+            library_pb2.CreateBookRequest(title="Async", author="Author"),
+            self.ctx
+        )
+        session = self.Session()
+        copy = BookCopyRepository.create(
+            session, book_resp.book.id, "1", "available"
+        )
+        copy_id = copy.id
+        session.close()
+        member_resp = await self.handler.CreateMember(
+            library_pb2.CreateMemberRequest(name="Jane", email="j@x.com"),
+            self.ctx
+        )
+
+        borrow_resp = await self.handler.BorrowBook(
+            library_pb2.BorrowBookRequest(
+                copy_id=copy_id,
+                member_id=member_resp.member.id
+            ),
+            self.ctx
+        )
+        self.assertIsNone(self.ctx._code)
+        self.assertEqual(borrow_resp.borrow.status, "active")
+
+        req = library_pb2.ListBorrowingsRequest()
+        req.pagination.page = 1
+        req.pagination.limit = 10
+        list_resp = await self.handler.ListBorrowings(req, self.ctx)
+        self.assertEqual(len(list_resp.borrows), 1)
+        self.assertEqual(list_resp.borrows[0].book.title, "Async")
+        self.assertEqual(list_resp.borrows[0].member.name, "Jane")
+
+    async def test_stream_members_sends_all_members_in_chunks(self):
+        """StreamMembers streams every member from an async cursor."""
+        await self._login()
+        for i in range(3):
+            await self.handler.CreateMember(
+                library_pb2.CreateMemberRequest(
+                    name=f"Member {i}", email=f"m{i}@x.com"
+                ),
+                self.ctx
+            )
+        chunks = [
+            chunk async for chunk in self.handler.StreamMembers(
+                library_pb2.StreamMembersRequest(chunk_size=2), self.ctx
+            )
+        ]
+        self.assertIsNone(self.ctx._code)
+        self.assertEqual([len(c.members) for c in chunks], [2, 1])
+        self.assertEqual(
+            sorted(m.name for c in chunks for m in c.members),
+            ["Member 0", "Member 1", "Member 2"]
+        )
+
+    async def test_bulk_import_books(self):
+        """BulkImportBooks consumes an async request stream."""
+        await self._login()
+
+        async def requests():
+            yield library_pb2.BulkImportBooksRequest(books=[
+                library_pb2.ImportBookRow(
+                    title="Async Import", author="A", copy_numbers=["1", "2"]
+                ),
+                library_pb2.ImportBookRow(title="No author"),
+            ])
+
+        resp = await self.handler.BulkImportBooks(requests(), self.ctx)
+        self.assertIsNone(self.ctx._code)
+        self.assertEqual(resp.books_imported, 1)
+        self.assertEqual(resp.copies_imported, 2)
+        self.assertEqual([e.row for e in resp.errors], [1])
+
+    async def test_strict_guard_applies_to_async_handlers(self):
+        """Async handlers run in a request scope that enforces the budget."""
+        await self._login()
+        await self.handler.CreateBook(
+            library_pb2.CreateBookRequest(title="Async", author="Author"),
+            self.ctx
+        )
+        with mock.patch.multiple(
+            request_scope, RPC_MAX_QUERIES=1, QUERY_GUARD_STRICT=True
+        ):
+            with self.assertRaisesRegex(
+                request_scope.QueryGuardError, "over its budget of 1"
+            ):
+                await self.handler.ListBooks(
+                    library_pb2.ListBooksRequest(), self.ctx
+                )
+
+    async def test_interceptor_scope_owns_handler_session(self):
+        """Behind AsyncSessionInterceptor the scope owns the handler session."""
+        await self._login()
+        scopes = []
+        list_books = self.handler.ListBooks
+
+        async def behavior(request, context):
+            scopes.append(request_scope.current_scope())
+            return await list_books(request, context)
+
+        async def continuation(details):
+            return grpc.unary_unary_rpc_method_handler(behavior)
+
+        wrapped = await AsyncSessionInterceptor().intercept_service(
+            continuation,
+            mock.Mock(method="/library.LibraryService/ListBooks")
+        )
+        await wrapped.unary_unary(library_pb2.ListBooksRequest(), self.ctx)
+        self.assertEqual(scopes[0].method, "ListBooks")
+        self.assertGreater(scopes[0].queries, 0)
+        self.assertIsNone(scopes[0]._async_session)
@@ -0,0 +1,161 @@
+"""
+Tests for the book/member snapshot cache.
+"""
+import sys
+from pathlib import Path
+
+root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(root / "src"))
+sys.path.insert(0, str(root / "src" / "generated"))
+
+import unittest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from models.base import Base
+from models.book import Book
+from app.library.catalog_cache import (
+    BookSnapshot,
+    CatalogCache,
+    catalog_cache,
+    handle_notification,
+)
+from app.library.repository import BookRepository, MemberRepository
+
+
+class TestCatalogCache(unittest.TestCase):
+    """Tests for CatalogCache."""
+
+    def test_put_then_get(self):
+        """Cached snapshot is returned until its TTL passes."""
+        cache = CatalogCache(10, 60)
+        cache.put("books", "b1", ("b1",))
+        self.assertEqual(cache.get("books", "b1"), ("b1",))
+        self.assertIsNone(cache.get("members", "b1"))
+
+    def test_expired_entry_is_dropped(self):
+        """Entries past their TTL are not returned."""
+        cache = CatalogCache(10, 0)
+        cache.put("books", "b1", ("b1",))
+        self.assertIsNone(cache.get("books", "b1"))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """The cache holds at most max_entries, evicting the LRU entry."""
+        cache = CatalogCache(2, 60)
+        cache.put("books", "b1", ("b1",))
+        cache.put("books", "b2", ("b2",))
+        cache.get("books", "b1")
+        cache.put("books", "b3", ("b3",))
+        self.assertIsNone(cache.get("books", "b2"))
+        self.assertIsNotNone(cache.get("books", "b1"))
+
+    def test_zero_size_disables_cache(self):
+        """max_entries 0 never stores anything."""
+        cache = CatalogCache(0, 60)
+        cache.put("books", "b1", ("b1",))
+        self.assertIsNone(cache.get("books", "b1"))
+
+    def test_put_skipped_after_invalidation_since_generation(self):
+        """A snapshot read before an invalidation is not cached."""
+        cache = CatalogCache(10, 60)
+        generation = cache.generation("books", "b1")
+        cache.invalidate("books", "b1")
+        cache.put("books", "b1", ("stale",), generation)
+        self.assertIsNone(cache.get("books", "b1"))
+        generation = cache.generation("books", "b1")
+        cache.clear()
+        cache.put("books", "b1", ("stale",), generation)
+        self.assertIsNone(cache.get("books", "b1"))
+        cache.put("books", "b1", ("b1",), cache.generation("books", "b1"))
+        self.assertEqual(cache.get("books", "b1"), ("b1",))
+
+
+class TestSnapshotReads(unittest.TestCase):
+    """Repository snapshot reads and commit-time invalidation."""
+
+    def setUp(self):
+        """Create test session and an empty cache."""
+        catalog_cache.clear()
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        self.session = sessionmaker(bind=self.engine)()
+        self.selects = 0
+        event.listen(self.engine, "before_cursor_execute", self._count)
+        self.book = BookRepository.create(self.session, "Dune", "Herbert")
+
+    def tearDown(self):
+        """Close session."""
+        self.session.close()
+        self.engine.dispose()
+        catalog_cache.clear()
+
+    def _count(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            self.selects += 1
+
+    def test_second_read_is_served_from_cache(self):
+        """A cached snapshot is returned without a query and is not an ORM row."""
+        self.session.expire_all()
+        first = BookRepository.get_snapshot(self.session, self.book.id)
+        selects = self.selects
+        second = BookRepository.get_snapshot(self.session, self.book.id)
+        self.assertEqual(self.selects, selects)
+        self.assertEqual(second, first)
+        self.assertIsInstance(second, BookSnapshot)
+        self.assertNotIsInstance(second, Book)
+
+    def test_missing_row_returns_none(self):
+        """Unknown ids return None."""
+        self.assertIsNone(MemberRepository.get_snapshot(self.session, "nope"))
+
+    def test_update_invalidates_on_commit(self):
+        """update commits and the next read sees the new title."""
+        BookRepository.get_snapshot(self.session, self.book.id)
+        BookRepository.update(self.session, self.book.id, title="Dune II")
+        self.assertEqual(
+            BookRepository.get_snapshot(self.session, self.book.id).title,
+            "Dune II"
+        )
+
+    def test_uncommitted_write_is_not_cached(self):
+        """A row written in the open transaction is read but not cached."""
+        self.book.title = "Draft"
+        self.session.flush()
+        self.assertEqual(
+            BookRepository.get_snapshot(self.session, self.book.id).title,
+            "Draft"
+        )
+        self.session.rollback()
+        self.assertEqual(
+            BookRepository.get_snapshot(self.session, self.book.id).title,
+            "Dune"
+        )
+
+    def test_notification_invalidates_entry(self):
+        """A "kind:id" payload from another process drops the entry."""
+        BookRepository.get_snapshot(self.session, self.book.id)
+        handle_notification(f"books:{self.book.id}")
+        self.assertIsNone(catalog_cache.get("books", self.book.id))
+        handle_notification("garbage")
+
+    def test_row_invalidated_while_loading_is_not_cached(self):
+        """A commit invalidating the row during the load keeps it uncached."""
+        book_id = self.book.id
+        self.session.expire_all()
+
+        def concurrent_commit(conn, cursor, statement, *args):
+            catalog_cache.invalidate("books", book_id)
+
+        event.listen(self.engine, "after_cursor_execute", concurrent_commit)
+        try:
+            snapshot = BookRepository.get_snapshot(self.session, book_id)
+        finally:
+            event.remove(
+                self.engine, "after_cursor_execute", concurrent_commit
+            )
+        self.assertEqual(snapshot.title, "Dune")
+        self.assertIsNone(catalog_cache.get("books", book_id))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,19 +10,25 @@ sys.path.insert(0, str(root / "src" / "generated"))
 
 import unittest
 import os
+from unittest import mock
+from datetime import datetime, timedelta
 import grpc
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from models.base import Base
+from models.book import Book
 from models.staff_user import StaffUser
+from util import request_scope
 from util.ulid_util import generate_ulid
 from app.auth.auth_service import AuthService
 from app.auth.repository import StaffUserRepository
 from app.library.grpc_handlers import LibraryServiceHandler
+from app.library.library_service import BookImportRow, LibraryService
 from app.library.repository import (
     BookRepository,
     BookCopyRepository,
+    BorrowRepository,
     MemberRepository,
 )
 from proto import library_pb2, auth_pb2
@@ -67,7 +73,7 @@ class TestLibraryIntegration(unittest.TestCase):
         os.environ["JWT_SECRET"] = "test-secret-key-for-integration-tests"
         self.engine = get_test_engine()
         Base.metadata.create_all(self.engine)
-        self.Session = sessionmaker(bind=self.engine)
+        self.Session = sessionmaker(bind=self.engine, expire_on_commit=False)
 
         from util import database
         database.engine = self.engine
@@ -81,6 +87,10 @@ class TestLibraryIntegration(unittest.TestCase):
             auth.hash_password("password123")
         )
         session.close()
+        # Handlers must not lazily load relationships.
+        patcher = mock.patch.object(request_scope, "QUERY_GUARD_STRICT", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
         self.handler = LibraryServiceHandler()
         self.ctx = MockContext()
@@ -231,6 +241,93 @@ class TestLibraryIntegration(unittest.TestCase):
         )
         self.assertEqual(self.ctx._code, grpc.StatusCode.INVALID_ARGUMENT)
 
+    def test_create_rpcs_run_one_statement(self):
+        """CreateBook and CreateMember return the written row without a SELECT."""
+        login_resp = self.handler.Login(
+            auth_pb2.LoginRequest(username="staff1", password="password123"),
+            self.ctx
+        )
+        self.ctx.set_metadata("authorization", f"Bearer {login_resp.token}")
+        with request_scope.rpc_scope() as scope:
+            book = self.handler.CreateBook(
+                library_pb2.CreateBookRequest(title="Dune", author="Herbert"),
+                self.ctx
+            ).book
+        self.assertEqual(scope.queries, 1)
+        self.assertEqual((book.title, book.version), ("Dune", 1))
+        with request_scope.rpc_scope() as scope:
+            member = self.handler.CreateMember(
+                library_pb2.CreateMemberRequest(name="Jane", email="j@x.com"),
+                self.ctx
+            ).member
+        self.assertEqual(scope.queries, 1)
+        self.assertEqual(member.email, "j@x.com")
+
+    def test_update_book_compare_and_set(self):
+        """UpdateBook applies in one statement at the expected version only."""
+        login_resp = self.handler.Login(
+            auth_pb2.LoginRequest(username="staff1", password="password123"),
+            self.ctx
+        )
+        self.ctx.set_metadata("authorization", f"Bearer {login_resp.token}")
+        book = self.handler.CreateBook(
+            library_pb2.CreateBookRequest(title="Dune", author="Herbert"),
+            self.ctx
+        ).book
+        self.assertEqual(book.version, 1)
+
+        with request_scope.rpc_scope() as scope:
+            updated = self.handler.UpdateBook(
+                library_pb2.UpdateBookRequest(
+                    id=book.id, title="Dune Messiah", expected_version=1
+                ),
+                self.ctx
+            ).book
+        self.assertEqual(scope.queries, 1)
+        self.assertEqual(
+            (updated.title, updated.author, updated.version),
+            ("Dune Messiah", "Herbert", 2)
+        )
+
+        self.handler.UpdateBook(
+            library_pb2.UpdateBookRequest(
+                id=book.id, title="Lost edit", expected_version=1
+            ),
+            self.ctx
+        )
+        self.assertEqual(self.ctx._code, grpc.StatusCode.ABORTED)
+        self.handler.UpdateBook(
+            library_pb2.UpdateBookRequest(
+                id=generate_ulid(), title="Missing", expected_version=1
+            ),
+            self.ctx
+        )
+        self.assertEqual(self.ctx._code, grpc.StatusCode.NOT_FOUND)
+
+    def test_update_member_compare_and_set(self):
+        """UpdateMember fails with ABORTED at a stale version."""
+        login_resp = self.handler.Login(
+            auth_pb2.LoginRequest(username="staff1", password="password123"),
+            self.ctx
+        )
+        self.ctx.set_metadata("authorization", f"Bearer {login_resp.token}")
+        member = self.handler.CreateMember(
+            library_pb2.CreateMemberRequest(name="Jane", email="j@x.com"),
+            self.ctx
+        ).member
+        self.handler.UpdateMember(
+            library_pb2.UpdateMemberRequest(id=member.id, name="Janet"),
+            self.ctx
+        )
+        self.assertEqual(self.ctx._code, None)
+        self.handler.UpdateMember(
+            library_pb2.UpdateMemberRequest(
+                id=member.id, name="Jan", expected_version=member.version
+            ),
+            self.ctx
+        )
+        self.assertEqual(self.ctx._code, grpc.StatusCode.ABORTED)
+
     def test_create_book_copy_success(self):
         """CreateBookCopy creates copy when book exists."""
         login_req = auth_pb2.LoginRequest(
@@ -333,7 +430,7 @@ class TestLibraryIntegration(unittest.TestCase):
         self.assertEqual(ctx._code, grpc.StatusCode.UNAUTHENTICATED)
 
     def test_list_books_returns_copy_count_per_book(self):
-        """ListBooks returns correct copy_count for each book."""
+        """ListBooks returns correct copy_count and available_count for each book."""
         login_req = auth_pb2.LoginRequest(
             username="staff1",
             password="password123"
@@ -363,7 +460,177 @@ class TestLibraryIntegration(unittest.TestCase):
         book1_resp = next(b for b in resp.books if b.id == book1_id)
         book2_resp = next(b for b in resp.books if b.id == book2_id)
         self.assertEqual(book1_resp.copy_count, 3)
+        self.assertEqual(book1_resp.available_count, 2)
         self.assertEqual(book2_resp.copy_count, 0)
+        self.assertEqual(book2_resp.available_count, 0)
+
+    def test_list_books_page_token_walks_all_pages(self):
+        """ListBooks next_page_token pages through every book once."""
+        login_req = auth_pb2.LoginRequest(
+            username="staff1",
+            password="password123"
+        )
+        login_resp = self.handler.Login(login_req, self.ctx)
+        self.ctx.set_metadata(
+            "authorization",
+            f"Bearer {login_resp.token}"
+        )
+
+        session = self.Session()
+        base = datetime(2025, 1, 1, 12, 0, 0)
+        for i in range(5):
+            session.add(Book(
+                id=generate_ulid(),
+                title=f"Book {i}",
+                author="Author",
+                created_at=base + timedelta(minutes=i)
+            ))
+        session.commit()
+        session.close()
+
+        titles = []
+        token = ""
+        for _ in range(5):
+            req = library_pb2.ListBooksRequest()
+            req.pagination.limit = 2
+            req.pagination.page_token = token
+            resp = self.handler.ListBooks(req, self.ctx)
+            self.assertEqual(self.ctx._code, None)
+            self.assertEqual(resp.pagination.total_count, 5)
+            titles.extend(b.title for b in resp.books)
+            token = resp.pagination.next_page_token
+            if not token:
+                break
+        self.assertEqual(
+            titles,
+            ["Book 4", "Book 3", "Book 2", "Book 1", "Book 0"]
+        )
+
+    def test_list_books_invalid_page_token_returns_invalid_argument(self):
+        """ListBooks rejects a malformed page_token."""
+        login_req = auth_pb2.LoginRequest(
+            username="staff1",
+            password="password123"
+        )
+        login_resp = self.handler.Login(login_req, self.ctx)
+        self.ctx.set_metadata(
+            "authorization",
+            f"Bearer {login_resp.token}"
+        )
+        req = library_pb2.ListBooksRequest()
+        req.pagination.limit = 10
+        req.pagination.page_token = "garbage"
+        self.handler.ListBooks(req, self.ctx)
+        self.assertEqual(self.ctx._code, grpc.StatusCode.INVALID_ARGUMENT)
+
+    def test_search_books_ranks_title_prefix_first_and_pages(self):
+        """SearchBooks matches word prefixes and pages by rank via tokens."""
+        login_req = auth_pb2.LoginRequest(
+            username="staff1",
+            password="password123"
+        )
+        login_resp = self.handler.Login(login_req, self.ctx)
+        self.ctx.set_metadata(
+            "authorization",
+            f"Bearer {login_resp.token}"
+        )
+        session = self.Session()
+        BookRepository.create(session, "Dune", "Frank Herbert")
+        BookRepository.create(session, "Children of Dune", "Frank Herbert")
+        BookRepository.create(session, "Dune Messiah", "Frank Herbert")
+        BookRepository.create(session, "Emma", "Jane Austen")
+        session.close()
+
+        titles = []
+        token = ""
+        for _ in range(3):
+            req = library_pb2.SearchBooksRequest(query="dun")
+            req.pagination.limit = 2
+            req.pagination.page_token = token
+            resp = self.handler.SearchBooks(req, self.ctx)
+            self.assertEqual(self.ctx._code, None)
+            titles.extend(b.title for b in resp.books)
+            token = resp.pagination.next_page_token
+            if not token:
+                break
+        self.assertEqual(len(titles), 3)
+        self.assertEqual(titles[-1], "Children of Dune")
+        self.assertEqual(set(titles[:2]), {"Dune", "Dune Messiah"})
+
+        req = library_pb2.SearchBooksRequest(query="herbert messiah")
+        resp = self.handler.SearchBooks(req, self.ctx)
+        self.assertEqual([b.title for b in resp.books], ["Dune Messiah"])
+
+    def test_search_books_isbn_is_exact_lookup(self):
+        """An ISBN query returns only the book with that ISBN."""
+        login_req = auth_pb2.LoginRequest(
+            username="staff1",
+            password="password123"
+        )
+        login_resp = self.handler.Login(login_req, self.ctx)
+        self.ctx.set_metadata(
+            "authorization",
+            f"Bearer {login_resp.token}"
+        )
+        session = self.Session()
+        BookRepository.create(session, "Dune", "Frank Herbert", "9780441013593")
+        BookRepository.create(session, "Emma", "Jane Austen", "9780141439587")
+        session.close()
+        req = library_pb2.SearchBooksRequest(query="978-0-441-01359-3")
+        resp = self.handler.SearchBooks(req, self.ctx)
+        self.assertEqual(self.ctx._code, None)
+        self.assertEqual([b.title for b in resp.books], ["Dune"])
+        self.assertEqual(resp.pagination.next_page_token, "")
+
+    def test_search_books_rejects_blank_query_and_bad_token(self):
+        """SearchBooks returns INVALID_ARGUMENT for a blank query or bad token."""
+        login_req = auth_pb2.LoginRequest(
+            username="staff1",
+            password="password123"
+        )
+        login_resp = self.handler.Login(login_req, self.ctx)
+        self.ctx.set_metadata(
+            "authorization",
+            f"Bearer {login_resp.token}"
+        )
+        self.handler.SearchBooks(
+            library_pb2.SearchBooksRequest(query="  "), self.ctx
+        )
+        self.assertEqual(self.ctx._code, grpc.StatusCode.INVALID_ARGUMENT)
+        self.ctx._code = None
+        req = library_pb2.SearchBooksRequest(query="dune")
+        req.pagination.page_token = "garbage"
+        self.handler.SearchBooks(req, self.ctx)
+        self.assertEqual(self.ctx._code, grpc.StatusCode.INVALID_ARGUMENT)
+
+    def test_list_books_cached_count_reports_exactness(self):
+        """ListBooks with COUNT_MODE_CACHED flags cached totals as inexact."""
+        from util.count_strategy import count_cache
+        count_cache.clear()
+        login_req = auth_pb2.LoginRequest(
+            username="staff1",
+            password="password123"
+        )
+        login_resp = self.handler.Login(login_req, self.ctx)
+        self.ctx.set_metadata(
+            "authorization",
+            f"Bearer {login_resp.token}"
+        )
+        session = self.Session()
+        BookRepository.create(session, "Cached", "Author")
+        session.close()
+
+        req = library_pb2.ListBooksRequest()
+        req.pagination.page = 1
+        req.pagination.limit = 10
+        req.pagination.count_mode = library_pb2.COUNT_MODE_CACHED
+        first = self.handler.ListBooks(req, self.ctx)
+        second = self.handler.ListBooks(req, self.ctx)
+        self.assertEqual(first.pagination.total_count, 1)
+        self.assertTrue(first.pagination.total_count_exact)
+        self.assertEqual(second.pagination.total_count, 1)
+        self.assertFalse(second.pagination.total_count_exact)
+        count_cache.clear()
 
     def test_list_copies_by_book_returns_copies_with_pagination(self):
         """ListCopiesByBook returns copies for book with pagination."""
@@ -439,3 +706,339 @@ class TestLibraryIntegration(unittest.TestCase):
         self.assertEqual(self.ctx._code, None)
         self.assertEqual(len(resp.copies), 0)
         self.assertEqual(resp.pagination.total_count, 0)
+
+    def test_stream_books_sends_all_books_in_chunks(self):
+        """StreamBooks returns every book with copy counts, chunk_size per message."""
+        login_req = auth_pb2.LoginRequest(
+            username="staff1",
+            password="password123"
+        )
+        login_resp = self.handler.Login(login_req, self.ctx)
+        self.ctx.set_metadata(
+            "authorization",
+            f"Bearer {login_resp.token}"
+        )
+
+        session = self.Session()
+        book_ids = []
+        for i in range(5):
+            book_ids.append(
+                BookRepository.create(session, f"Book {i}", "Author").id
+            )
+        BookCopyRepository.create(session, book_ids[0], "1", "available")
+        BookCopyRepository.create(session, book_ids[0], "2", "available")
+        session.close()
+
+        chunks = list(self.handler.StreamBooks(
+            library_pb2.StreamBooksRequest(chunk_size=2), self.ctx
+        ))
+        self.assertEqual(self.ctx._code, None)
+        self.assertEqual([len(c.books) for c in chunks], [2, 2, 1])
+        books = [b for c in chunks for b in c.books]
+        self.assertEqual([b.id for b in books], sorted(book_ids))
+        counts = {b.id: b.copy_count for b in books}
+        self.assertEqual(counts[book_ids[0]], 2)
+        self.assertEqual(counts[book_ids[1]], 0)
+
+    def test_stream_borrows_filters_active_by_member(self):
+        """StreamBorrows honours member_id and active_only."""
+        login_req = auth_pb2.LoginRequest(
+            username="staff1",
+            password="password123"
+        )
+        login_resp = self.handler.Login(login_req, self.ctx)
+        self.ctx.set_metadata(
+            "authorization",
+            f"Bearer {login_resp.token}"
+        )
+
+        session = self.Session()
+        book = BookRepository.create(session, "Streamed", "Author")
+        copy1 = BookCopyRepository.create(session, book.id, "1", "available")
+        copy2 = BookCopyRepository.create(session, book.id, "2", "available")
+        copy1_id, copy2_id = copy1.id, copy2.id
+        session.close()
+        member_id = self.handler.CreateMember(
+            library_pb2.CreateMemberRequest(name="Jane", email="j@x.com"),
+            self.ctx
+        ).member.id
+        for copy_id in (copy1_id, copy2_id):
+            self.handler.BorrowBook(
+                library_pb2.BorrowBookRequest(
+                    copy_id=copy_id, member_id=member_id
+                ),
+                self.ctx
+            )
+        self.handler.ReturnBook(
+            library_pb2.ReturnBookRequest(copy_id=copy1_id), self.ctx
+        )
+
+        req = library_pb2.StreamBorrowsRequest(
+            member_id=member_id, active_only=True
+        )
+        borrows = [
+            b for c in self.handler.StreamBorrows(req, self.ctx)
+            for b in c.borrows
+        ]
+        self.assertEqual(self.ctx._code, None)
+        self.assertEqual(len(borrows), 1)
+        self.assertEqual(borrows[0].copy_id, copy2_id)
+        self.assertEqual(borrows[0].book.title, "Streamed")
+        self.assertEqual(borrows[0].member.name, "Jane")
+
+    def test_list_borrowings_statement_count_independent_of_page_size(self):
+        """ListBorrowings runs the same statements for one borrow or many."""
+        login_resp = self.handler.Login(
+            auth_pb2.LoginRequest(username="staff1", password="password123"),
+            self.ctx
+        )
+        self.ctx.set_metadata("authorization", f"Bearer {login_resp.token}")
+        session = self.Session()
+        book = BookRepository.create(session, "Counted", "Author")
+        copy_ids = [
+            BookCopyRepository.create(session, book.id, str(i), "available").id
+            for i in range(3)
+        ]
+        session.close()
+        member_id = self.handler.CreateMember(
+            library_pb2.CreateMemberRequest(name="Jane", email="j@x.com"),
+            self.ctx
+        ).member.id
+
+        counts = []
+        for batch in copy_ids[:1], copy_ids[1:]:
+            for copy_id in batch:
+                self.handler.BorrowBook(
+                    library_pb2.BorrowBookRequest(
+                        copy_id=copy_id, member_id=member_id
+                    ),
+                    self.ctx
+                )
+            with request_scope.rpc_scope(max_queries=2, strict=True) as scope:
+                self.handler.ListBorrowings(
+                    library_pb2.ListBorrowingsRequest(member_id=member_id),
+                    self.ctx
+                )
+            counts.append(scope.queries)
+        self.assertEqual(self.ctx._code, None)
+        self.assertEqual(counts[0], counts[1])
+
+    def test_stream_members_requires_auth(self):
+        """StreamMembers without a token sends nothing and is UNAUTHENTICATED."""
+        chunks = list(self.handler.StreamMembers(
+            library_pb2.StreamMembersRequest(), self.ctx
+        ))
+        self.assertEqual(chunks, [])
+        self.assertEqual(self.ctx._code, grpc.StatusCode.UNAUTHENTICATED)
+
+    def test_bulk_import_books_reports_row_errors(self):
+        """BulkImportBooks inserts valid rows and reports rejected ones by position."""
+        login_req = auth_pb2.LoginRequest(
+            username="staff1",
+            password="password123"
+        )
+        login_resp = self.handler.Login(login_req, self.ctx)
+        self.ctx.set_metadata(
+            "authorization",
+            f"Bearer {login_resp.token}"
+        )
+
+        requests = [
+            library_pb2.BulkImportBooksRequest(books=[
+                library_pb2.ImportBookRow(
+                    title="Dune", author="Herbert", copy_numbers=["1", "2"]
+                ),
+                library_pb2.ImportBookRow(title="", author="Nobody"),
+            ]),
+            library_pb2.BulkImportBooksRequest(books=[
+                library_pb2.ImportBookRow(
+                    title="Emma", author="Austen", copy_numbers=["1", "1"]
+                ),
+                library_pb2.ImportBookRow(
+                    title="Ulysses", author="Joyce", isbn="9780141182803"
+                ),
+            ]),
+        ]
+        resp = self.handler.BulkImportBooks(iter(requests), self.ctx)
+        self.assertEqual(self.ctx._code, None)
+        self.assertEqual(resp.books_imported, 2)
+        self.assertEqual(resp.copies_imported, 2)
+        self.assertEqual([e.row for e in resp.errors], [1, 2])
+
+        session = self.Session()
+        books = {b.title: b for b in session.query(Book).all()}
+        self.assertEqual(set(books), {"Dune", "Ulysses"})
+        self.assertEqual(
+            BookCopyRepository.count_by_book_id(session, books["Dune"].id), 2
+        )
+        self.assertEqual(books["Ulysses"].isbn, "9780141182803")
+        session.close()
+
+    def test_bulk_import_books_commits_in_batches(self):
+        """bulk_import_books splits rows into batch_size batches."""
+        rows = (
+            BookImportRow(f"Book {i}", "Author", None, [str(i)])
+            for i in range(5)
+        )
+        session = self.Session()
+        books, copies, errors = LibraryService.bulk_import_books(
+            session, rows, batch_size=2
+        )
+        self.assertEqual((books, copies, errors), (5, 5, []))
+        self.assertEqual(session.query(Book).count(), 5)
+        session.close()
+
+    def test_bulk_import_books_requires_auth(self):
+        """BulkImportBooks without a token is UNAUTHENTICATED."""
+        resp = self.handler.BulkImportBooks(iter([]), self.ctx)
+        self.assertEqual(resp.books_imported, 0)
+        self.assertEqual(self.ctx._code, grpc.StatusCode.UNAUTHENTICATED)
+
+    def test_borrow_books_and_return_books_report_per_item_results(self):
+        """BorrowBooks/ReturnBooks borrow and return what they can and report the rest."""
+        login_req = auth_pb2.LoginRequest(
+            username="staff1",
+            password="password123"
+        )
+        login_resp = self.handler.Login(login_req, self.ctx)
+        self.ctx.set_metadata(
+            "authorization",
+            f"Bearer {login_resp.token}"
+        )
+
+        session = self.Session()
+        book = BookRepository.create(session, "Batch", "Author")
+        copy_ids = [
+            BookCopyRepository.create(session, book.id, str(i), "available").id
+            for i in range(3)
+        ]
+        lost = BookCopyRepository.create(session, book.id, "lost", "lost")
+        lost_id = lost.id
+        session.close()
+        member_id = self.handler.CreateMember(
+            library_pb2.CreateMemberRequest(name="Jane", email="j@x.com"),
+            self.ctx
+        ).member.id
+
+        requested = copy_ids + [lost_id, "missing", copy_ids[0]]
+        resp = self.handler.BorrowBooks(
+            library_pb2.BorrowBooksRequest(
+                member_id=member_id, copy_ids=requested
+            ),
+            self.ctx
+        )
+        self.assertEqual(self.ctx._code, None)
+        self.assertEqual([r.copy_id for r in resp.results], requested)
+        self.assertEqual(
+            [r.error for r in resp.results],
+            ["", "", "", "Book not available", "Copy not found",
+             "Duplicate copy_id in request"]
+        )
+        for result in resp.results[:3]:
+            self.assertEqual(result.borrow.status, "active")
+            self.assertEqual(result.borrow.member_id, member_id)
+            self.assertEqual(result.borrow.book.title, "Batch")
+
+        session = self.Session()
+        self.assertEqual(
+            {BookCopyRepository.find_by_id(session, c).status for c in copy_ids},
+            {"checked_out"}
+        )
+        session.close()
+
+        resp = self.handler.ReturnBooks(
+            library_pb2.ReturnBooksRequest(copy_ids=copy_ids[:2] + [lost_id]),
+            self.ctx
+        )
+        self.assertEqual(
+            [r.error for r in resp.results],
+            ["", "", "No active borrow for this copy"]
+        )
+        self.assertEqual(resp.results[0].borrow.status, "returned")
+        self.assertTrue(resp.results[0].borrow.returned_at)
+
+        session = self.Session()
+        statuses = [
+            BookCopyRepository.find_by_id(session, c).status for c in copy_ids
+        ]
+        self.assertEqual(statuses, ["available", "available", "checked_out"])
+        session.close()
+
+    def test_borrow_books_validates_request(self):
+        """BorrowBooks rejects empty batches and unknown members."""
+        login_req = auth_pb2.LoginRequest(
+            username="staff1",
+            password="password123"
+        )
+        login_resp = self.handler.Login(login_req, self.ctx)
+        self.ctx.set_metadata(
+            "authorization",
+            f"Bearer {login_resp.token}"
+        )
+
+        self.handler.BorrowBooks(
+            library_pb2.BorrowBooksRequest(member_id="x"), self.ctx
+        )
+        self.assertEqual(self.ctx._code, grpc.StatusCode.INVALID_ARGUMENT)
+
+        self.handler.BorrowBooks(
+            library_pb2.BorrowBooksRequest(member_id="x", copy_ids=["c"]),
+            self.ctx
+        )
+        self.assertEqual(self.ctx._code, grpc.StatusCode.FAILED_PRECONDITION)
+        self.assertEqual(self.ctx._details, "Member not found")
+
+    def test_borrow_book_strategies_share_error_semantics(self):
+        """Atomic and locking borrow return the same errors."""
+        session = self.Session()
+        book = BookRepository.create(session, "Strategies", "Author")
+        copy = BookCopyRepository.create(session, book.id, "1", "available")
+        missing = BookCopyRepository.create(session, book.id, "2", "available")
+        member = MemberRepository.create(session, "Jane", "j@x.com")
+        copy_id, missing_id, member_id = copy.id, missing.id, member.id
+        session.close()
+
+        for strategy in ("atomic", "locking"):
+            session = self.Session()
+            _, error = LibraryService.borrow_book(
+                session, generate_ulid(), member_id, strategy
+            )
+            self.assertEqual(error, "Copy not found", strategy)
+            _, error = LibraryService.borrow_book(
+                session, missing_id, generate_ulid(), strategy
+            )
+            self.assertEqual(error, "Member not found", strategy)
+            borrow, error = LibraryService.borrow_book(
+                session, copy_id, member_id, strategy
+            )
+            self.assertIsNone(error, strategy)
+            self.assertEqual(borrow.status, "active")
+            _, error = LibraryService.borrow_book(
+                session, copy_id, member_id, strategy
+            )
+            self.assertEqual(error, "Book not available", strategy)
+            LibraryService.return_book(session, copy_id)
+            session.close()
+
+    def test_borrow_book_relies_on_active_borrow_constraint(self):
+        """An active borrow on an 'available' copy is caught by the unique index."""
+        session = self.Session()
+        book = BookRepository.create(session, "Stale", "Author")
+        copy = BookCopyRepository.create(session, book.id, "1", "available")
+        member = MemberRepository.create(session, "Jane", "j@x.com")
+        copy_id, member_id = copy.id, member.id
+        BorrowRepository.create(session, copy_id, member_id)
+        session.close()
+
+        for strategy in ("atomic", "locking"):
+            session = self.Session()
+            borrow, error = LibraryService.borrow_book(
+                session, copy_id, member_id, strategy
+            )
+            self.assertIsNone(borrow, strategy)
+            self.assertEqual(error, "Book not available", strategy)
+            self.assertEqual(
+                BookCopyRepository.find_by_id(session, copy_id).status,
+                "available"
+            )
+            session.close()
@@ -0,0 +1,151 @@
+"""
+Tests for the per-RPC metrics interceptors.
+"""
+import sys
+from pathlib import Path
+
+root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(root / "src"))
+sys.path.insert(0, str(root / "src" / "generated"))
+
+import collections
+import unittest
+
+import grpc
+from prometheus_client import REGISTRY
+
+from app.library.interceptor import AsyncMetricsInterceptor, MetricsInterceptor
+
+_CallDetails = collections.namedtuple(
+    "_CallDetails", ["method", "invocation_metadata"]
+)
+
+
+class Aborted(Exception):
+    """Raised by MockContext.abort."""
+
+
+class MockContext:
+    """Mock gRPC context recording the status code."""
+
+    def __init__(self):
+        self._code = None
+
+    def set_code(self, code):
+        """Set status code."""
+        self._code = code
+
+    def code(self):
+        """Return the status code set so far."""
+        return self._code
+
+    def abort(self, code, details):
+        """Set status and stop the call."""
+        self._code = code
+        raise Aborted()
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def _responses(method, code):
+    return _sample("rpc_responses_total", method=method, code=code)
+
+
+class TestMetricsInterceptor(unittest.TestCase):
+    """Tests for MetricsInterceptor."""
+
+    def _call(self, method, behavior, streaming=False):
+        factory = (
+            grpc.unary_stream_rpc_method_handler if streaming
+            else grpc.unary_unary_rpc_method_handler
+        )
+        handler = MetricsInterceptor().intercept_service(
+            lambda details: factory(behavior),
+            _CallDetails(f"/library.LibraryService/{method}", ())
+        )
+        context = MockContext()
+        if streaming:
+            return list(handler.unary_stream(None, context))
+        return handler.unary_unary(None, context)
+
+    def test_ok_call_records_latency_and_status(self):
+        """A normal call is counted OK, timed, and not left in flight."""
+        before = _responses("MetricsOk", "OK")
+        timed = _sample("rpc_latency_seconds_count", method="MetricsOk")
+
+        def behavior(request, context):
+            self.assertEqual(
+                _sample("rpc_in_flight", method="MetricsOk"), 1
+            )
+            return "done"
+
+        self.assertEqual(self._call("MetricsOk", behavior), "done")
+        self.assertEqual(_responses("MetricsOk", "OK"), before + 1)
+        self.assertEqual(
+            _sample("rpc_latency_seconds_count", method="MetricsOk"),
+            timed + 1
+        )
+        self.assertEqual(_sample("rpc_in_flight", method="MetricsOk"), 0)
+
+    def test_status_set_by_handler_is_recorded(self):
+        """set_code and abort statuses are recorded instead of OK."""
+        def not_found(request, context):
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+
+        def aborts(request, context):
+            context.abort(grpc.StatusCode.UNAUTHENTICATED, "no")
+
+        before = _responses("MetricsStatus", "NOT_FOUND")
+        self._call("MetricsStatus", not_found)
+        self.assertEqual(_responses("MetricsStatus", "NOT_FOUND"), before + 1)
+        before = _responses("MetricsStatus", "UNAUTHENTICATED")
+        with self.assertRaises(Aborted):
+            self._call("MetricsStatus", aborts)
+        self.assertEqual(
+            _responses("MetricsStatus", "UNAUTHENTICATED"), before + 1
+        )
+
+    def test_unhandled_exception_is_unknown(self):
+        """A handler crash counts as UNKNOWN."""
+        def crashes(request, context):
+            raise RuntimeError()
+
+        before = _responses("MetricsCrash", "UNKNOWN")
+        with self.assertRaises(RuntimeError):
+            self._call("MetricsCrash", crashes)
+        self.assertEqual(_responses("MetricsCrash", "UNKNOWN"), before + 1)
+
+    def test_streaming_call_recorded_once(self):
+        """A streaming call is recorded once, after its last response."""
+        def stream(request, context):
+            yield 1
+            yield 2
+
+        before = _responses("MetricsStream", "OK")
+        self.assertEqual(self._call("MetricsStream", stream, True), [1, 2])
+        self.assertEqual(_responses("MetricsStream", "OK"), before + 1)
+
+
+class TestAsyncMetricsInterceptor(unittest.IsolatedAsyncioTestCase):
+    """Tests for AsyncMetricsInterceptor."""
+
+    async def test_ok_call_records_status(self):
+        """An async call is counted with its status."""
+        async def behavior(request, context):
+            return "done"
+
+        async def continuation(details):
+            return grpc.unary_unary_rpc_method_handler(behavior)
+
+        handler = await AsyncMetricsInterceptor().intercept_service(
+            continuation, _CallDetails("/library.LibraryService/MetricsAio", ())
+        )
+        before = _responses("MetricsAio", "OK")
+        self.assertEqual(await handler.unary_unary(None, MockContext()), "done")
+        self.assertEqual(_responses("MetricsAio", "OK"), before + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,195 @@
+"""
+EXPLAIN regression tests for the hot list queries.
+
+Each repository call is run against SQLite with the model schema and
+ANALYZE statistics from a seeded catalog. The SELECTs it issues are captured
+and passed through EXPLAIN QUERY PLAN. A plan that scans a table without an
+index, or sorts the whole result in a temporary b-tree instead of reading an
+index in order, fails the test.
+"""
+import sys
+from pathlib import Path
+
+root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(root / "src"))
+sys.path.insert(0, str(root / "src" / "generated"))
+
+import unittest
+from datetime import datetime
+from sqlalchemy import create_engine, event, select, text
+from sqlalchemy.orm import sessionmaker
+
+from models.base import Base
+from models.book_copy import BookCopy
+from util.ulid_util import generate_ulid
+from app.library.library_service import BookImportRow, LibraryService
+from app.library.repository import (
+    BookRepository,
+    BookCopyRepository,
+    BorrowRepository,
+    MemberRepository,
+)
+
+CURSOR = (datetime(2025, 1, 1), generate_ulid())
+BOOKS = 500
+COPIES_PER_BOOK = 5
+MEMBERS = 100
+
+
+def seed(session):
+    """Load a small catalog with borrows so ANALYZE has realistic statistics."""
+    LibraryService.bulk_import_books(
+        session,
+        (
+            BookImportRow(
+                f"Title {i % 50}",
+                "Author",
+                None,
+                [str(n) for n in range(COPIES_PER_BOOK)]
+            )
+            for i in range(BOOKS)
+        ),
+        batch_size=BOOKS
+    )
+    member_ids = [
+        MemberRepository.create(session, f"Member {i}", f"m{i}@x.com").id
+        for i in range(MEMBERS)
+    ]
+    copy_ids = session.scalars(
+        select(BookCopy.id).where(BookCopy.copy_number == "0")
+    ).all()
+    for i, copy_id in enumerate(copy_ids):
+        LibraryService.borrow_book(session, copy_id, member_ids[i % MEMBERS])
+    session.execute(text("ANALYZE"))
+    session.commit()
+
+
+class TestHotQueryPlans(unittest.TestCase):
+    """Hot list queries must be served by indexes."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Create and seed the schema once on an in-memory SQLite engine."""
+        cls.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(cls.engine)
+        cls.session = sessionmaker(bind=cls.engine)()
+        seed(cls.session)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Close session."""
+        cls.session.close()
+        cls.engine.dispose()
+
+    def setUp(self):
+        """Capture SELECTs issued during the test."""
+        self.statements = []
+        event.listen(self.engine, "before_cursor_execute", self._capture)
+
+    def tearDown(self):
+        event.remove(self.engine, "before_cursor_execute", self._capture)
+
+    def _capture(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            self.statements.append((statement, parameters))
+
+    def _plans(self, call) -> list[str]:
+        """Run call and return the EXPLAIN QUERY PLAN details of its SELECTs."""
+        self.statements.clear()
+        call()
+        captured = list(self.statements)
+        self.assertTrue(captured, "call issued no SELECT")
+        connection = self.session.connection()
+        plans = []
+        for statement, parameters in captured:
+            rows = connection.exec_driver_sql(
+                "EXPLAIN QUERY PLAN " + statement, parameters
+            ).fetchall()
+            plans.append("\n".join(row[-1] for row in rows))
+        return plans
+
+    def assertIndexed(self, call):
+        """Fail if any SELECT issued by call scans without an index or sorts."""
+        for plan in self._plans(call):
+            for line in plan.splitlines():
+                line = line.strip()
+                if line.startswith("SCAN") and "USING" not in line:
+                    self.fail(f"Sequential scan:\n{plan}")
+                # "RIGHT PART OF ORDER BY" only sorts within groups that an
+                # index already delivers in order; a full sort is a miss.
+                if "TEMP B-TREE FOR ORDER BY" in line:
+                    self.fail(f"Sort without index:\n{plan}")
+
+    def test_list_books(self):
+        """Books newest first, by offset and by keyset."""
+        self.assertIndexed(lambda: BookRepository.list_all(self.session, 20, 40))
+        self.assertIndexed(
+            lambda: BookRepository.list_all(self.session, 20, after=CURSOR)
+        )
+
+    def test_find_books_by_isbn(self):
+        """SearchBooks exact ISBN lookup."""
+        self.assertIndexed(
+            lambda: BookRepository.find_by_isbns(
+                self.session, ["9780441013593", "978-0-441-01359-3"]
+            )
+        )
+
+    def test_list_members(self):
+        """Members newest first, by offset and by keyset."""
+        self.assertIndexed(lambda: MemberRepository.list_all(self.session, 20, 40))
+        self.assertIndexed(
+            lambda: MemberRepository.list_all(self.session, 20, after=CURSOR)
+        )
+
+    def test_list_copies_by_book(self):
+        """Copies of a book ordered by copy_number."""
+        book_id = generate_ulid()
+        self.assertIndexed(
+            lambda: BookCopyRepository.list_by_book_id(self.session, book_id)
+        )
+        self.assertIndexed(
+            lambda: BookCopyRepository.find_by_book_and_copy_number(
+                self.session, book_id, "1"
+            )
+        )
+
+    def test_count_copies_by_book_ids(self):
+        """Batch copy counts for a page of books."""
+        self.assertIndexed(
+            lambda: BookCopyRepository.count_by_book_ids(
+                self.session, [generate_ulid(), generate_ulid()]
+            )
+        )
+
+    def test_list_available_copies_with_book(self):
+        """Available copies joined to books, ordered by title and copy_number."""
+        self.assertIndexed(
+            lambda: BookCopyRepository.list_all_available_with_book(
+                self.session, 20, 40
+            )
+        )
+
+    def test_list_active_borrows(self):
+        """Active borrows, all and per member, newest first."""
+        member_id = generate_ulid()
+        self.assertIndexed(
+            lambda: BorrowRepository.list_active(self.session, member_id, 20)
+        )
+        self.assertIndexed(
+            lambda: BorrowRepository.list_active(self.session, limit=20)
+        )
+        self.assertIndexed(
+            lambda: BorrowRepository.list_active(
+                self.session, limit=20, after=CURSOR
+            )
+        )
+        self.assertIndexed(
+            lambda: BorrowRepository.find_active_by_copy_id(
+                self.session, generate_ulid()
+            )
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
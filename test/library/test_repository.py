@@ -9,8 +9,11 @@ sys.path.insert(0, str(root / "src"))
 sys.path.insert(0, str(root / "src" / "generated"))
 
 import unittest
-from sqlalchemy import create_engine
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm.exc import StaleDataError
 
 from models.base import Base
 from models.book import Book
@@ -33,6 +36,19 @@ def get_test_session():
     return sessionmaker(bind=engine)()
 
 
+def walk_pages(list_page, key, limit=2, max_pages=10):
+    """Follow keyset cursors from list_page(limit, after); return row ids."""
+    ids = []
+    after = None
+    for _ in range(max_pages):
+        rows = list_page(limit=limit, after=after)
+        ids.extend(row.id for row in rows)
+        if len(rows) < limit:
+            return ids
+        after = (getattr(rows[-1], key), rows[-1].id)
+    raise AssertionError(f"no last page after {max_pages} pages: {ids}")
+
+
 class TestBookRepository(unittest.TestCase):
     """Tests for BookRepository."""
 
@@ -83,6 +99,114 @@ class TestBookRepository(unittest.TestCase):
             self.session, book.id, title="Updated"
         )
         self.assertEqual(updated.title, "Updated")
+        self.assertEqual(updated.author, "Author")
+
+    def test_update_bumps_version_and_compares_expected_version(self):
+        """update bumps version and only applies at expected_version."""
+        book = BookRepository.create(
+            self.session, title="Original", author="Author"
+        )
+        self.assertEqual(book.version, 1)
+        updated = BookRepository.update(
+            self.session, book.id, title="Second", expected_version=1
+        )
+        self.assertEqual(updated.version, 2)
+        self.assertIsNone(BookRepository.update(
+            self.session, book.id, title="Stale", expected_version=1
+        ))
+        self.assertIsNone(BookRepository.update(
+            self.session, generate_ulid(), title="Missing"
+        ))
+        self.session.expire_all()
+        self.assertEqual(
+            BookRepository.find_by_id(self.session, book.id).title, "Second"
+        )
+
+    def test_orm_flush_of_stale_book_raises(self):
+        """The ORM checks version when flushing a book changed elsewhere."""
+        book = BookRepository.create(
+            self.session, title="Original", author="Author"
+        )
+        self.session.connection().execute(
+            update(Book.__table__)
+            .where(Book.__table__.c.id == book.id)
+            .values(version=2)
+        )
+        book.title = "Overwritten"
+        with self.assertRaises(StaleDataError):
+            self.session.commit()
+
+    def test_list_all_after_cursor_returns_next_rows(self):
+        """list_all with a (created_at, id) cursor resumes after it."""
+        base = datetime(2025, 1, 1, 12, 0, 0)
+        for i in range(5):
+            self.session.add(Book(
+                id=generate_ulid(),
+                title=f"Book {i}",
+                author="Author",
+                created_at=base + timedelta(minutes=i)
+            ))
+        self.session.commit()
+        first = BookRepository.list_all(self.session, limit=2)
+        self.assertEqual([b.title for b in first], ["Book 4", "Book 3"])
+        last = first[-1]
+        second = BookRepository.list_all(
+            self.session, limit=2, after=(last.created_at, last.id)
+        )
+        self.assertEqual([b.title for b in second], ["Book 2", "Book 1"])
+
+    def test_list_all_after_cursor_breaks_timestamp_ties_by_id(self):
+        """Rows sharing created_at are split across pages by id."""
+        ts = datetime(2025, 1, 1, 12, 0, 0)
+        ids = sorted(generate_ulid() for _ in range(3))
+        for book_id in ids:
+            self.session.add(Book(
+                id=book_id, title=book_id, author="A", created_at=ts
+            ))
+        self.session.commit()
+        first = BookRepository.list_all(self.session, limit=2)
+        second = BookRepository.list_all(
+            self.session, limit=2, after=(first[-1].created_at, first[-1].id)
+        )
+        self.assertEqual(
+            [b.id for b in first + second],
+            list(reversed(ids))
+        )
+
+    def test_list_all_cursor_walks_rows_created_with_defaults(self):
+        """Pages over books created without explicit timestamps end."""
+        ids = [
+            BookRepository.create(
+                self.session, title=f"Book {i}", author="Author"
+            ).id
+            for i in range(5)
+        ]
+        pages = walk_pages(
+            lambda **kw: BookRepository.list_all(self.session, **kw),
+            "created_at"
+        )
+        self.assertEqual(pages, list(reversed(ids)))
+
+    def test_search_cursor_pages_through_tied_ranks_by_id(self):
+        """Books with equal rank are paged in id order, each once."""
+        ids = sorted(
+            BookRepository.create(
+                self.session, title=f"Dune {i}", author="Frank Herbert"
+            ).id
+            for i in range(5)
+        )
+        pages = []
+        after = None
+        for _ in range(5):
+            rows = BookRepository.search(
+                self.session, "dune", limit=2, after=after
+            )
+            pages.extend(book.id for book, _ in rows)
+            if len(rows) < 2:
+                break
+            book, rank = rows[-1]
+            after = (rank, book.id)
+        self.assertEqual(pages, ids)
 
 
 class TestBookCopyRepository(unittest.TestCase):
@@ -238,6 +362,106 @@ class TestBookCopyRepository(unittest.TestCase):
         self.assertEqual(result[0].book_id, self.book.id)
 
 
+class TestBookCounts(unittest.TestCase):
+    """Denormalized copy_count / available_count on books."""
+
+    def setUp(self):
+        """Create test session and a book."""
+        self.session = get_test_session()
+        self.book = BookRepository.create(
+            self.session, title="Test", author="Author"
+        )
+        self.book_id = self.book.id
+
+    def tearDown(self):
+        """Close session."""
+        self.session.close()
+
+    def counts(self) -> tuple[int, int]:
+        """Stored (copy_count, available_count) for the book."""
+        self.session.expire_all()
+        book = self.session.get(Book, self.book_id)
+        return book.copy_count, book.available_count
+
+    def test_create_copy_updates_counts(self):
+        """create counts every copy and only available ones as available."""
+        BookCopyRepository.create(self.session, self.book_id, "1", "available")
+        BookCopyRepository.create(self.session, self.book_id, "2", "lost")
+        self.assertEqual(self.counts(), (2, 1))
+
+    def test_bulk_insert_updates_counts(self):
+        """bulk_insert adjusts counts per book."""
+        BookCopyRepository.bulk_insert(self.session, [
+            {"id": generate_ulid(), "book_id": self.book_id,
+             "copy_number": str(n), "status": "available"}
+            for n in range(3)
+        ])
+        self.session.commit()
+        self.assertEqual(self.counts(), (3, 3))
+
+    def test_update_status_updates_available_count_on_flips_only(self):
+        """Only changes into or out of available move available_count."""
+        copy = BookCopyRepository.create(
+            self.session, self.book_id, "1", "available"
+        )
+        BookCopyRepository.update_status(self.session, copy.id, "checked_out")
+        self.assertEqual(self.counts(), (1, 0))
+        BookCopyRepository.update_status(self.session, copy.id, "lost")
+        self.assertEqual(self.counts(), (1, 0))
+        BookCopyRepository.update_status(self.session, copy.id, "available")
+        BookCopyRepository.update_status(self.session, copy.id, "available")
+        self.assertEqual(self.counts(), (1, 1))
+
+    def test_counts_and_status_changes_leave_book_version(self):
+        """Count changes keep the book's version; the copy's is bumped."""
+        copy = BookCopyRepository.create(
+            self.session, self.book_id, "1", "available"
+        )
+        BookCopyRepository.update_status(self.session, copy.id, "checked_out")
+        self.session.expire_all()
+        self.assertEqual(self.session.get(Book, self.book_id).version, 1)
+        self.assertEqual(self.session.get(BookCopy, copy.id).version, 2)
+
+    def test_bulk_update_status_updates_available_count(self):
+        """bulk_update_status counts only the copies whose availability flips."""
+        ids = [
+            BookCopyRepository.create(
+                self.session, self.book_id, str(n), status
+            ).id
+            for n, status in enumerate(["available", "available", "lost"])
+        ]
+        BookCopyRepository.bulk_update_status(self.session, ids, "checked_out")
+        self.session.commit()
+        self.assertEqual(self.counts(), (3, 0))
+        BookCopyRepository.bulk_update_status(self.session, ids, "available")
+        self.session.commit()
+        self.assertEqual(self.counts(), (3, 3))
+
+    def test_create_if_available_decrements_available_count(self):
+        """Claiming a copy decrements available_count in the same transaction."""
+        copy = BookCopyRepository.create(
+            self.session, self.book_id, "1", "available"
+        )
+        member = MemberRepository.create(self.session, "Jane", "j@x.com")
+        BorrowRepository.create_if_available(self.session, copy.id, member.id)
+        self.session.commit()
+        self.assertEqual(self.counts(), (1, 0))
+
+    def test_reconcile_counts_fixes_drift(self):
+        """reconcile_counts recomputes drifted counts and reports how many."""
+        BookCopyRepository.create(self.session, self.book_id, "1", "available")
+        other = BookRepository.create(self.session, "Other", "Author")
+        self.session.query(Book).filter(Book.id == self.book_id).update(
+            {"copy_count": 7, "available_count": 5}
+        )
+        self.session.commit()
+        self.assertEqual(BookRepository.reconcile_counts(self.session), 1)
+        self.assertEqual(self.counts(), (1, 1))
+        self.session.refresh(other)
+        self.assertEqual((other.copy_count, other.available_count), (0, 0))
+        self.assertEqual(BookRepository.reconcile_counts(self.session), 0)
+
+
 class TestMemberRepository(unittest.TestCase):
     """Tests for MemberRepository."""
 
@@ -257,6 +481,33 @@ class TestMemberRepository(unittest.TestCase):
         result = MemberRepository.find_by_id(self.session, member.id)
         self.assertEqual(result.email, "jane@example.com")
 
+    def test_update_compares_expected_version(self):
+        """update applies at the current version and bumps it."""
+        member = MemberRepository.create(
+            self.session, name="Jane", email="jane@example.com"
+        )
+        updated = MemberRepository.update(
+            self.session, member.id, name="Janet", expected_version=1
+        )
+        self.assertEqual((updated.name, updated.version), ("Janet", 2))
+        self.assertIsNone(MemberRepository.update(
+            self.session, member.id, name="Stale", expected_version=1
+        ))
+
+    def test_list_all_cursor_walks_rows_created_with_defaults(self):
+        """Pages over members created without explicit timestamps end."""
+        ids = [
+            MemberRepository.create(
+                self.session, name=f"Member {i}", email=f"m{i}@example.com"
+            ).id
+            for i in range(5)
+        ]
+        pages = walk_pages(
+            lambda **kw: MemberRepository.list_all(self.session, **kw),
+            "created_at"
+        )
+        self.assertEqual(pages, list(reversed(ids)))
+
 
 class TestBorrowRepository(unittest.TestCase):
     """Tests for BorrowRepository."""
@@ -295,3 +546,94 @@ class TestBorrowRepository(unittest.TestCase):
         )
         self.assertIsNotNone(result)
         self.assertEqual(result.id, borrow.id)
+
+    def test_create_if_available_claims_copy(self):
+        """create_if_available creates the borrow and checks the copy out."""
+        borrow = BorrowRepository.create_if_available(
+            self.session, self.copy.id, self.member.id
+        )
+        self.session.commit()
+        self.assertIsNotNone(borrow)
+        self.assertEqual(borrow.status, "active")
+        self.assertEqual(borrow.member_id, self.member.id)
+        self.session.refresh(self.copy)
+        self.assertEqual(self.copy.status, "checked_out")
+
+    def test_create_if_available_rejects_unavailable_copy(self):
+        """create_if_available returns None for a copy already checked out."""
+        BorrowRepository.create_if_available(
+            self.session, self.copy.id, self.member.id
+        )
+        self.session.commit()
+        again = BorrowRepository.create_if_available(
+            self.session, self.copy.id, self.member.id
+        )
+        self.assertIsNone(again)
+        self.assertEqual(self.session.query(Borrow).count(), 1)
+
+    def test_create_if_available_rejects_unknown_member(self):
+        """create_if_available leaves the copy available when the member is missing."""
+        borrow = BorrowRepository.create_if_available(
+            self.session, self.copy.id, generate_ulid()
+        )
+        self.session.commit()
+        self.assertIsNone(borrow)
+        self.session.refresh(self.copy)
+        self.assertEqual(self.copy.status, "available")
+
+    def test_second_active_borrow_for_copy_violates_unique_index(self):
+        """uq_borrows_active_copy_id rejects a second active borrow per copy."""
+        BorrowRepository.create(self.session, self.copy.id, self.member.id)
+        with self.assertRaises(IntegrityError):
+            BorrowRepository.create(self.session, self.copy.id, self.member.id)
+        self.session.rollback()
+
+    def test_returned_borrows_do_not_block_new_active_borrow(self):
+        """Only active borrows are unique per copy."""
+        first = BorrowRepository.create(
+            self.session, self.copy.id, self.member.id
+        )
+        BorrowRepository.mark_returned(self.session, first.id)
+        second = BorrowRepository.create(
+            self.session, self.copy.id, self.member.id
+        )
+        self.assertEqual(second.status, "active")
+
+    def test_list_active_cursor_walks_rows_created_with_defaults(self):
+        """Pages over borrows created without explicit timestamps end."""
+        copies = [self.copy] + [
+            BookCopyRepository.create(
+                self.session, self.book.id, str(i), "available"
+            )
+            for i in range(2, 6)
+        ]
+        ids = [
+            BorrowRepository.create(self.session, copy.id, self.member.id).id
+            for copy in copies
+        ]
+        pages = walk_pages(
+            lambda **kw: BorrowRepository.list_active(self.session, **kw),
+            "borrowed_at"
+        )
+        self.assertEqual(pages, list(reversed(ids)))
+
+    def test_every_borrow_path_stamps_borrowed_at_alike(self):
+        """create, create_if_available and bulk_create store one format."""
+        copies = [
+            BookCopyRepository.create(
+                self.session, self.book.id, str(i), "available"
+            )
+            for i in range(2, 5)
+        ]
+        BorrowRepository.create(self.session, self.copy.id, self.member.id)
+        BorrowRepository.create_if_available(
+            self.session, copies[0].id, self.member.id
+        )
+        BorrowRepository.bulk_create(
+            self.session, self.member.id, [copy.id for copy in copies[1:]]
+        )
+        self.session.commit()
+        lengths = self.session.connection().exec_driver_sql(
+            "SELECT DISTINCT length(borrowed_at) FROM borrows"
+        ).scalars().all()
+        self.assertEqual(lengths, [26])
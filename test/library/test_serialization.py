@@ -0,0 +1,92 @@
+"""
+Tests for the row-to-proto serialization fast path.
+"""
+import sys
+from pathlib import Path
+
+root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(root / "src"))
+sys.path.insert(0, str(root / "src" / "generated"))
+
+import unittest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models.base import Base
+from app.library.grpc_handlers import (
+    _model_to_book_proto,
+    _model_to_borrow_proto,
+    _model_to_member_proto,
+)
+from app.library.library_service import LibraryService
+from app.library.repository import (
+    BookCopyRepository,
+    BookRepository,
+    BorrowRepository,
+    MemberRepository,
+)
+from app.library.serialization import add_books, add_borrows, add_members
+from proto import library_pb2
+
+
+class TestSerialization(unittest.TestCase):
+    """The fast path must produce the same messages as the ORM converters."""
+
+    def setUp(self):
+        """Create a book with two copies, a member and one returned borrow."""
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        self.session = sessionmaker(bind=self.engine)()
+        book = BookRepository.create(self.session, "Dune", "Herbert", "123")
+        BookRepository.create(self.session, "No ISBN", "Anon")
+        copies = [
+            BookCopyRepository.create(self.session, book.id, str(n))
+            for n in range(2)
+        ]
+        member = MemberRepository.create(self.session, "Ann", "ann@x.com")
+        for copy in copies:
+            LibraryService.borrow_book(self.session, copy.id, member.id)
+        LibraryService.return_book(self.session, copies[0].id)
+        self.session.expire_all()
+
+    def tearDown(self):
+        """Close session."""
+        self.session.close()
+        self.engine.dispose()
+
+    def test_books_match_model_conversion(self):
+        """add_books matches _model_to_book_proto, including a null ISBN."""
+        response = library_pb2.ListBooksResponse()
+        add_books(response.books, BookRepository.list_all(self.session, 10))
+        expected = [
+            _model_to_book_proto(BookRepository.find_by_id(self.session, b.id))
+            for b in response.books
+        ]
+        self.assertEqual(len(response.books), 2)
+        self.assertEqual(list(response.books), expected)
+
+    def test_members_match_model_conversion(self):
+        """add_members matches _model_to_member_proto."""
+        response = library_pb2.ListMembersResponse()
+        add_members(response.members, MemberRepository.list_all(self.session, 10))
+        expected = [
+            _model_to_member_proto(
+                MemberRepository.find_by_id(self.session, m.id)
+            )
+            for m in response.members
+        ]
+        self.assertEqual(list(response.members), expected)
+
+    def test_borrows_match_model_conversion(self):
+        """add_borrows fills copy, book and member like _model_to_borrow_proto."""
+        response = library_pb2.ListBorrowingsResponse()
+        add_borrows(response.borrows, BorrowRepository.list_active(self.session))
+        self.assertEqual(len(response.borrows), 1)
+        borrow = BorrowRepository.find_by_id(self.session, response.borrows[0].id)
+        self.assertEqual(response.borrows[0], _model_to_borrow_proto(borrow))
+        self.assertEqual(response.borrows[0].book.available_count, 1)
+        self.assertEqual(response.borrows[0].returned_at, "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,7 +7,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
 
 import unittest
-from sqlalchemy import create_engine
+from sqlalchemy import Column, MetaData, Table, create_engine, select, text
 from sqlalchemy.orm import sessionmaker
 
 from models.base import Base
@@ -16,7 +16,8 @@ from models.book_copy import BookCopy
 from models.member import Member
 from models.borrow import Borrow
 from models.staff_user import StaffUser
-from util.ulid_util import generate_ulid
+from models.types import BinaryULID
+from util.ulid_util import generate_ulid, ulid_to_bytes
 
 
 def get_test_session():
@@ -186,3 +187,50 @@ class TestStaffUserModel(unittest.TestCase):
         self.session.commit()
         self.assertEqual(staff.username, "staff1")
         self.assertEqual(staff.password_hash, "hashed")
+
+
+class TestBinaryULID(unittest.TestCase):
+    """Tests for the BinaryULID column type."""
+
+    def setUp(self):
+        """Create a table keyed by a BinaryULID column."""
+        self.engine = create_engine("sqlite:///:memory:")
+        self.table = Table(
+            "things", MetaData(), Column("id", BinaryULID(), primary_key=True)
+        )
+        self.table.metadata.create_all(self.engine)
+        self.connection = self.engine.connect()
+
+    def tearDown(self):
+        """Close connection."""
+        self.connection.close()
+        self.engine.dispose()
+
+    def test_stores_16_bytes_and_reads_string(self):
+        """Values are stored as 16 bytes and read back as ULID strings."""
+        ulid = generate_ulid()
+        self.connection.execute(self.table.insert(), {"id": ulid})
+        raw = self.connection.execute(text("SELECT id FROM things")).scalar()
+        self.assertEqual(raw, ulid_to_bytes(ulid))
+        self.assertEqual(
+            self.connection.execute(select(self.table.c.id)).scalar(), ulid
+        )
+
+    def test_orders_like_strings(self):
+        """ORDER BY on the column follows ULID string order."""
+        ulids = [generate_ulid() for _ in range(20)]
+        self.connection.execute(
+            self.table.insert(), [{"id": u} for u in reversed(ulids)]
+        )
+        rows = self.connection.execute(
+            select(self.table.c.id).order_by(self.table.c.id)
+        ).scalars().all()
+        self.assertEqual(rows, sorted(ulids))
+
+    def test_malformed_id_matches_no_row(self):
+        """A malformed id binds as NULL instead of raising."""
+        self.connection.execute(self.table.insert(), {"id": generate_ulid()})
+        rows = self.connection.execute(
+            select(self.table).where(self.table.c.id == "not-a-ulid")
+        ).all()
+        self.assertEqual(rows, [])
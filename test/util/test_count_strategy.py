@@ -0,0 +1,185 @@
+"""
+Tests for count strategies.
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+import unittest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models.base import Base
+from models.book import Book
+from util.count_strategy import (
+    COUNT_CACHED,
+    COUNT_ESTIMATED,
+    COUNT_EXACT,
+    CountCache,
+    count_cache,
+    count_rows,
+)
+from util.ulid_util import generate_ulid
+
+
+def get_test_session():
+    """Create in-memory SQLite session for testing."""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)()
+
+
+class TestCountCache(unittest.TestCase):
+    """Tests for CountCache."""
+
+    def test_get_returns_none_after_ttl(self):
+        """Entries expire after the TTL."""
+        cache = CountCache(ttl_seconds=0.01, max_entries=10)
+        cache.set(("books",), 5)
+        self.assertEqual(cache.get(("books",)), 5)
+        time.sleep(0.02)
+        self.assertIsNone(cache.get(("books",)))
+
+    def test_set_evicts_oldest_when_full(self):
+        """Cache never holds more than max_entries."""
+        cache = CountCache(ttl_seconds=60, max_entries=2)
+        cache.set(("a",), 1)
+        cache.set(("b",), 2)
+        cache.set(("c",), 3)
+        self.assertIsNone(cache.get(("a",)))
+        self.assertEqual(cache.get(("c",)), 3)
+
+    def test_invalidate_drops_only_matching_table(self):
+        """invalidate removes every key for a table and nothing else."""
+        cache = CountCache(ttl_seconds=60, max_entries=10)
+        cache.set(("borrows", "active", None), 1)
+        cache.set(("borrows", "active", "m1"), 2)
+        cache.set(("books",), 3)
+        cache.invalidate("borrows")
+        self.assertIsNone(cache.get(("borrows", "active", None)))
+        self.assertIsNone(cache.get(("borrows", "active", "m1")))
+        self.assertEqual(cache.get(("books",)), 3)
+
+    def test_set_skipped_after_invalidation_since_generation(self):
+        """A count read before an invalidation is not stored after it."""
+        cache = CountCache(ttl_seconds=60, max_entries=10)
+        generation = cache.generation("books")
+        cache.invalidate("books")
+        cache.set(("books",), 5, generation)
+        self.assertIsNone(cache.get(("books",)))
+        generation = cache.generation("books")
+        cache.clear()
+        cache.set(("books",), 5, generation)
+        self.assertIsNone(cache.get(("books",)))
+        cache.set(("books",), 6, cache.generation("books"))
+        self.assertEqual(cache.get(("books",)), 6)
+
+
+class TestCountRows(unittest.TestCase):
+    """Tests for count_rows."""
+
+    def setUp(self):
+        """Create test session and clear the shared cache."""
+        self.session = get_test_session()
+        count_cache.clear()
+
+    def tearDown(self):
+        """Close session."""
+        self.session.close()
+        count_cache.clear()
+
+    def _add_book(self):
+        self.session.add(Book(id=generate_ulid(), title="T", author="A"))
+        self.session.commit()
+
+    def test_exact_counts_rows(self):
+        """Exact mode counts and reports an exact total."""
+        self._add_book()
+        query = self.session.query(Book)
+        self.assertEqual(
+            count_rows(self.session, query, ("books",), COUNT_EXACT),
+            (1, True)
+        )
+
+    def test_cached_hit_is_not_exact(self):
+        """Cached mode computes once, then serves an inexact cached value."""
+        self._add_book()
+        query = self.session.query(Book)
+        self.assertEqual(
+            count_rows(self.session, query, ("books",), COUNT_CACHED),
+            (1, True)
+        )
+        self.assertEqual(
+            count_rows(self.session, query, ("books",), COUNT_CACHED),
+            (1, False)
+        )
+
+    def test_cached_invalidated_on_write(self):
+        """Writing to the table invalidates cached counts."""
+        self._add_book()
+        query = self.session.query(Book)
+        count_rows(self.session, query, ("books",), COUNT_CACHED)
+        self._add_book()
+        self.assertEqual(
+            count_rows(self.session, query, ("books",), COUNT_CACHED),
+            (2, True)
+        )
+
+    def test_cached_invalidated_on_commit_not_flush(self):
+        """A flushed write invalidates counts only once it commits."""
+        self._add_book()
+        query = self.session.query(Book)
+        count_rows(self.session, query, ("books",), COUNT_CACHED)
+        self.session.add(Book(id=generate_ulid(), title="T", author="A"))
+        self.session.flush()
+        self.assertEqual(count_cache.get(("books",)), 1)
+        self.session.commit()
+        self.assertIsNone(count_cache.get(("books",)))
+
+    def test_rolled_back_write_keeps_cached_count(self):
+        """A rolled-back write leaves the cached count in place."""
+        self._add_book()
+        query = self.session.query(Book)
+        count_rows(self.session, query, ("books",), COUNT_CACHED)
+        self.session.add(Book(id=generate_ulid(), title="T", author="A"))
+        self.session.flush()
+        self.session.rollback()
+        self.assertEqual(
+            count_rows(self.session, query, ("books",), COUNT_CACHED),
+            (1, False)
+        )
+
+    def test_uncommitted_count_is_not_cached(self):
+        """A count that sees the session's own pending writes is not cached."""
+        self._add_book()
+        self.session.add(Book(id=generate_ulid(), title="T", author="A"))
+        self.session.flush()
+        query = self.session.query(Book)
+        self.assertEqual(
+            count_rows(self.session, query, ("books",), COUNT_CACHED),
+            (2, True)
+        )
+        self.assertIsNone(count_cache.get(("books",)))
+        self.session.rollback()
+
+    def test_replica_count_is_not_cached(self):
+        """A count computed on a replica session is not cached."""
+        self._add_book()
+        self.session.info["replica"] = True
+        query = self.session.query(Book)
+        self.assertEqual(
+            count_rows(self.session, query, ("books",), COUNT_CACHED),
+            (1, True)
+        )
+        self.assertIsNone(count_cache.get(("books",)))
+
+    def test_estimated_falls_back_to_exact_on_sqlite(self):
+        """Estimated mode counts exactly when planner stats are unavailable."""
+        self._add_book()
+        query = self.session.query(Book)
+        self.assertEqual(
+            count_rows(self.session, query, ("books",), COUNT_ESTIMATED),
+            (1, True)
+        )
@@ -0,0 +1,77 @@
+"""
+Tests for page token utility functions.
+"""
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+import unittest
+from util.cursor_util import (
+    decode_page_token,
+    decode_rank_token,
+    encode_page_token,
+    encode_rank_token,
+)
+from util.ulid_util import generate_ulid
+
+
+class TestPageToken(unittest.TestCase):
+    """Tests for encode_page_token and decode_page_token."""
+
+    def test_round_trip_returns_timestamp_and_id(self):
+        """Decoding an encoded token returns the original sort key."""
+        ts = datetime(2025, 2, 13, 10, 30, 15, 123456, tzinfo=timezone.utc)
+        row_id = generate_ulid()
+        token = encode_page_token(ts, row_id)
+        self.assertEqual(decode_page_token(token), (ts, row_id))
+
+    def test_round_trip_naive_timestamp(self):
+        """Naive timestamps (SQLite) survive the round trip."""
+        ts = datetime(2025, 2, 13, 10, 30, 15)
+        row_id = generate_ulid()
+        self.assertEqual(
+            decode_page_token(encode_page_token(ts, row_id)),
+            (ts, row_id)
+        )
+
+    def test_token_is_url_safe(self):
+        """Token contains no padding or URL-unsafe characters."""
+        token = encode_page_token(datetime.now(timezone.utc), generate_ulid())
+        self.assertNotIn("=", token)
+        self.assertNotIn("+", token)
+        self.assertNotIn("/", token)
+
+    def test_malformed_token_returns_none(self):
+        """Garbage, empty and non-ULID tokens decode to None."""
+        self.assertIsNone(decode_page_token(""))
+        self.assertIsNone(decode_page_token("not-a-token"))
+        self.assertIsNone(decode_page_token("é"))
+        self.assertIsNone(
+            decode_page_token(encode_page_token(datetime.now(), "short"))
+        )
+
+
+class TestRankToken(unittest.TestCase):
+    """Tests for encode_rank_token and decode_rank_token."""
+
+    def test_round_trip_is_exact(self):
+        """Float ranks survive the round trip bit for bit."""
+        row_id = generate_ulid()
+        rank = 0.1 + 0.2
+        self.assertEqual(
+            decode_rank_token(encode_rank_token(rank, row_id)), (rank, row_id)
+        )
+
+    def test_rejects_malformed_tokens(self):
+        """Garbage, non-finite ranks and bad ids decode to None."""
+        row_id = generate_ulid()
+        self.assertIsNone(decode_rank_token("not-a-token"))
+        self.assertIsNone(
+            decode_rank_token(encode_page_token(datetime(2025, 1, 1), row_id))
+        )
+        self.assertIsNone(
+            decode_rank_token(encode_rank_token(float("nan"), row_id))
+        )
+        self.assertIsNone(decode_rank_token(encode_rank_token(1.0, "short")))
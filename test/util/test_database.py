@@ -0,0 +1,230 @@
+"""
+Tests for database engine configuration.
+"""
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+import asyncio
+import os
+import unittest
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, exc, text
+
+import server
+from util import database
+
+
+class TestEngineOptions(unittest.TestCase):
+    """Tests for engine_options."""
+
+    def test_in_memory_sqlite_keeps_default_pool(self):
+        """In-memory SQLite gets no pool sizing."""
+        options = database.engine_options("sqlite:///:memory:", "primary")
+        self.assertNotIn("poolclass", options)
+        self.assertNotIn("pool_size", options)
+
+    def test_postgres_gets_pool_sizing_and_timed_pool(self):
+        """Postgres engines use the configured, instrumented pool."""
+        options = database.engine_options(
+            "postgresql://localhost/db", "primary"
+        )
+        self.assertIs(options["poolclass"], database.TimedQueuePool)
+        self.assertEqual(options["pool_size"], database.DB_POOL_SIZE)
+        self.assertEqual(options["max_overflow"], database.DB_MAX_OVERFLOW)
+        self.assertEqual(options["pool_logging_name"], "primary")
+
+    def test_statement_timeout_per_driver(self):
+        """statement_timeout is passed in the driver's connect_args format."""
+        with mock.patch.object(database, "DB_STATEMENT_TIMEOUT_MS", 5000):
+            sync_opts = database.engine_options(
+                "postgresql://localhost/db", "primary"
+            )
+            async_opts = database.engine_options(
+                "postgresql+asyncpg://localhost/db", "async", is_async=True
+            )
+        self.assertEqual(
+            sync_opts["connect_args"],
+            {"options": "-c statement_timeout=5000"}
+        )
+        self.assertEqual(
+            async_opts["connect_args"],
+            {"server_settings": {"statement_timeout": "5000"}}
+        )
+        self.assertIs(
+            async_opts["poolclass"], database.TimedAsyncAdaptedQueuePool
+        )
+
+
+class TestCheckPoolCapacity(unittest.TestCase):
+    """Tests for check_pool_capacity."""
+
+    def test_raises_when_pool_smaller_than_workers(self):
+        """Fewer pooled connections than workers is rejected."""
+        with mock.patch.object(database, "DB_POOL_SIZE", 4), \
+                mock.patch.object(database, "DB_MAX_OVERFLOW", 2):
+            with self.assertRaises(ValueError):
+                database.check_pool_capacity(10)
+            database.check_pool_capacity(6)
+
+    def test_unlimited_overflow_always_passes(self):
+        """max_overflow < 0 means the pool can always grow."""
+        with mock.patch.object(database, "DB_POOL_SIZE", 1), \
+                mock.patch.object(database, "DB_MAX_OVERFLOW", -1):
+            database.check_pool_capacity(100)
+
+
+class TestCheckAsyncPoolCapacity(unittest.TestCase):
+    """Tests for check_async_pool_capacity."""
+
+    def test_checks_max_concurrent_rpcs_against_pool(self):
+        """The in-flight RPC cap must fit in the pool."""
+        with mock.patch.object(database, "DB_POOL_SIZE", 4), \
+                mock.patch.object(database, "DB_MAX_OVERFLOW", 2):
+            with self.assertRaises(ValueError):
+                database.check_async_pool_capacity(10)
+            database.check_async_pool_capacity(6)
+
+    def test_unset_cap_warns(self):
+        """Unbounded async concurrency is logged, not rejected."""
+        with mock.patch.object(database, "DB_POOL_SIZE", 4), \
+                mock.patch.object(database, "DB_MAX_OVERFLOW", 2):
+            with self.assertLogs("util.database", "WARNING") as logs:
+                database.check_async_pool_capacity(0)
+        self.assertIn("GRPC_MAX_CONCURRENT_RPCS", logs.output[0])
+        self.assertIn("pool of 6 connections", logs.output[0])
+
+    def test_serve_async_checks_capacity_before_starting(self):
+        """serve_async refuses to start with a cap the pool cannot cover."""
+        with mock.patch.object(database, "DB_POOL_SIZE", 4), \
+                mock.patch.object(database, "DB_MAX_OVERFLOW", 2), \
+                mock.patch.object(server, "GRPC_MAX_CONCURRENT_RPCS", 10), \
+                mock.patch.object(server.grpc.aio, "server") as aio_server:
+            with self.assertRaisesRegex(ValueError, "below the 10 RPCs"):
+                asyncio.run(server.serve_async())
+        aio_server.assert_not_called()
+
+
+class TestInitEngine(unittest.TestCase):
+    """Tests for init_engine (used by prefork workers after fork)."""
+
+    def test_replaces_engine_and_session_factory(self):
+        """init_engine builds a new engine bound to a new session factory."""
+        old_engine = database.engine
+        old_factory = database.SessionLocal
+        try:
+            database.init_engine("sqlite:///:memory:")
+            self.assertIsNot(database.engine, old_engine)
+            self.assertIsNot(database.SessionLocal, old_factory)
+            session = database.get_session()
+            self.assertIs(session.get_bind(), database.engine)
+            session.close()
+        finally:
+            database.engine = old_engine
+            database.SessionLocal = old_factory
+
+
+class TestReplicaRouter(unittest.TestCase):
+    """Tests for ReplicaRouter selection and health."""
+
+    def setUp(self):
+        """Three in-memory replica engines."""
+        self.engines = [create_engine("sqlite:///:memory:") for _ in range(3)]
+
+    def tearDown(self):
+        for engine in self.engines:
+            engine.dispose()
+
+    def test_round_robin_rotates_over_healthy_replicas(self):
+        """round_robin cycles and skips replicas marked down."""
+        router = database.ReplicaRouter(self.engines, "round_robin")
+        self.assertEqual([router.choose() for _ in range(3)], [0, 1, 2])
+        router.mark_down(1)
+        self.assertNotIn(1, [router.choose() for _ in range(4)])
+
+    def test_all_replicas_down_returns_none(self):
+        """choose returns None when no replica is healthy."""
+        router = database.ReplicaRouter(self.engines[:1])
+        router.mark_down(0)
+        self.assertIsNone(router.choose())
+
+    def test_least_latency_prefers_fastest_replica(self):
+        """least_latency picks the lowest average, exploring now and then."""
+        router = database.ReplicaRouter(self.engines, "least_latency")
+        for index, seconds in enumerate([0.05, 0.001, 0.02]):
+            router.record_latency(index, seconds)
+        picks = [router.choose() for _ in range(20)]
+        self.assertGreaterEqual(picks.count(1), 17)
+        self.assertNotEqual(set(picks), {1})
+
+    def test_statements_feed_latency_and_errors_mark_down(self):
+        """Executed statements are timed; connection failures skip the replica."""
+        router = database.ReplicaRouter(self.engines[:1], "least_latency")
+        with self.engines[0].connect() as conn:
+            conn.execute(text("SELECT 1"))
+        self.assertIsNotNone(router._latency[0])
+        broken = create_engine("sqlite:////nonexistent-dir/replica.db")
+        router = database.ReplicaRouter([broken])
+        with self.assertRaises(exc.OperationalError):
+            broken.connect()
+        self.assertIsNone(router.choose())
+        broken.dispose()
+
+
+class TestGetReadSession(unittest.TestCase):
+    """Tests for get_read_session routing."""
+
+    def setUp(self):
+        """Configure one replica."""
+        fd, self.path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        database.init_replicas([f"sqlite:///{self.path}"])
+
+    def tearDown(self):
+        database.init_replicas([])
+        os.remove(self.path)
+
+    def test_reads_go_to_replica_unless_consistent(self):
+        """Default reads use the replica; consistent=True uses the primary."""
+        session = database.get_read_session()
+        self.assertIs(session.get_bind(), database.replica_router.engines[0])
+        self.assertTrue(session.info["replica"])
+        session.close()
+        session = database.get_read_session(consistent=True)
+        self.assertIsNot(session.get_bind(), database.replica_router.engines[0])
+        self.assertNotIn("replica", session.info)
+        session.close()
+
+    def test_falls_back_to_primary_when_replicas_down(self):
+        """No healthy replica means a primary session."""
+        database.replica_router.mark_down(0)
+        session = database.get_read_session()
+        self.assertIsNot(session.get_bind(), database.replica_router.engines[0])
+        self.assertNotIn("replica", session.info)
+        session.close()
+
+
+class TestTimedQueuePool(unittest.TestCase):
+    """Tests for pool checkout wait metrics."""
+
+    def test_checkout_records_wait_time(self):
+        """Each checkout adds an observation to the wait histogram."""
+        fd, path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        url = f"sqlite:///{path}"
+        engine = create_engine(url, **database.engine_options(url, "test"))
+        labels = {"pool": "test"}
+        before = REGISTRY.get_sample_value(
+            "db_pool_checkout_wait_seconds_count", labels
+        ) or 0
+        with engine.connect():
+            pass
+        after = REGISTRY.get_sample_value(
+            "db_pool_checkout_wait_seconds_count", labels
+        )
+        engine.dispose()
+        os.remove(path)
+        self.assertEqual(after, before + 1)
@@ -0,0 +1,320 @@
+"""
+Tests for request-scoped sessions and the session interceptors.
+"""
+import sys
+from pathlib import Path
+from unittest import mock
+
+root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(root / "src"))
+sys.path.insert(0, str(root / "src" / "generated"))
+
+import collections
+import os
+import tempfile
+import unittest
+
+import grpc
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.library.interceptor import AsyncSessionInterceptor, SessionInterceptor
+from app.library.repository import BookCopyRepository, BookRepository
+from models.base import Base
+from util import database
+from util.request_scope import (
+    QueryGuardError,
+    async_rpc_scope,
+    current_scope,
+    rpc_scope,
+)
+
+_CallDetails = collections.namedtuple(
+    "_CallDetails", ["method", "invocation_metadata"]
+)
+
+
+def _sample(name, method):
+    return REGISTRY.get_sample_value(name, {"method": method}) or 0
+
+
+class TestRpcScope(unittest.TestCase):
+    """Tests for rpc_scope."""
+
+    def setUp(self):
+        """Point the session factory at an in-memory engine."""
+        self.engine = create_engine("sqlite:///:memory:")
+        self.factory = mock.Mock(wraps=sessionmaker(bind=self.engine))
+        patcher = mock.patch.object(database, "SessionLocal", self.factory)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.engine.dispose)
+
+    def test_session_opened_lazily(self):
+        """No session is opened unless the body asks for one."""
+        with rpc_scope():
+            pass
+        self.factory.assert_not_called()
+        with rpc_scope() as scope:
+            self.assertIs(scope.session(), scope.session())
+        self.factory.assert_called_once()
+
+    def test_session_closed_and_rolled_back_on_error(self):
+        """The session is rolled back when the body raises, then closed."""
+        session = mock.Mock()
+        with mock.patch.object(database, "get_session", return_value=session):
+            with self.assertRaises(ValueError):
+                with rpc_scope() as scope:
+                    scope.session()
+                    raise ValueError()
+        session.rollback.assert_called_once()
+        session.close.assert_called_once()
+        self.assertIsNone(current_scope())
+
+    def test_nested_scope_joins_outer(self):
+        """An inner rpc_scope reuses the outer scope and leaves it open."""
+        with rpc_scope() as outer:
+            session = outer.session()
+            with rpc_scope() as inner:
+                self.assertIs(inner, outer)
+            self.assertIs(outer.session(), session)
+
+    def test_queries_counted_and_exported(self):
+        """Statements are counted and timed, and exported for the method."""
+        before = _sample("rpc_db_queries_sum", "TestQueries")
+        calls = _sample("rpc_db_seconds_count", "TestQueries")
+        with rpc_scope("TestQueries") as scope:
+            scope.session().execute(text("SELECT 1"))
+            scope.session().execute(text("SELECT 2"))
+            self.assertEqual(scope.queries, 2)
+            self.assertGreater(scope.db_seconds, 0)
+        self.assertEqual(_sample("rpc_db_queries_sum", "TestQueries"), before + 2)
+        self.assertEqual(
+            _sample("rpc_db_seconds_count", "TestQueries"), calls + 1
+        )
+
+    def test_every_statement_timed_by_operation(self):
+        """db_query_seconds records statements with or without a scope."""
+        labels = {"operation": "select"}
+        before = REGISTRY.get_sample_value(
+            "db_query_seconds_count", labels
+        ) or 0
+        with self.engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        self.assertEqual(
+            REGISTRY.get_sample_value("db_query_seconds_count", labels),
+            before + 1
+        )
+
+    def test_statements_outside_scope_not_counted(self):
+        """Statements run without an active scope are ignored."""
+        with self.engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        with rpc_scope() as scope:
+            self.assertEqual(scope.queries, 0)
+
+
+class TestQueryGuard(unittest.TestCase):
+    """Tests for the lazy-load and statement budget guards."""
+
+    def setUp(self):
+        """Create a book with one copy in an in-memory database."""
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        patcher = mock.patch.object(database, "SessionLocal", self.Session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.engine.dispose)
+        session = self.Session()
+        book = BookRepository.create(session, "Guarded", "Author")
+        self.copy_id = BookCopyRepository.create(
+            session, book.id, "1", "available"
+        ).id
+        session.close()
+
+    def _load_copy_book(self, scope):
+        copy = BookCopyRepository.find_by_id(scope.session(), self.copy_id)
+        return copy.book
+
+    def test_lazy_load_logged_when_not_strict(self):
+        """A lazy load is logged with its statement and recorded."""
+        before = _sample("rpc_lazy_loads_total", "TestLazy")
+        with self.assertLogs("util.request_scope", "WARNING") as logs:
+            with rpc_scope("TestLazy", strict=False) as scope:
+                self.assertEqual(self._load_copy_book(scope).title, "Guarded")
+        self.assertEqual(scope.lazy_loads, ["BookCopy.book"])
+        self.assertIn("SELECT", logs.output[0])
+        self.assertEqual(
+            _sample("rpc_lazy_loads_total", "TestLazy"), before + 1
+        )
+
+    def test_lazy_load_raises_when_strict(self):
+        """In strict mode a lazy load fails the RPC."""
+        with self.assertRaisesRegex(QueryGuardError, "BookCopy.book"):
+            with rpc_scope(strict=True) as scope:
+                self._load_copy_book(scope)
+
+    def test_lazy_load_outside_scope_ignored(self):
+        """Lazy loads without an active scope are not reported."""
+        session = self.Session()
+        copy = BookCopyRepository.find_by_id(session, self.copy_id)
+        self.assertEqual(copy.book.title, "Guarded")
+        session.close()
+
+    def test_budget_overrun_raises_when_strict(self):
+        """An RPC over its statement budget fails in strict mode."""
+        with self.assertRaisesRegex(QueryGuardError, "ran 2 statements"):
+            with rpc_scope("TestBudget", max_queries=1, strict=True) as scope:
+                scope.session().execute(text("SELECT 1"))
+                scope.session().execute(text("SELECT 2"))
+
+    def test_budget_overrun_logged_when_not_strict(self):
+        """An RPC over its statement budget is logged otherwise."""
+        with self.assertLogs("util.request_scope", "WARNING") as logs:
+            with rpc_scope("TestBudget", max_queries=1, strict=False) as scope:
+                scope.session().execute(text("SELECT 1"))
+                scope.session().execute(text("SELECT 2"))
+        self.assertIn("over its budget of 1", logs.output[0])
+
+    def test_budget_not_checked_when_body_raises(self):
+        """The RPC's own error is not replaced by a budget error."""
+        with self.assertRaises(ValueError):
+            with rpc_scope(max_queries=1, strict=True) as scope:
+                scope.session().execute(text("SELECT 1"))
+                scope.session().execute(text("SELECT 2"))
+                raise ValueError()
+
+    def test_defaults_from_config(self):
+        """The budget and strictness default to the configured values."""
+        with mock.patch.multiple(
+            "util.request_scope", RPC_MAX_QUERIES=5, QUERY_GUARD_STRICT=True
+        ):
+            with rpc_scope() as scope:
+                self.assertEqual(scope.max_queries, 5)
+                self.assertTrue(scope.strict)
+
+
+class TestAsyncRpcScope(unittest.IsolatedAsyncioTestCase):
+    """Tests for async_rpc_scope."""
+
+    async def asyncSetUp(self):
+        """Create a book with one copy in a file-backed SQLite database."""
+        fd, self.db_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        engine = create_engine(f"sqlite:///{self.db_path}")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        book = BookRepository.create(session, "Guarded", "Author")
+        self.copy_id = BookCopyRepository.create(
+            session, book.id, "1", "available"
+        ).id
+        session.close()
+        engine.dispose()
+        database.init_async_engine(f"sqlite+aiosqlite:///{self.db_path}")
+
+    async def asyncTearDown(self):
+        """Dispose the async engine and remove the database file."""
+        await database.async_engine.dispose()
+        database.async_engine = None
+        database.AsyncSessionLocal = None
+        os.remove(self.db_path)
+
+    async def test_async_session_owned_and_counted(self):
+        """The scope opens one AsyncSession, counts its statements, closes it."""
+        async with async_rpc_scope("TestAsync") as scope:
+            session = scope.async_session()
+            self.assertIs(scope.async_session(), session)
+            await session.execute(text("SELECT 1"))
+            await session.run_sync(
+                lambda sync_session: sync_session.execute(text("SELECT 2"))
+            )
+            self.assertEqual(scope.queries, 2)
+        self.assertIsNone(scope._async_session)
+        self.assertIsNone(current_scope())
+
+    async def test_lazy_load_in_run_sync_raises_when_strict(self):
+        """A lazy load inside run_sync trips the strict guard."""
+        def load_copy_book(session):
+            copy = BookCopyRepository.find_by_id(session, self.copy_id)
+            return copy.book
+
+        with self.assertRaisesRegex(QueryGuardError, "BookCopy.book"):
+            async with async_rpc_scope(strict=True) as scope:
+                await scope.async_session().run_sync(load_copy_book)
+
+    async def test_budget_overrun_raises_when_strict(self):
+        """An async RPC over its statement budget fails in strict mode."""
+        with self.assertRaisesRegex(QueryGuardError, "ran 2 statements"):
+            async with async_rpc_scope(max_queries=1, strict=True) as scope:
+                await scope.async_session().execute(text("SELECT 1"))
+                await scope.async_session().execute(text("SELECT 2"))
+
+
+class TestSessionInterceptor(unittest.TestCase):
+    """Tests for SessionInterceptor."""
+
+    def _intercept(self, method, handler):
+        return SessionInterceptor().intercept_service(
+            lambda details: handler, _CallDetails(method, ())
+        )
+
+    def test_unary_call_runs_in_named_scope(self):
+        """The behavior sees a scope named after the RPC; it ends with the call."""
+        handler = self._intercept(
+            "/library.LibraryService/ListBooks",
+            grpc.unary_unary_rpc_method_handler(
+                lambda request, context: current_scope().method
+            )
+        )
+        self.assertEqual(handler.unary_unary(None, None), "ListBooks")
+        self.assertIsNone(current_scope())
+
+    def test_streaming_call_keeps_scope_until_exhausted(self):
+        """A streaming call's scope spans every response."""
+        def behavior(request, context):
+            yield current_scope().method
+            yield current_scope().method
+
+        handler = self._intercept(
+            "/library.LibraryService/StreamBooks",
+            grpc.unary_stream_rpc_method_handler(behavior)
+        )
+        self.assertEqual(
+            list(handler.unary_stream(None, None)),
+            ["StreamBooks", "StreamBooks"]
+        )
+        self.assertIsNone(current_scope())
+
+    def test_other_services_pass_through(self):
+        """Non-library methods get no scope."""
+        handler = grpc.unary_unary_rpc_method_handler(
+            lambda request, context: current_scope()
+        )
+        wrapped = self._intercept("/grpc.health.v1.Health/Check", handler)
+        self.assertIsNone(wrapped.unary_unary(None, None))
+
+
+class TestAsyncSessionInterceptor(unittest.IsolatedAsyncioTestCase):
+    """Tests for AsyncSessionInterceptor."""
+
+    async def test_unary_call_runs_in_named_scope(self):
+        """The async behavior sees a scope named after the RPC."""
+        async def behavior(request, context):
+            return current_scope().method
+
+        handler = grpc.unary_unary_rpc_method_handler(behavior)
+
+        async def continuation(details):
+            return handler
+
+        wrapped = await AsyncSessionInterceptor().intercept_service(
+            continuation, _CallDetails("/library.LibraryService/ListBooks", ())
+        )
+        self.assertEqual(await wrapped.unary_unary(None, None), "ListBooks")
+        self.assertIsNone(current_scope())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,8 +6,15 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
 
+import time
 import unittest
-from util.ulid_util import generate_ulid, is_valid_ulid
+from util.ulid_util import (
+    generate_many,
+    generate_ulid,
+    is_valid_ulid,
+    ulid_from_bytes,
+    ulid_to_bytes,
+)
 
 
 class TestGenerateUlid(unittest.TestCase):
@@ -30,6 +37,41 @@ class TestGenerateUlid(unittest.TestCase):
         ulids = [generate_ulid() for _ in range(100)]
         self.assertEqual(len(ulids), len(set(ulids)))
 
+    def test_monotonic_within_millisecond(self):
+        """ULIDs generated in a row sort in generation order."""
+        ulids = [generate_ulid() for _ in range(1000)]
+        self.assertEqual(ulids, sorted(ulids))
+
+    def test_encodes_current_time(self):
+        """The first 10 characters hold the millisecond timestamp."""
+        before = int(time.time() * 1000)
+        timestamp = int.from_bytes(ulid_to_bytes(generate_ulid())[:6], "big")
+        self.assertLessEqual(before, timestamp)
+        self.assertLessEqual(timestamp, int(time.time() * 1000) + 1)
+
+
+class TestGenerateMany(unittest.TestCase):
+    """Tests for generate_many function."""
+
+    def test_returns_count_unique_valid_ulids(self):
+        """generate_many returns count distinct valid ULIDs."""
+        ulids = generate_many(100)
+        self.assertEqual(len(ulids), 100)
+        self.assertEqual(len(set(ulids)), 100)
+        self.assertTrue(all(is_valid_ulid(u) for u in ulids))
+
+    def test_batch_is_ordered_after_previous_ulids(self):
+        """A batch is ascending and follows ULIDs generated before it."""
+        first = generate_ulid()
+        ulids = generate_many(500)
+        self.assertEqual(ulids, sorted(ulids))
+        self.assertLess(first, ulids[0])
+        self.assertLess(ulids[-1], generate_ulid())
+
+    def test_zero_returns_empty_list(self):
+        """generate_many(0) returns an empty list."""
+        self.assertEqual(generate_many(0), [])
+
 
 class TestIsValidUlid(unittest.TestCase):
     """Tests for is_valid_ulid function."""
@@ -49,3 +91,36 @@ class TestIsValidUlid(unittest.TestCase):
         """String with invalid characters returns False."""
         self.assertFalse(is_valid_ulid("0" * 25 + "!"))
         self.assertFalse(is_valid_ulid("0" * 25 + " "))
+
+    def test_value_over_128_bits_returns_false(self):
+        """A leading character above 7 would overflow 128 bits."""
+        self.assertTrue(is_valid_ulid("7" + "Z" * 25))
+        self.assertFalse(is_valid_ulid("8" + "0" * 25))
+
+
+class TestBinaryConversion(unittest.TestCase):
+    """Tests for ulid_to_bytes and ulid_from_bytes."""
+
+    def test_round_trip(self):
+        """A ULID converts to 16 bytes and back unchanged."""
+        ulid = generate_ulid()
+        data = ulid_to_bytes(ulid)
+        self.assertEqual(len(data), 16)
+        self.assertEqual(ulid_from_bytes(data), ulid)
+
+    def test_lowercase_decodes_like_uppercase(self):
+        """Decoding is case-insensitive; encoding is uppercase."""
+        ulid = generate_ulid()
+        self.assertEqual(ulid_from_bytes(ulid_to_bytes(ulid.lower())), ulid)
+
+    def test_byte_order_matches_string_order(self):
+        """Sorting bytes sorts the same way as sorting strings."""
+        ulids = [generate_ulid() for _ in range(50)] + ["0" * 26, "7" + "Z" * 25]
+        self.assertEqual(
+            sorted(ulids, key=ulid_to_bytes), sorted(ulids)
+        )
+
+    def test_invalid_ulid_raises(self):
+        """Malformed strings raise ValueError."""
+        with self.assertRaises(ValueError):
+            ulid_to_bytes("not-a-ulid")